@@ -0,0 +1,221 @@
+"""Claude CLI 동시 실행 수 자동 조절 모듈
+
+CLI 실행이 끝날 때마다 응답 시간과 호스트 부하(load average)를 보고
+AIMD(additive increase / multiplicative decrease) 방식으로 동시 실행 상한을 조절한다.
+
+- 응답 시간이 평소 수준이고 부하가 CPU 수 대비 여유가 있으며 상한까지 실제로 사용 중이면
+  상한 만큼의 정상 실행이 쌓일 때마다 1씩 늘린다.
+- 최근 응답 시간이 평소의 ``latency_tolerance`` 배를 넘거나 부하가 ``load_per_cpu``를
+  넘으면 상한을 ``backoff`` 배로 줄인다. 줄인 뒤에는 줄이기 전에 시작한 실행 결과로
+  다시 줄이지 않는다.
+- 실패한 실행은 응답 시간 표본과 따로 집계한다. 빨리 끝난 실패가 평소 응답 시간을
+  끌어내리지 않도록 응답 시간에는 반영하지 않고 부하만 확인한다.
+"""
+
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from config import (
+    CLAUDE_CONCURRENCY_BACKOFF,
+    CLAUDE_LATENCY_TOLERANCE,
+    CLAUDE_LOAD_PER_CPU,
+)
+
+logger = logging.getLogger(__name__)
+
+# 평소 응답 시간(느린 EWMA)과 최근 응답 시간(빠른 EWMA) 가중치
+BASELINE_ALPHA = 0.05
+RECENT_ALPHA = 0.3
+# 응답 시간으로 판단하기 전에 필요한 최소 실행 수
+MIN_SAMPLES = 5
+
+
+def cpu_load() -> Optional[float]:
+    """1분 load average를 CPU 수로 나눈 값. 지원하지 않는 플랫폼이면 None"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def default_max_limit() -> int:
+    """상한 미설정 시 최대값: CPU 수"""
+    return os.cpu_count() or 1
+
+
+class Measurement:
+    """``AdaptiveLimiter.measure`` 가 넘겨주는 실행 결과 표시. 실패면 ``failed`` 를 켠다."""
+
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+
+class AdaptiveLimiter:
+    """응답 시간/부하 기반 동시 실행 상한 조절기
+
+    Args:
+        initial: 시작 상한
+        min_limit: 상한의 최솟값
+        max_limit: 상한의 최댓값
+        latency_tolerance: 최근/평소 응답 시간 비율이 이 값을 넘으면 상한을 줄인다
+        load_per_cpu: CPU당 load average가 이 값을 넘으면 상한을 줄인다 (0이면 부하 무시)
+        backoff: 상한을 줄일 때 곱하는 비율 (0~1)
+        on_change: 상한이 바뀌면 새 상한으로 호출되는 콜백
+        load_fn: CPU당 부하를 반환하는 함수 (테스트용)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        latency_tolerance: float = CLAUDE_LATENCY_TOLERANCE,
+        load_per_cpu: float = CLAUDE_LOAD_PER_CPU,
+        backoff: float = CLAUDE_CONCURRENCY_BACKOFF,
+        on_change: Optional[Callable[[int], None]] = None,
+        load_fn: Callable[[], Optional[float]] = cpu_load,
+    ):
+        if max_limit is None:
+            max_limit = default_max_limit()
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("동시 실행 상한 범위가 올바르지 않습니다 (1 <= min <= max)")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff는 0과 1 사이여야 합니다")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.load_per_cpu = load_per_cpu
+        self.backoff = backoff
+        self.on_change = on_change
+        self._load_fn = load_fn
+        self.limit = min(max(initial, min_limit), max_limit)
+        self._inflight = 0
+        # 마지막 조정 이후 관측한 최대 동시 실행 수
+        self._peak = 0
+        self._healthy = 0
+        self._last_decrease = 0.0
+        self._baseline: Optional[float] = None
+        self._recent: Optional[float] = None
+        self._load: Optional[float] = None
+        # 지표
+        self._samples = 0
+        self._failures = 0
+        self._failed_latency: Optional[float] = None
+        self._increases = 0
+        self._decreases = 0
+
+    @contextmanager
+    def measure(self):
+        """CLI 실행 하나의 응답 시간을 측정해 상한 조절에 반영한다.
+
+        취소되거나 예외로 끝난 실행은 응답 시간을 알 수 없으므로 반영하지 않는다.
+        실행은 끝났지만 실패했으면 넘겨받은 ``Measurement.failed`` 를 켜서 실패로 기록한다.
+        """
+        measurement = Measurement()
+        started = time.monotonic()
+        self._inflight += 1
+        self._peak = max(self._peak, self._inflight)
+        try:
+            yield measurement
+        finally:
+            self._inflight -= 1
+        self.record(started, time.monotonic() - started, failed=measurement.failed)
+
+    def record(self, started: float, latency: float, failed: bool = False):
+        """started(monotonic)에 시작해 latency초 걸린 실행 결과를 반영한다."""
+        if failed:
+            self._record_failure(started, latency)
+            return
+        self._samples += 1
+        if self._baseline is None:
+            self._baseline = self._recent = latency
+        else:
+            self._recent += RECENT_ALPHA * (latency - self._recent)
+            self._baseline += BASELINE_ALPHA * (latency - self._baseline)
+        self._load = self._load_fn()
+
+        if self._degraded():
+            # 줄이기 전에 시작한 실행은 이전 상한의 결과이므로 연달아 줄이지 않는다
+            if started >= self._last_decrease:
+                self._decrease()
+            return
+
+        if self._peak >= self.limit and self.limit < self.max_limit:
+            self._healthy += 1
+            if self._healthy >= self.limit:
+                self._set_limit(self.limit + 1)
+                self._increases += 1
+
+    def _record_failure(self, started: float, latency: float):
+        """실패한 실행은 응답 시간 표본에 넣지 않고 부하만 확인한다. 상한도 늘리지 않는다."""
+        self._failures += 1
+        if self._failed_latency is None:
+            self._failed_latency = latency
+        else:
+            self._failed_latency += RECENT_ALPHA * (latency - self._failed_latency)
+        self._load = self._load_fn()
+        if self._overloaded() and started >= self._last_decrease:
+            self._decrease()
+
+    def _overloaded(self) -> bool:
+        return self.load_per_cpu > 0 and self._load is not None and self._load > self.load_per_cpu
+
+    def _degraded(self) -> bool:
+        if self._overloaded():
+            return True
+        if self._samples < MIN_SAMPLES:
+            return False
+        return self._recent > self._baseline * self.latency_tolerance
+
+    def _decrease(self):
+        self._last_decrease = time.monotonic()
+        new_limit = max(self.min_limit, math.floor(self.limit * self.backoff))
+        if new_limit < self.limit:
+            logger.info(
+                "Claude CLI 동시 실행 상한 축소 %d → %d (응답 %.1fs/평소 %.1fs, 부하 %s)",
+                self.limit, new_limit, self._recent, self._baseline,
+                f"{self._load:.2f}" if self._load is not None else "-",
+            )
+            self._set_limit(new_limit)
+            self._decreases += 1
+        else:
+            self._reset_window()
+
+    def _set_limit(self, limit: int):
+        self.limit = limit
+        self._reset_window()
+        if self.on_change is not None:
+            self.on_change(limit)
+
+    def _reset_window(self):
+        self._healthy = 0
+        self._peak = self._inflight
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def stats(self) -> dict:
+        """상한 조절 지표"""
+        return {
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "inflight": self._inflight,
+            "load_per_cpu": round(self._load, 2) if self._load is not None else None,
+            "latency_recent": round(self._recent, 3) if self._recent is not None else None,
+            "latency_baseline": round(self._baseline, 3) if self._baseline is not None else None,
+            "samples": self._samples,
+            "failures": self._failures,
+            "latency_failed": (
+                round(self._failed_latency, 3) if self._failed_latency is not None else None
+            ),
+            "increases": self._increases,
+            "decreases": self._decreases,
+        }
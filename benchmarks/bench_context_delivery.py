@@ -0,0 +1,72 @@
+"""컨텍스트 전달 방식 벤치마크 (임시 파일 vs memfd)
+
+``ClaudeCodeClient`` 와 같은 방식으로 컨텍스트를 준비해 자식 프로세스(cat)가
+``--append-system-prompt-file`` 경로를 읽게 하고, 동시 요청 수를 바꿔 가며
+처리 시간과 이벤트 루프가 컨텍스트 준비에 묶인 시간을 비교한다.
+
+    python benchmarks/bench_context_delivery.py [요청 수] [동시 실행 수] [컨텍스트 KB]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from claude_code_client import MEMFD_SUPPORTED, open_context  # noqa: E402
+
+
+async def deliver(text: str, use_memfd: bool, stats: dict):
+    start = time.perf_counter()
+    handle = open_context(text, use_memfd=use_memfd)
+    stats["prepare"] += time.perf_counter() - start
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "cat", handle.path,
+            stdout=asyncio.subprocess.PIPE,
+            pass_fds=handle.pass_fds,
+        )
+        out, _ = await process.communicate()
+        assert len(out) == len(text.encode())
+    finally:
+        start = time.perf_counter()
+        handle.close()
+        stats["prepare"] += time.perf_counter() - start
+
+
+async def run(text: str, requests: int, concurrency: int, use_memfd: bool) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"prepare": 0.0}
+
+    async def one():
+        async with semaphore:
+            await deliver(text, use_memfd, stats)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    stats["total"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    size_kb = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    text = ("user: 이전 대화 내용입니다\n" * (size_kb * 1024 // 40))[: size_kb * 1024]
+
+    modes = [("tempfile", False)]
+    if MEMFD_SUPPORTED:
+        modes.append(("memfd", True))
+
+    print(f"요청 {requests}개, 동시 {concurrency}, 컨텍스트 {size_kb}KB")
+    for name, use_memfd in modes:
+        stats = asyncio.run(run(text, requests, concurrency, use_memfd))
+        print(
+            f"  {name:9s}: 전체 {stats['total'] * 1000:8.1f} ms"
+            f" | 루프 점유(준비+정리) {stats['prepare'] * 1000 / requests:7.3f} ms/요청"
+        )
+
+
+if __name__ == "__main__":
+    main()
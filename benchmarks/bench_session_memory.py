@@ -0,0 +1,68 @@
+"""세션 메모리 사용량 벤치마크
+
+dict 메시지({"role", "content"})와 ``Message`` 레코드로 세션을 채웠을 때
+세션당 메모리를 tracemalloc으로 비교한다. 본문 문자열은 두 방식이 공유하므로
+측정값은 메시지 컨테이너 자체의 차이를 보여준다.
+
+    python benchmarks/bench_session_memory.py [세션 수] [세션당 메시지 수]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config import MAX_SESSION_MESSAGES  # noqa: E402
+from session_manager import Message  # noqa: E402
+
+
+def build_dict_sessions(n_sessions, n_messages, contents):
+    sessions = []
+    for _ in range(n_sessions):
+        buf = deque(maxlen=MAX_SESSION_MESSAGES)
+        for i in range(n_messages):
+            role = "user" if i % 2 == 0 else "assistant"
+            buf.append({"role": role, "content": contents[i], "timestamp": time.time()})
+        sessions.append(buf)
+    return sessions
+
+
+def build_record_sessions(n_sessions, n_messages, contents):
+    sessions = []
+    for _ in range(n_sessions):
+        buf = deque(maxlen=MAX_SESSION_MESSAGES)
+        for i in range(n_messages):
+            role = "user" if i % 2 == 0 else "assistant"
+            buf.append(Message(role, contents[i]))
+        sessions.append(buf)
+    return sessions
+
+
+def measure(builder, n_sessions, n_messages, contents):
+    tracemalloc.start()
+    sessions = builder(n_sessions, n_messages, contents)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_messages = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_SESSION_MESSAGES
+    contents = [f"메시지 본문 {i}" for i in range(n_messages)]
+
+    dict_bytes = measure(build_dict_sessions, n_sessions, n_messages, contents)
+    record_bytes = measure(build_record_sessions, n_sessions, n_messages, contents)
+
+    print(f"세션 {n_sessions:,}개 x 메시지 {n_messages}개")
+    print(f"  dict    : {dict_bytes / n_sessions:10,.0f} B/세션  ({dict_bytes / 2**20:,.1f} MiB)")
+    print(f"  Message : {record_bytes / n_sessions:10,.0f} B/세션  ({record_bytes / 2**20:,.1f} MiB)")
+    print(f"  감소율  : {1 - record_bytes / dict_bytes:.1%}")
+
+
+if __name__ == "__main__":
+    main()
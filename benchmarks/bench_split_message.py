@@ -0,0 +1,80 @@
+"""split_message 벤치마크 (이전 구현 vs 단일 순회 분할기)
+
+1MB 안팎의 입력 세 종류(코드블록 위주, 줄바꿈 없는 한 줄, 일반 문단)로
+이전 구현과 현재 ``split_message`` 의 처리 시간을 비교한다.
+
+    python benchmarks/bench_split_message.py [반복 횟수]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from message_utils import iter_split, split_message  # noqa: E402
+
+
+def legacy_split_message(text: str, limit: int = 2000) -> list[str]:
+    """이전 구현 (남은 텍스트를 매번 다시 자르고 청크마다 ``` 개수를 센다)"""
+    if not text:
+        return []
+    chunks = []
+    while len(text) > limit:
+        split_at = text.rfind('\n', 0, limit)
+        if split_at == -1:
+            split_at = text.rfind(' ', 0, limit)
+        if split_at == -1:
+            split_at = limit
+        chunk = text[:split_at]
+        open_blocks = chunk.count('```')
+        if open_blocks % 2 == 1 and split_at < limit // 2:
+            split_at = limit
+            chunk = text[:split_at]
+            open_blocks = chunk.count('```')
+        if open_blocks % 2 == 1:
+            chunk += '\n```'
+            text = '```\n' + text[split_at:].lstrip('\n')
+        else:
+            text = text[split_at:].lstrip('\n')
+        chunks.append(chunk)
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def make_inputs(size: int = 1_000_000) -> dict:
+    code = "```python\n" + "def handler(event):\n    return process(event)\n" * 40 + "```\n"
+    prose = "프로젝트 진행 상황을 정리하면 다음과 같습니다. " * 8 + "\n\n"
+    return {
+        "코드블록": (code * (size // len(code) + 1))[:size],
+        "한 줄": ("word " * (size // 5 + 1))[:size],
+        "문단": (prose * (size // len(prose) + 1))[:size],
+    }
+
+
+def bench(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    streamed = lambda text: list(iter_split(text[i:i + 64] for i in range(0, len(text), 64)))  # noqa: E731
+
+    for name, text in make_inputs().items():
+        legacy = bench(legacy_split_message, text, repeat)
+        current = bench(split_message, text, repeat)
+        stream = bench(streamed, text, repeat)
+        print(
+            f"{name:6s} ({len(text) / 1e6:.1f}MB): 이전 {legacy * 1000:8.1f} ms"
+            f" | 현재 {current * 1000:7.1f} ms | 스트리밍(64자 조각) {stream * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
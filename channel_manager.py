@@ -1,29 +1,316 @@
 """Bot-console 채널 생성 및 권한 관리 모듈"""
 
-from typing import Optional
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Callable, Dict, Optional
 
 import discord
 
+logger = logging.getLogger(__name__)
 
 BOT_CONSOLE_CATEGORY = "🤖 Bot Consoles"
 BOT_CONSOLE_PREFIX = "bot-console-"
 
+# Discord 카테고리당 채널 수 상한. 가득 차면 "🤖 Bot Consoles 2", "... 3" 카테고리로 넘긴다
+CATEGORY_CHANNEL_LIMIT = 50
+
+# 유휴 콘솔을 옮겨 두는 보관 카테고리 (가득 차면 "... 2", "... 3")
+ARCHIVE_CATEGORY = "🗄️ Bot Console Archive"
+
+_SHARD_RE = re.compile(rf"^{re.escape(BOT_CONSOLE_CATEGORY)}(?: (\d+))?$")
+_ARCHIVE_RE = re.compile(rf"^{re.escape(ARCHIVE_CATEGORY)}(?: (\d+))?$")
+
+
+def shard_category_name(index: int) -> str:
+    """index번째 bot-console 카테고리 이름 (1번은 접미사 없음)"""
+    return BOT_CONSOLE_CATEGORY if index == 1 else f"{BOT_CONSOLE_CATEGORY} {index}"
+
+
+def archive_category_name(index: int) -> str:
+    """index번째 보관 카테고리 이름 (1번은 접미사 없음)"""
+    return ARCHIVE_CATEGORY if index == 1 else f"{ARCHIVE_CATEGORY} {index}"
+
+
+_MEMBER_TAG_RE = re.compile(r"\[member:(\d+)\]")
+
+
+def member_tag(member_id: int) -> str:
+    """콘솔 채널 토픽에 남기는 소유 멤버 태그"""
+    return f"[member:{member_id}]"
+
+
+def parse_member_tag(topic: Optional[str]) -> Optional[int]:
+    """채널 토픽에서 소유 멤버 ID를 읽는다. 태그가 없으면 None."""
+    if not isinstance(topic, str):
+        return None
+    match = _MEMBER_TAG_RE.search(topic)
+    return int(match.group(1)) if match else None
+
+
+class ConsoleRegistry:
+    """콘솔 채널 ID ↔ 소유 멤버 ID 양방향 맵
+
+    멤버당 콘솔은 하나이므로 새로 등록하면 이전 매핑을 덮어쓴다.
+    """
+
+    def __init__(self):
+        self._owner: Dict[int, int] = {}
+        self._console: Dict[int, int] = {}
+
+    def register(self, channel_id: int, member_id: int):
+        self.unregister_channel(channel_id)
+        previous = self._console.pop(member_id, None)
+        if previous is not None:
+            self._owner.pop(previous, None)
+        self._owner[channel_id] = member_id
+        self._console[member_id] = channel_id
+
+    def unregister_channel(self, channel_id: int) -> Optional[int]:
+        """채널 매핑을 지우고 소유 멤버 ID를 반환한다."""
+        member_id = self._owner.pop(channel_id, None)
+        if member_id is not None:
+            self._console.pop(member_id, None)
+        return member_id
+
+    def owner_of(self, channel_id: int) -> Optional[int]:
+        return self._owner.get(channel_id)
+
+    def console_of(self, member_id: int) -> Optional[int]:
+        return self._console.get(member_id)
+
+    def clear(self):
+        self._owner.clear()
+        self._console.clear()
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._owner
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
 
 class ChannelManager:
-    """Bot-console 채널 관리"""
+    """Bot-console 채널 관리
+
+    콘솔 채널은 여러 bot-console 카테고리(샤드)에 나눠 담는다. 채널 토픽의
+    ``[member:<id>]`` 태그로 소유 멤버를 기록하고, 시작 시(``rebuild``) 태그를 읽어
+    ``ConsoleRegistry`` 를 다시 구축한다. 따라서 멤버 이름이 바뀌어도 같은 콘솔을 찾는다.
+    태그가 없는 이전 콘솔은 이름이 같은 멤버에게 등록하고, ``tag_consoles`` 로 태그를 붙인다.
+    채널 삭제 이벤트는 ``forget_channel`` 로 반영한다.
+    유휴 콘솔은 보관 카테고리로 옮기고 읽기 전용으로 바꾸며, 멤버가 다시 열면 되돌린다.
 
-    def __init__(self, guild: discord.Guild):
+    Args:
+        guild: 대상 Discord 서버
+        capacity: 카테고리 하나에 담을 최대 채널 수
+        registry: 채널 ↔ 멤버 맵 (여러 곳에서 공유할 때 전달)
+        on_forget: 콘솔 등록이 지워질 때(삭제, 보관) 소유 멤버 ID로 호출되는 콜백
+    """
+
+    def __init__(
+        self,
+        guild: discord.Guild,
+        capacity: int = CATEGORY_CHANNEL_LIMIT,
+        registry: Optional[ConsoleRegistry] = None,
+        on_forget: Optional[Callable[[int], None]] = None,
+    ):
         self.guild = guild
+        self.capacity = capacity
+        self.registry = registry if registry is not None else ConsoleRegistry()
+        self.on_forget = on_forget
+        self._shards: Optional[Dict[int, discord.CategoryChannel]] = None
+        self._load: Dict[int, int] = {}
+        self._channels: Dict[int, discord.TextChannel] = {}
+        self._untagged: Dict[str, discord.TextChannel] = {}
+        # 이름으로 등록했지만 아직 토픽에 태그를 붙이지 못한 콘솔 (채널 ID → 멤버)
+        self._needs_tag: Dict[int, discord.Member] = {}
+        # 보관 카테고리와 보관된 콘솔 (멤버 ID → 채널)
+        self._archive: Dict[int, discord.CategoryChannel] = {}
+        self._archive_load: Dict[int, int] = {}
+        self._archived: Dict[int, discord.TextChannel] = {}
+        self._shard_lock = asyncio.Lock()
+
+    def rebuild(self):
+        """카테고리와 콘솔 채널을 다시 수집해 레지스트리를 새로 구축한다.
+
+        태그 없는 이전 콘솔도 이름이 같은 멤버에게 바로 등록해 업그레이드 직후에도
+        응답하도록 한다.
+        """
+        self._shards = None
+        self._discover()
+        members = {m.name: m for m in self.guild.members if not m.bot}
+        for name, channel in list(self._untagged.items()):
+            member = members.get(name[len(BOT_CONSOLE_PREFIX):])
+            if member is None or self.registry.console_of(member.id) is not None:
+                continue
+            del self._untagged[name]
+            self._track(channel, member.id)
+            self._needs_tag[channel.id] = member
+
+    async def tag_consoles(self):
+        """이름으로 등록한 이전 콘솔의 토픽에 멤버 태그를 붙인다."""
+        while self._needs_tag:
+            channel_id, member = self._needs_tag.popitem()
+            channel = self._channels.get(channel_id)
+            if channel is not None:
+                await self._write_tag(channel, member)
+
+    async def _write_tag(self, channel: discord.TextChannel, member: discord.Member):
+        try:
+            await channel.edit(topic=f"{member.name}님의 AI 대화 채널 {member_tag(member.id)}")
+        except Exception as e:
+            logger.warning("콘솔 태그 기록 실패 (%s): %s", channel.name, e)
+
+    def _discover(self) -> Dict[int, discord.CategoryChannel]:
+        """기존 bot-console 카테고리와 콘솔 채널을 최초 1회 수집한다."""
+        if self._shards is None:
+            self._load.clear()
+            self._channels.clear()
+            self._untagged.clear()
+            self._needs_tag.clear()
+            self._archive.clear()
+            self._archive_load.clear()
+            self._archived.clear()
+            self.registry.clear()
+            shards: Dict[int, discord.CategoryChannel] = {}
+            for category in self.guild.categories:
+                match = _ARCHIVE_RE.match(category.name)
+                if match:
+                    self._discover_archive(int(match.group(1) or 1), category)
+                    continue
+                match = _SHARD_RE.match(category.name)
+                if not match:
+                    continue
+                index = int(match.group(1) or 1)
+                shards[index] = category
+                self._load[index] = len(category.channels)
+                for channel in category.channels:
+                    member_id = parse_member_tag(getattr(channel, "topic", None))
+                    if member_id is not None:
+                        self._track(channel, member_id)
+                    elif channel.name.startswith(BOT_CONSOLE_PREFIX):
+                        self._untagged[channel.name] = channel
+            self._shards = shards
+        return self._shards
+
+    def _discover_archive(self, index: int, category: discord.CategoryChannel):
+        self._archive[index] = category
+        self._archive_load[index] = len(category.channels)
+        for channel in category.channels:
+            member_id = parse_member_tag(getattr(channel, "topic", None))
+            if member_id is not None:
+                self._archived[member_id] = channel
+
+    def _track(self, channel: discord.TextChannel, member_id: int):
+        previous = self.registry.console_of(member_id)
+        if previous is not None:
+            self._channels.pop(previous, None)
+        self.registry.register(channel.id, member_id)
+        self._channels[channel.id] = channel
+
+    def _live(self, channel: discord.TextChannel) -> discord.TextChannel:
+        """guild 캐시의 최신 채널 객체.
+
+        ``create_text_channel`` 이 반환한 객체는 CHANNEL_CREATE 이벤트가 오면 캐시에서
+        다른 객체로 바뀌고, ``last_message_id`` 등은 캐시 쪽 객체에만 갱신된다.
+        아직 캐시에 없으면 보관한 객체를 그대로 쓴다.
+        """
+        live = self.guild.get_channel(channel.id)
+        return live if live is not None else channel
 
     async def get_or_create_category(self) -> discord.CategoryChannel:
-        """Bot-console 카테고리 조회/생성"""
-        category = discord.utils.get(
-            self.guild.categories, name=BOT_CONSOLE_CATEGORY
-        )
-        if not category:
-            category = await self.guild.create_category(BOT_CONSOLE_CATEGORY)
+        """첫 번째 Bot-console 카테고리 조회/생성
+
+        동시에 여러 콘솔을 만들 때 카테고리가 중복 생성되지 않도록 잠금 안에서 처리한다.
+        """
+        shards = self._discover()
+        if 1 in shards:
+            return shards[1]
+        async with self._shard_lock:
+            if 1 not in shards:
+                await self._create_shard(1)
+        return shards[1]
+
+    async def _create_shard(self, index: int, archive: bool = False) -> discord.CategoryChannel:
+        if archive:
+            category = await self.guild.create_category(archive_category_name(index))
+            self._archive[index] = category
+            self._archive_load[index] = 0
+        else:
+            category = await self.guild.create_category(shard_category_name(index))
+            self._shards[index] = category
+            self._load[index] = 0
         return category
 
+    async def _reserve_slot(self, archive: bool = False) -> int:
+        """빈자리가 있는 카테고리를 골라 한 칸 예약하고 번호를 반환한다.
+
+        모두 가득 찼으면 비어 있는 가장 작은 번호로 새 카테고리를 만든다.
+        archive가 참이면 보관 카테고리에서 고른다.
+        """
+        async with self._shard_lock:
+            shards = self._discover()
+            load = self._load
+            if archive:
+                shards, load = self._archive, self._archive_load
+            for index in sorted(shards):
+                if load[index] < self.capacity:
+                    break
+            else:
+                index = next(i for i in count(1) if i not in shards)
+                await self._create_shard(index, archive)
+            load[index] += 1
+            return index
+
+    def _release_archive_slot(self, category_id: Optional[int]):
+        for index, category in self._archive.items():
+            if category.id == category_id:
+                self._archive_load[index] -= 1
+                return
+
+    def _overwrites(self, channel: discord.TextChannel, send: bool) -> dict:
+        """멤버 권한의 메시지 전송 허용 여부만 바꾼 권한 설정 (역할/봇 권한은 그대로)"""
+        overwrites = dict(channel.overwrites)
+        for target, overwrite in overwrites.items():
+            if isinstance(target, discord.Role) or target.id == self.guild.me.id:
+                continue
+            changed = discord.PermissionOverwrite.from_pair(*overwrite.pair())
+            changed.update(send_messages=send)
+            overwrites[target] = changed
+        return overwrites
+
+    def forget_channel(self, channel: discord.abc.GuildChannel):
+        """삭제된 채널을 캐시에서 제거한다."""
+        if self._shards is None:
+            return
+        for category in [*self._shards.values(), *self._archive.values()]:
+            if channel.id == category.id:
+                # 카테고리가 지워지면 다음 조회 때 처음부터 다시 수집한다
+                self._shards = None
+                return
+        for member_id, archived in self._archived.items():
+            if archived.id == channel.id:
+                del self._archived[member_id]
+                self._release_archive_slot(channel.category_id)
+                return
+        # 삭제 이벤트의 채널 객체는 생성 시 보관한 객체와 다를 수 있으므로 ID로 비교한다
+        if channel.id in self._channels:
+            del self._channels[channel.id]
+            self._needs_tag.pop(channel.id, None)
+            member_id = self.registry.unregister_channel(channel.id)
+            if member_id is not None and self.on_forget is not None:
+                self.on_forget(member_id)
+        elif getattr(self._untagged.get(channel.name), "id", None) == channel.id:
+            del self._untagged[channel.name]
+        else:
+            return
+        for index, category in self._shards.items():
+            if channel.category_id == category.id:
+                self._load[index] -= 1
+                break
+
     async def create_user_console(
         self, member: discord.Member
     ) -> discord.TextChannel:
@@ -34,11 +321,10 @@ class ChannelManager:
         if member.bot:
             raise ValueError("봇에게는 콘솔 채널을 생성할 수 없습니다")
 
-        category = await self.get_or_create_category()
         channel_name = f"{BOT_CONSOLE_PREFIX}{member.name}"
 
         # 기존 채널 확인
-        existing = discord.utils.get(category.channels, name=channel_name)
+        existing = await self.get_user_console(member)
         if existing:
             return existing
 
@@ -62,22 +348,123 @@ class ChannelManager:
             ),
         }
 
-        channel = await category.create_text_channel(
-            name=channel_name,
-            overwrites=overwrites,
-            topic=f"{member.name}님의 AI 대화 채널",
-        )
+        index = await self._reserve_slot()
+        try:
+            channel = await self._shards[index].create_text_channel(
+                name=channel_name,
+                overwrites=overwrites,
+                topic=f"{member.name}님의 AI 대화 채널 {member_tag(member.id)}",
+            )
+        except Exception:
+            self._load[index] -= 1
+            raise
+        self._track(channel, member.id)
         return channel
 
     async def get_user_console(
         self, member: discord.Member
     ) -> Optional[discord.TextChannel]:
-        """유저의 bot-console 채널 조회"""
-        category = await self.get_or_create_category()
-        channel_name = f"{BOT_CONSOLE_PREFIX}{member.name}"
-        return discord.utils.get(category.channels, name=channel_name)
+        """유저의 bot-console 채널 조회
+
+        레지스트리에서 멤버 ID로 찾고, 보관된 콘솔이 있으면 원래 카테고리로 되돌린다.
+        둘 다 없으면 태그 없는 이전 콘솔을 이름으로 찾아 토픽에 태그를 붙인 뒤 등록한다.
+        """
+        self._discover()
+        channel_id = self.registry.console_of(member.id)
+        if channel_id is not None:
+            return self._live(self._channels[channel_id])
+        if member.id in self._archived:
+            return await self._unarchive(member)
+        channel = self._untagged.pop(f"{BOT_CONSOLE_PREFIX}{member.name}", None)
+        if channel is None:
+            return None
+        self._track(channel, member.id)
+        await self._write_tag(channel, member)
+        return channel
+
+    def is_console_channel(self, channel: discord.abc.GuildChannel) -> bool:
+        """해당 채널이 등록된 bot-console인지 확인"""
+        return channel.id in self.registry
+
+    def console_owner(self, channel: discord.abc.GuildChannel) -> Optional[int]:
+        """콘솔 채널의 소유 멤버 ID"""
+        return self.registry.owner_of(channel.id)
+
+    @property
+    def console_count(self) -> int:
+        """캐시된 콘솔 채널 수"""
+        self._discover()
+        return len(self._channels) + len(self._untagged)
+
+    async def archive_idle_consoles(self, idle_hours: float, delete: bool = False) -> int:
+        """idle_hours 이상 메시지가 없는 콘솔 채널을 정리하고 정리한 수를 반환한다.
+
+        기본으로는 보관 카테고리로 옮기고 멤버의 메시지 전송 권한을 거둔다. 채널과
+        대화 기록은 남고, 멤버가 다시 콘솔을 열면 원래대로 되돌린다.
+        delete가 참이면 채널을 영구 삭제한다.
+        """
+        cutoff = discord.utils.utcnow() - timedelta(hours=idle_hours)
+        archived = 0
+        self._discover()
+        for tracked in [*self._channels.values(), *self._untagged.values()]:
+            channel = self._live(tracked)
+            if self._last_activity(channel) >= cutoff:
+                continue
+            member_id = self.registry.owner_of(tracked.id)
+            try:
+                if delete:
+                    await channel.delete(reason="유휴 bot-console 정리")
+                else:
+                    await self._move_to_archive(channel)
+            except discord.HTTPException as e:
+                logger.warning("유휴 콘솔 정리 실패 (%s): %s", channel.name, e)
+                continue
+            # 카테고리 이동 이벤트로 캐시 객체가 먼저 바뀌었을 수 있으므로 보관한 객체로 지운다
+            self.forget_channel(tracked)
+            if not delete and member_id is not None:
+                self._archived[member_id] = channel
+            archived += 1
+        return archived
+
+    async def _move_to_archive(self, channel: discord.TextChannel):
+        index = await self._reserve_slot(archive=True)
+        try:
+            await channel.edit(
+                category=self._archive[index],
+                overwrites=self._overwrites(channel, send=False),
+                reason="유휴 bot-console 보관",
+            )
+        except Exception:
+            self._archive_load[index] -= 1
+            raise
+
+    async def _unarchive(self, member: discord.Member) -> discord.TextChannel:
+        """보관된 콘솔을 bot-console 카테고리로 되돌리고 전송 권한을 돌려준다."""
+        channel = self._live(self._archived.pop(member.id))
+        archive_category_id = channel.category_id
+        index = await self._reserve_slot()
+        try:
+            await channel.edit(
+                category=self._shards[index],
+                overwrites=self._overwrites(channel, send=True),
+                reason="bot-console 복원",
+            )
+        except Exception:
+            self._load[index] -= 1
+            self._archived[member.id] = channel
+            raise
+        self._release_archive_slot(archive_category_id)
+        self._track(channel, member.id)
+        try:
+            # 안내 메시지가 마지막 활동이 되어 다음 정리 때 바로 다시 보관되지 않는다
+            await channel.send("🗂️ 보관된 콘솔을 다시 열었습니다. 이전 대화 기록이 그대로 남아 있습니다.")
+        except discord.HTTPException as e:
+            logger.warning("콘솔 복원 안내 실패 (%s): %s", channel.name, e)
+        return channel
 
     @staticmethod
-    def is_console_channel(channel: discord.TextChannel) -> bool:
-        """해당 채널이 bot-console인지 확인"""
-        return channel.name.startswith(BOT_CONSOLE_PREFIX)
+    def _last_activity(channel: discord.TextChannel) -> datetime:
+        """마지막 메시지 시각 (메시지가 없으면 채널 생성 시각)"""
+        if channel.last_message_id:
+            return discord.utils.snowflake_time(channel.last_message_id)
+        return channel.created_at
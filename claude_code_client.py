@@ -3,13 +3,52 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import logging
 import os
+import signal
 import tempfile
 from dataclasses import dataclass
+from typing import Awaitable, Callable
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 300  # 초
 
+# 한 번의 CLI 실행에서 보관할 최대 출력(바이트). 넘으면 CLI를 종료하고 잘린 응답을 반환한다
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+# stderr는 오류 메시지 표시에만 쓰므로 앞부분만 보관한다
+STDERR_LIMIT = 64 * 1024
+READ_CHUNK = 64 * 1024
+TRUNCATED_MARKER = "\n\n…(출력이 너무 길어 잘렸습니다)"
+
+# CLI 실행당 자원 제한 (0이면 제한 없음)
+# CPU 시간(초)과 주소 공간(MB). Node.js(V8)는 가상 주소 공간을 크게 예약하므로
+# 메모리 제한은 실제 사용량보다 넉넉하게 잡아야 한다
+DEFAULT_CPU_LIMIT = 600
+DEFAULT_MEMORY_LIMIT_MB = 0
+
+# 스트리밍 모드 CLI 출력 형식 (토큰 단위 text_delta 포함)
+STREAM_FLAGS = (
+    "--output-format", "stream-json",
+    "--verbose",
+    "--include-partial-messages",
+)
+
+# 비스트리밍 모드 CLI 출력 형식 (응답 텍스트와 session_id를 담은 JSON 한 개)
+JSON_FLAGS = ("--output-format", "json")
+
+# stream-json 한 줄(도구 결과 포함)이 asyncio 기본 한도 64KB를 넘을 수 있다
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# 메모리 파일(memfd) 지원 여부. 미지원 플랫폼(macOS 등)은 임시 파일로 대체한다
+MEMFD_SUPPORTED = hasattr(os, "memfd_create")
+
 MCP_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp-config.json")
 
 ALLOWED_TOOLS = [
@@ -17,6 +56,8 @@ ALLOWED_TOOLS = [
     "mcp__project-bot__add_team",
     "mcp__project-bot__add_channel",
     "mcp__project-bot__delete_project",
+    "mcp__project-bot__get_job_status",
+    "mcp__project-bot__get_notification_status",
     "mcp__project-bot__list_projects",
     "mcp__project-bot__send_notification",
     "mcp__project-bot__send_message",
@@ -24,6 +65,205 @@ ALLOWED_TOOLS = [
 ]
 
 
+def build_command(model: str, *extra: str) -> list[str]:
+    """Claude Code CLI 공통 실행 인자를 구성한다."""
+    return [
+        "claude", "-p",
+        "--model", model,
+        "--allowedTools", ",".join(ALLOWED_TOOLS),
+        "--mcp-config", MCP_CONFIG_PATH,
+        "--strict-mcp-config",
+        *extra,
+    ]
+
+
+def format_context(context_messages: list[dict[str, str]]) -> str:
+    """이전 대화 컨텍스트를 CLI에 전달할 텍스트로 변환한다."""
+    context = "\n".join(
+        [f"{m['role']}: {m['content']}" for m in context_messages]
+    )
+    return f"이전 대화 컨텍스트:\n{context}"
+
+
+class ContextHandle:
+    """CLI에 ``--append-system-prompt-file`` 로 넘길 컨텍스트 파일
+
+    Linux에서는 디스크를 거치지 않는 memfd에 컨텍스트를 쓰고
+    ``/dev/fd/N`` 경로와 함께 fd를 자식 프로세스에 상속시킨다.
+    memfd를 쓸 수 없으면 임시 파일을 만들고 close()에서 삭제한다.
+    """
+
+    def __init__(self, path: str, fd: int | None = None):
+        self.path = path
+        self.fd = fd
+
+    @property
+    def pass_fds(self) -> tuple[int, ...]:
+        return (self.fd,) if self.fd is not None else ()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        elif self.path:
+            os.unlink(self.path)
+            self.path = ""
+
+
+def open_context(text: str, use_memfd: bool | None = None) -> ContextHandle:
+    """컨텍스트 텍스트를 담은 ContextHandle을 만든다."""
+    data = text.encode()
+    if MEMFD_SUPPORTED if use_memfd is None else use_memfd:
+        fd = os.memfd_create("claude-context", os.MFD_CLOEXEC)
+        try:
+            os.write(fd, data)
+            os.lseek(fd, 0, os.SEEK_SET)
+        except BaseException:
+            os.close(fd)
+            raise
+        return ContextHandle(f"/dev/fd/{fd}", fd)
+
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".txt", delete=False) as f:
+        f.write(data)
+    return ContextHandle(f.name)
+
+
+def parse_json_result(output: str) -> tuple[str, str | None, bool] | None:
+    """``--output-format json`` 출력에서 (응답 텍스트, session_id, 오류 여부)를 꺼낸다.
+
+    JSON 결과가 아니면 (텍스트 출력만 지원하는 CLI 버전 등) None을 반환한다.
+    """
+    try:
+        event = json.loads(output)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(event, dict) or event.get("type") != "result":
+        return None
+    return (event.get("result") or "").strip(), event.get("session_id"), bool(event.get("is_error"))
+
+
+def kill_process_tree(process: asyncio.subprocess.Process):
+    """CLI와 CLI가 띄운 자식 프로세스(MCP 클라이언트, 도구 등)를 모두 종료한다.
+
+    CLI는 ``start_new_session=True`` 로 자기 프로세스 그룹의 리더가 되므로
+    그룹 전체에 SIGKILL을 보낸다. 그룹이 없으면 직계 자식만 종료한다.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+        return
+    except (AttributeError, ProcessLookupError, PermissionError):
+        pass
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+
+
+PRLIMIT_SUPPORTED = hasattr(resource, "prlimit")
+
+
+def apply_limits(pid: int, cpu_seconds: int, memory_mb: int) -> bool:
+    """실행 중인 프로세스에 CPU 시간/주소 공간 제한을 건다. 적용했으면 True.
+
+    봇은 다른 스레드(세션 저장소 writer 등)와 함께 돌므로 fork 후 exec 전에 실행되는
+    ``preexec_fn`` 대신 spawn 직후 ``prlimit`` 으로 적용한다. 이후 CLI가 띄우는
+    자식 프로세스는 제한을 물려받는다. prlimit이 없는 플랫폼(macOS 등)에서는 적용하지 않는다.
+    """
+    if not PRLIMIT_SUPPORTED or (cpu_seconds <= 0 and memory_mb <= 0):
+        return False
+    try:
+        if cpu_seconds > 0:
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        if memory_mb > 0:
+            limit = memory_mb * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+    except (ProcessLookupError, PermissionError, ValueError) as e:
+        logger.warning("Claude CLI 자원 제한 적용 실패 (pid=%s): %s", pid, e)
+        return False
+    return True
+
+
+async def read_capped(
+    stream: asyncio.StreamReader,
+    limit: int,
+    on_overflow: Callable[[], None] | None = None,
+) -> tuple[bytes, bool]:
+    """stream을 EOF까지 읽되 앞 limit 바이트만 보관한다.
+
+    limit을 넘는 부분은 버리면서 계속 읽어 파이프가 막히지 않게 하고,
+    처음 넘었을 때 on_overflow를 한 번 호출한다.
+
+    Returns:
+        (보관한 데이터, 잘림 여부)
+    """
+    kept = bytearray()
+    truncated = False
+    while chunk := await stream.read(READ_CHUNK):
+        room = limit - len(kept)
+        if len(chunk) <= room:
+            kept += chunk
+            continue
+        kept += chunk[:max(room, 0)]
+        if not truncated:
+            truncated = True
+            if on_overflow is not None:
+                on_overflow()
+    return bytes(kept), truncated
+
+
+def truncate_text(text: str, limit: int) -> str:
+    """text를 UTF-8 기준 limit 바이트 이하로 자른다 (글자 중간에서 자르지 않음)."""
+    data = text.encode()
+    if len(data) <= limit:
+        return text
+    return data[:limit].decode(errors="ignore")
+
+
+TextCallback = Callable[[str], Awaitable[None]]
+
+
+class StreamTextExtractor:
+    """stream-json 이벤트에서 화면에 표시할 텍스트 조각을 추출한다.
+
+    ``--include-partial-messages`` 의 ``text_delta`` 를 우선 사용하고,
+    부분 메시지가 없는 CLI 버전에서는 완성된 ``assistant`` 메시지의 text 블록을 사용한다.
+    assistant 메시지가 바뀌면 (도구 호출 전후) 빈 줄로 구분한다.
+    """
+
+    def __init__(self):
+        self._saw_delta = False
+        self._emitted = False
+        self._new_message = False
+
+    def _emit(self, text: str) -> str:
+        if not text:
+            return ""
+        if self._new_message and self._emitted:
+            text = "\n\n" + text
+        self._new_message = False
+        self._emitted = True
+        return text
+
+    def feed(self, event: dict) -> str:
+        event_type = event.get("type")
+        if event_type == "stream_event":
+            inner = event.get("event", {})
+            if inner.get("type") == "message_start":
+                self._new_message = True
+            elif inner.get("type") == "content_block_delta":
+                delta = inner.get("delta", {})
+                if delta.get("type") == "text_delta":
+                    self._saw_delta = True
+                    return self._emit(delta.get("text", ""))
+        elif event_type == "assistant" and not self._saw_delta:
+            self._new_message = True
+            blocks = event.get("message", {}).get("content", [])
+            return self._emit("".join(
+                b.get("text", "") for b in blocks if b.get("type") == "text"
+            ))
+        return ""
+
+
 @dataclass
 class ClaudeResponse:
     """Claude Code CLI 실행 결과"""
@@ -31,49 +271,107 @@ class ClaudeResponse:
     text: str
     success: bool
     error: str | None = None
+    # CLI 대화 ID. 다음 요청에서 ``resume_id`` 로 넘기면 대화를 이어간다
+    session_id: str | None = None
 
 
 class ClaudeCodeClient:
     """Claude Code CLI를 subprocess로 실행하여 AI 응답을 생성한다."""
 
-    def __init__(self, timeout: int = DEFAULT_TIMEOUT, model: str = "sonnet"):
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        model: str = "sonnet",
+        pool=None,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        cpu_limit: int = DEFAULT_CPU_LIMIT,
+        memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+    ):
+        """
+        Args:
+            timeout: 요청당 최대 대기 시간 (초)
+            model: Claude 모델명
+            pool: 상주 워커 풀 (``ClaudeWorkerPool``). None이면 매 요청마다 CLI를 새로 실행한다.
+            max_output_bytes: 실행당 보관할 최대 출력 크기 (바이트)
+            cpu_limit: 실행당 CPU 시간 제한 (초, 0이면 제한 없음)
+            memory_limit_mb: 실행당 주소 공간 제한 (MB, 0이면 제한 없음)
+        """
         self.timeout = timeout
         self.model = model
+        self.pool = pool
+        self.max_output_bytes = max_output_bytes
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
 
     async def send_message(
         self,
         user_message: str,
         context_messages: list[dict[str, str]] | None = None,
+        session_key: str | None = None,
+        on_text: TextCallback | None = None,
+        resume_id: str | None = None,
     ) -> ClaudeResponse:
         """Claude Code CLI를 실행하여 AI 응답을 반환한다.
 
+        워커 풀이 설정되어 있고 session_key가 주어지면 해당 세션에 할당된
+        상주 워커로 요청을 보낸다. 풀에 여유 워커가 없으면 CLI를 새로 실행한다.
+
+        resume_id가 주어지면 ``--resume`` 으로 CLI가 보관한 대화를 이어가므로
+        컨텍스트를 다시 보내지 않는다. 대화를 이어가지 못하면 (CLI가 대화를
+        찾지 못하는 등) context_messages를 넘겨 새 대화로 한 번 더 실행한다.
+
         Args:
             user_message: 유저 메시지
             context_messages: 이전 대화 컨텍스트 메시지 목록
+            session_key: 워커 할당 기준 키 (보통 유저 ID)
+            on_text: 지정하면 stream-json 출력을 읽으며 텍스트 조각이 도착할 때마다 호출한다
+            resume_id: 이어갈 CLI 대화 ID (이전 응답의 ``session_id``)
 
         Returns:
             ClaudeResponse: CLI 실행 결과
         """
-        cmd = [
-            "claude", "-p",
-            "--model", self.model,
-            "--allowedTools", ",".join(ALLOWED_TOOLS),
-            "--mcp-config", MCP_CONFIG_PATH,
-            "--strict-mcp-config",
-        ]
-
-        context_file = None
+        if self.pool is not None and session_key is not None:
+            response = await self.pool.send(
+                session_key, user_message, context_messages,
+                timeout=self.timeout, on_text=on_text,
+            )
+            if response is not None:
+                return response
+
+        if resume_id:
+            response = await self._run(user_message, None, on_text, resume_id)
+            if response is not None:
+                return response
+        return await self._run(user_message, context_messages, on_text, None)
+
+    async def _run(
+        self,
+        user_message: str,
+        context_messages: list[dict[str, str]] | None,
+        on_text: TextCallback | None,
+        resume_id: str | None,
+    ) -> ClaudeResponse | None:
+        """CLI를 한 번 실행한다.
+
+        resume_id로 실행했는데 출력 없이 실패하면 컨텍스트로 다시 실행할 수 있도록 None을 반환한다.
+        """
+        cmd = build_command(self.model, *(STREAM_FLAGS if on_text else JSON_FLAGS))
+
+        context = None
+        process = None
+        emitted = False
+
+        async def forward(text: str):
+            nonlocal emitted
+            emitted = True
+            await on_text(text)
+
         try:
-            if context_messages:
-                context = "\n".join(
-                    [f"{m['role']}: {m['content']}" for m in context_messages]
-                )
-                context_file = tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".txt", delete=False
-                )
-                context_file.write(f"이전 대화 컨텍스트:\n{context}")
-                context_file.close()
-                cmd.extend(["--append-system-prompt-file", context_file.name])
+            if resume_id:
+                cmd.extend(["--resume", resume_id])
+            elif context_messages:
+                context = open_context(format_context(context_messages))
+                cmd.extend(["--append-system-prompt-file", context.path])
 
             cmd.append(user_message)  # 쿼리는 항상 맨 마지막
 
@@ -81,13 +379,54 @@ class ClaudeCodeClient:
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+                **({"limit": STREAM_LIMIT} if on_text else {}),
+                **({"pass_fds": context.pass_fds} if context and context.fd is not None else {}),
             )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(), timeout=self.timeout
-            )
+            apply_limits(process.pid, self.cpu_limit, self.memory_limit_mb)
+            failed = False
+            session_id = None
+            if on_text is None:
+                stdout, stderr, truncated = await asyncio.wait_for(
+                    self._communicate(process), timeout=self.timeout
+                )
+                output = stdout.decode(errors="ignore").strip()
+                parsed = parse_json_result(output)
+                if parsed is not None:
+                    output, session_id, failed = parsed
+                    if failed:
+                        stderr = stderr or output.encode()
+                        output = ""
+                elif truncated:
+                    if output.startswith("{"):
+                        # JSON 결과가 중간에 잘리면 응답 텍스트를 꺼낼 수 없다
+                        return ClaudeResponse(
+                            text="",
+                            success=False,
+                            error=(
+                                f"Claude Code 출력이 최대 크기({self.max_output_bytes}바이트)를 "
+                                "넘어 중단했습니다"
+                            ),
+                        )
+                    return ClaudeResponse(text=output + TRUNCATED_MARKER, success=True)
+            else:
+                output, stderr, failed, session_id, truncated = await asyncio.wait_for(
+                    self._read_stream(process, forward, self.max_output_bytes),
+                    timeout=self.timeout,
+                )
+                if truncated:
+                    return ClaudeResponse(
+                        text=output + TRUNCATED_MARKER, success=True, session_id=session_id
+                    )
+        except asyncio.CancelledError:
+            # 새 메시지로 대체되는 등 요청이 취소되면 CLI도 바로 종료한다
+            if process is not None:
+                kill_process_tree(process)
+                await process.wait()
+            raise
         except asyncio.TimeoutError:
-            process.kill()
-            await process.communicate()
+            kill_process_tree(process)
+            await process.wait()
             return ClaudeResponse(
                 text="",
                 success=False,
@@ -100,19 +439,104 @@ class ClaudeCodeClient:
                 error="Claude Code CLI를 찾을 수 없습니다. 설치를 확인해주세요.",
             )
         finally:
-            if context_file:
-                os.unlink(context_file.name)
+            if context:
+                context.close()
 
-        if process.returncode != 0:
-            error_msg = stderr.decode().strip() or "알 수 없는 오류"
+        if process.returncode != 0 or failed:
+            if resume_id and not emitted:
+                return None
+            # STDERR_LIMIT에서 잘린 stderr는 멀티바이트 글자 중간에서 끝날 수 있다
+            error_msg = stderr.decode(errors="replace").strip() or "알 수 없는 오류"
             return ClaudeResponse(
                 text="",
                 success=False,
                 error=f"Claude Code 오류: {error_msg}",
             )
 
-        output = stdout.decode().strip()
         return ClaudeResponse(
             text=output,
             success=True,
+            session_id=session_id,
+        )
+
+    async def _communicate(
+        self, process: asyncio.subprocess.Process
+    ) -> tuple[bytes, bytes, bool]:
+        """stdout/stderr를 크기 상한 안에서 읽고 종료를 기다린다.
+
+        stdout이 상한을 넘으면 폭주한 생성으로 보고 CLI 프로세스 그룹을 종료한다.
+
+        Returns:
+            (stdout, stderr, stdout 잘림 여부)
+        """
+        (stdout, truncated), (stderr, _) = await asyncio.gather(
+            read_capped(
+                process.stdout, self.max_output_bytes, lambda: kill_process_tree(process)
+            ),
+            read_capped(process.stderr, STDERR_LIMIT),
         )
+        await process.wait()
+        return stdout, stderr, truncated
+
+    @staticmethod
+    async def _read_stream(
+        process: asyncio.subprocess.Process,
+        on_text: TextCallback,
+        max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    ) -> tuple[str, bytes, bool, str | None, bool]:
+        """stream-json stdout을 줄 단위로 읽으며 텍스트 조각을 on_text로 전달한다.
+
+        스트리밍된 텍스트가 max_bytes를 넘으면 더 전달하지 않고 CLI 프로세스 그룹을 종료한다.
+
+        Returns:
+            (최종 응답 텍스트, stderr, 오류 여부, CLI 대화 ID, 잘림 여부): 최종 텍스트는
+            ``result`` 이벤트 값이며, result 이벤트가 없으면 스트리밍된 텍스트 전체를 사용한다.
+            result 이벤트가 오류를 나타내면 그 내용을 stderr로 돌려준다.
+        """
+        stderr_task = asyncio.create_task(read_capped(process.stderr, STDERR_LIMIT))
+        extractor = StreamTextExtractor()
+        streamed: list[str] = []
+        size = 0
+        truncated = False
+        result_event = None
+        session_id = None
+        try:
+            async for line in process.stdout:
+                if truncated:
+                    continue  # 종료될 때까지 남은 출력은 버린다
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # system(init) / result 이벤트에 CLI 대화 ID가 담겨 온다
+                session_id = event.get("session_id") or session_id
+                if event.get("type") == "result":
+                    result_event = event
+                    continue
+                text = extractor.feed(event)
+                if not text:
+                    continue
+                size += len(text.encode())
+                if size > max_bytes:
+                    text = truncate_text(text, max_bytes - (size - len(text.encode())))
+                    truncated = True
+                    kill_process_tree(process)
+                if text:
+                    streamed.append(text)
+                    await on_text(text)
+            await process.wait()
+            stderr, _ = await stderr_task
+        except BaseException:
+            stderr_task.cancel()
+            raise
+
+        if truncated:
+            return "".join(streamed).strip(), stderr, False, session_id, True
+        if result_event is None:
+            return "".join(streamed).strip(), stderr, False, session_id, False
+        result_text = result_event.get("result") or ""
+        if result_event.get("is_error"):
+            return "", stderr or result_text.encode(), True, session_id, False
+        if len(result_text.encode()) > max_bytes:
+            return truncate_text(result_text, max_bytes).strip(), stderr, False, session_id, True
+        return result_text.strip(), stderr, False, session_id, False
@@ -0,0 +1,447 @@
+"""상주 Claude Code CLI 워커 풀 모듈
+
+``claude -p --input-format stream-json --output-format stream-json`` 로 실행한
+CLI 프로세스를 유지하면서 stdin/stdout JSON 라인 프로토콜로 요청을 보낸다.
+워커는 유저 세션(key)에 할당되어 CLI 측 대화 상태를 이어가며,
+미리 띄워둔 예비 워커(warm spare)를 새 세션에 임대한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+
+from claude_code_client import (
+    DEFAULT_MAX_OUTPUT_BYTES,
+    DEFAULT_MEMORY_LIMIT_MB,
+    STREAM_LIMIT,
+    TRUNCATED_MARKER,
+    ClaudeResponse,
+    StreamTextExtractor,
+    TextCallback,
+    apply_limits,
+    build_command,
+    format_context,
+    kill_process_tree,
+    truncate_text,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_FLAGS = (
+    "--input-format", "stream-json",
+    "--output-format", "stream-json",
+    "--verbose",
+    "--include-partial-messages",
+)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_WARM_SPARES = 1
+DEFAULT_MAX_REQUESTS = 50
+DEFAULT_IDLE_TIMEOUT = 600  # 초
+DEFAULT_HEALTH_INTERVAL = 30  # 초
+
+
+def build_worker_command(model: str) -> list[str]:
+    """상주 워커용 CLI 실행 인자"""
+    return build_command(model, *WORKER_FLAGS)
+
+
+class ClaudeWorker:
+    """stream-json 프로토콜로 구동되는 상주 CLI 프로세스
+
+    한 턴의 응답 텍스트가 ``max_output_bytes`` 를 넘으면 폭주한 생성으로 보고
+    워커를 종료한 뒤 잘린 응답을 반환한다. ``memory_limit_mb`` 는 워커 프로세스에
+    주소 공간 제한으로 건다. 워커는 여러 턴을 처리하며 CPU 시간이 누적되므로
+    CPU 시간 제한은 걸지 않는다 (턴마다 timeout으로 제한).
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+    ):
+        self.command = command
+        self.max_output_bytes = max_output_bytes
+        self.memory_limit_mb = memory_limit_mb
+        self.process: asyncio.subprocess.Process | None = None
+        self.request_count = 0
+        self.last_used = time.monotonic()
+        self.session_id: str | None = None
+        self.reserved = 0  # 임대되었지만 아직 요청을 시작하지 않은 수
+        self._lock = asyncio.Lock()
+        self._stderr_tail: deque[str] = deque(maxlen=20)
+        self._stderr_task: asyncio.Task | None = None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+            start_new_session=True,
+        )
+        apply_limits(self.process.pid, 0, self.memory_limit_mb)
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+    async def _drain_stderr(self):
+        """stderr 파이프가 가득 차 워커가 멈추지 않도록 계속 읽고 마지막 줄만 보관한다."""
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                return
+            self._stderr_tail.append(line.decode(errors="replace").rstrip())
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def busy(self) -> bool:
+        return self.reserved > 0 or self._lock.locked()
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self.last_used
+
+    async def request(
+        self,
+        user_message: str,
+        context_messages: list[dict[str, str]] | None,
+        timeout: float,
+        on_text: TextCallback | None = None,
+    ) -> ClaudeResponse:
+        """유저 메시지 한 턴을 보내고 ``result`` 이벤트까지 읽는다.
+
+        워커의 첫 요청에만 이전 대화 컨텍스트를 메시지 앞에 붙인다.
+        이후 턴은 CLI 프로세스가 대화 상태를 유지한다.
+        on_text가 주어지면 도착하는 텍스트 조각을 전달한다.
+        """
+        async with self._lock:
+            text = user_message
+            if self.request_count == 0 and context_messages:
+                text = f"{format_context(context_messages)}\n\n현재 메시지:\n{user_message}"
+            self.request_count += 1
+            payload = {
+                "type": "user",
+                "message": {"role": "user", "content": [{"type": "text", "text": text}]},
+            }
+            try:
+                self.process.stdin.write(
+                    (json.dumps(payload, ensure_ascii=False) + "\n").encode()
+                )
+                await self.process.stdin.drain()
+                return await asyncio.wait_for(
+                    self._read_result(on_text), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                await self.close(graceful=False)
+                return ClaudeResponse(
+                    text="",
+                    success=False,
+                    error=f"Claude Code 응답 시간 초과 ({timeout}초)",
+                )
+            except (BrokenPipeError, ConnectionResetError):
+                await self.close()
+                return self._crashed()
+            except asyncio.CancelledError:
+                # 턴 중간에 취소되면 출력 스트림 위치를 맞출 수 없으므로 워커를 버린다
+                await self.close(graceful=False)
+                raise
+            finally:
+                self.last_used = time.monotonic()
+
+    async def _read_result(self, on_text: TextCallback | None) -> ClaudeResponse:
+        extractor = StreamTextExtractor()
+        streamed: list[str] = []
+        size = 0
+        while True:
+            try:
+                line = await self.process.stdout.readline()
+            except ValueError:
+                # 한 줄이 STREAM_LIMIT를 넘었다
+                return await self._overflow(streamed)
+            if not line:
+                await self.close()
+                return self._crashed()
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("type") != "result":
+                text = extractor.feed(event)
+                if not text:
+                    continue
+                room = self.max_output_bytes - size
+                size += len(text.encode())
+                if size > self.max_output_bytes:
+                    text = truncate_text(text, room)
+                if text:
+                    streamed.append(text)
+                    if on_text is not None:
+                        await on_text(text)
+                if size > self.max_output_bytes:
+                    return await self._overflow(streamed)
+                continue
+            self.session_id = event.get("session_id") or self.session_id
+            if event.get("is_error"):
+                error_msg = event.get("result") or "알 수 없는 오류"
+                return ClaudeResponse(
+                    text="", success=False, error=f"Claude Code 오류: {error_msg}"
+                )
+            result_text = event.get("result") or ""
+            if len(result_text.encode()) > self.max_output_bytes:
+                result_text = truncate_text(result_text, self.max_output_bytes).strip()
+                return ClaudeResponse(text=result_text + TRUNCATED_MARKER, success=True)
+            return ClaudeResponse(text=result_text.strip(), success=True)
+
+    async def _overflow(self, streamed: list[str]) -> ClaudeResponse:
+        """응답이 최대 크기를 넘은 턴: 워커를 종료하고 잘린 응답을 반환한다."""
+        logger.warning("Claude 워커 출력이 최대 크기(%d바이트)를 넘어 종료", self.max_output_bytes)
+        await self.close(graceful=False)
+        return ClaudeResponse(text="".join(streamed).strip() + TRUNCATED_MARKER, success=True)
+
+    def _crashed(self) -> ClaudeResponse:
+        detail = self._stderr_tail[-1] if self._stderr_tail else "알 수 없는 오류"
+        return ClaudeResponse(
+            text="",
+            success=False,
+            error=f"Claude Code 워커가 비정상 종료했습니다: {detail}",
+        )
+
+    async def close(self, graceful: bool = True):
+        """프로세스를 종료한다. 이미 종료되었으면 아무 작업도 하지 않는다.
+
+        graceful이면 stdin을 닫고 최대 5초간 스스로 종료하기를 기다린다.
+        """
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            try:
+                if not graceful:
+                    raise asyncio.TimeoutError
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+                kill_process_tree(self.process)
+                await self.process.wait()
+        if self._stderr_task is not None:
+            await self._stderr_task
+
+
+class ClaudeWorkerPool:
+    """세션별로 할당되는 상주 CLI 워커 풀
+
+    - 세션 키마다 워커 하나를 할당해 대화가 끝날 때까지 재사용한다
+    - ``warm_spares`` 개의 예비 워커를 미리 띄워 새 세션의 첫 요청도 spawn 비용 없이 처리한다
+    - ``max_requests`` 요청을 처리한 워커는 교체하고, ``idle_timeout`` 동안
+      사용되지 않은 워커는 정리한다
+    - 워커 수가 ``max_workers`` 에 도달했고 비어 있는 워커가 없으면 None을 반환하여
+      호출자가 일회성 CLI 실행으로 대체하게 한다
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        warm_spares: int = DEFAULT_WARM_SPARES,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers는 1 이상이어야 합니다")
+        self.command = command
+        self.max_workers = max_workers
+        self.warm_spares = min(warm_spares, max_workers)
+        self.max_requests = max_requests
+        self.idle_timeout = idle_timeout
+        self.health_interval = health_interval
+        self.max_output_bytes = max_output_bytes
+        self.memory_limit_mb = memory_limit_mb
+        self._assigned: "OrderedDict[str, ClaudeWorker]" = OrderedDict()
+        self._spares: list[ClaudeWorker] = []
+        self._maintenance_task: asyncio.Task | None = None
+        self._fill_lock = asyncio.Lock()
+        self._background: set[asyncio.Task] = set()
+        # 시작 중인 예비 워커 수 (start()가 끝나기 전에도 max_workers에 포함한다)
+        self._starting = 0
+        self._recycled = 0
+        self._evicted = 0
+
+    @property
+    def worker_count(self) -> int:
+        return len(self._assigned) + len(self._spares) + self._starting
+
+    async def start(self):
+        """예비 워커를 띄우고 주기적 상태 점검 태스크를 시작한다."""
+        await self._fill_spares()
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def close(self):
+        """모든 워커를 종료한다."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        workers = list(self._assigned.values()) + self._spares
+        self._assigned.clear()
+        self._spares.clear()
+        await asyncio.gather(
+            *(w.close() for w in workers), *self._background, return_exceptions=True
+        )
+
+    async def send(
+        self,
+        key: str,
+        user_message: str,
+        context_messages: list[dict[str, str]] | None,
+        timeout: float,
+        on_text: TextCallback | None = None,
+    ) -> ClaudeResponse | None:
+        """key에 할당된 워커로 요청을 보낸다. 사용할 워커가 없으면 None."""
+        try:
+            worker = await self._lease(key)
+        except (FileNotFoundError, OSError) as e:
+            logger.warning("Claude 워커 실행 실패: %s", e)
+            return None
+        if worker is None:
+            return None
+        try:
+            response = await worker.request(
+                user_message, context_messages, timeout, on_text=on_text
+            )
+        finally:
+            worker.reserved -= 1
+        released = self._assigned.get(key) is not worker
+        if released and worker.busy:
+            return response  # 같은 워커를 쓰는 나머지 요청이 끝나면 정리한다
+        if released or not worker.alive or worker.request_count >= self.max_requests:
+            self._retire(key, worker)
+        return response
+
+    def release(self, key: str):
+        """세션의 워커 할당을 해제한다. (세션 종료, 콘솔 정리 시 호출)
+
+        요청을 처리 중인 워커는 요청이 끝난 뒤 종료한다.
+        """
+        worker = self._assigned.pop(key, None)
+        if worker is not None and not worker.busy:
+            self._close_later(worker)
+
+    async def _lease(self, key: str) -> ClaudeWorker | None:
+        worker = self._assigned.get(key)
+        if worker is not None and worker.alive:
+            self._assigned.move_to_end(key)
+            worker.reserved += 1
+            return worker
+        if worker is not None:
+            self._retire(key, worker)
+
+        while self._spares:
+            spare = self._spares.pop()
+            if spare.alive:
+                self._assigned[key] = spare
+                spare.reserved += 1
+                self._spawn_background(self._fill_spares())
+                return spare
+
+        if self.worker_count >= self.max_workers and not self._evict_lru_idle():
+            return None
+        worker = self._new_worker()
+        worker.reserved += 1
+        self._assigned[key] = worker
+        try:
+            await worker.start()
+        except BaseException:
+            self._assigned.pop(key, None)
+            raise
+        return worker
+
+    def _new_worker(self) -> ClaudeWorker:
+        return ClaudeWorker(
+            self.command,
+            max_output_bytes=self.max_output_bytes,
+            memory_limit_mb=self.memory_limit_mb,
+        )
+
+    def _retire(self, key: str, worker: ClaudeWorker):
+        if self._assigned.get(key) is worker:
+            del self._assigned[key]
+        if worker.request_count >= self.max_requests:
+            self._recycled += 1
+        self._close_later(worker)
+
+    def _close_later(self, worker: ClaudeWorker):
+        """워커 종료를 백그라운드로 진행한다."""
+        self._spawn_background(worker.close())
+
+    def _spawn_background(self, coro):
+        """백그라운드 태스크를 시작한다. (close()에서 완료를 기다린다)"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _evict_lru_idle(self) -> bool:
+        """가장 오래 사용되지 않은 유휴 워커 하나를 정리한다."""
+        for key, worker in self._assigned.items():
+            if not worker.busy:
+                del self._assigned[key]
+                self._evicted += 1
+                self._close_later(worker)
+                return True
+        return False
+
+    async def _fill_spares(self):
+        async with self._fill_lock:
+            while (
+                len(self._spares) < self.warm_spares
+                and self.worker_count < self.max_workers
+            ):
+                worker = self._new_worker()
+                # 시작하는 동안 다른 _lease가 같은 자리에 워커를 띄우지 않도록 먼저 센다
+                self._starting += 1
+                try:
+                    await worker.start()
+                except (FileNotFoundError, OSError) as e:
+                    logger.warning("Claude 예비 워커 실행 실패: %s", e)
+                    return
+                finally:
+                    self._starting -= 1
+                self._spares.append(worker)
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("Claude 워커 상태 점검 실패")
+
+    async def check_health(self):
+        """죽은 워커와 유휴 워커를 정리하고 예비 워커를 보충한다."""
+        for key, worker in list(self._assigned.items()):
+            if not worker.alive:
+                self._retire(key, worker)
+            elif not worker.busy and worker.idle_for() > self.idle_timeout:
+                self._evicted += 1
+                self._retire(key, worker)
+        self._spares = [w for w in self._spares if w.alive]
+        await self._fill_spares()
+
+    def stats(self) -> dict:
+        """풀 상태 지표"""
+        return {
+            "workers": self.worker_count,
+            "assigned": len(self._assigned),
+            "spares": len(self._spares),
+            "busy": sum(1 for w in self._assigned.values() if w.busy),
+            "max_workers": self.max_workers,
+            "recycled": self._recycled,
+            "evicted": self._evicted,
+        }
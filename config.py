@@ -20,3 +20,79 @@ NOTIFICATION_TYPES = {
     'test': {'emoji': '✔', 'color': 0xF1C40F, 'label': '테스트 진행'},
     'deploy': {'emoji': '🚀', 'color': 0xE91E63, 'label': '배포 진행'},
 }
+
+# Discord REST API 동시 요청 상한 (카테고리/채널 생성·삭제)
+# 채널 생성과 삭제는 guild 단위 rate-limit 버킷을 공유하므로 작게 유지한다
+DISCORD_API_CONCURRENCY = 5
+
+# bot-console 메시지 처리 스케줄러
+# 전체 동시 실행 수, 유저당 동시 실행 수, 유저당 대기 가능한 요청 수
+CLAUDE_MAX_CONCURRENCY = 3
+CLAUDE_PER_USER_CONCURRENCY = 1
+CLAUDE_MAX_QUEUE_PER_USER = 5
+# 응답을 기다리는 중 같은 유저가 새 메시지를 보냈을 때
+# "cancel": 이전 요청(실행/대기 중)을 취소하고 새 메시지를 처리
+# "queue": 이전 요청이 끝난 뒤 차례대로 처리
+CLAUDE_SUPERSEDE = "cancel"
+
+# 전체 동시 실행 수 자동 조절 (CLAUDE_MAX_CONCURRENCY에서 시작)
+# 최솟값, 최댓값(0이면 CPU 수), 최근/평소 응답 시간 비율 한도,
+# CPU당 load average 한도(0이면 부하 무시), 축소 시 곱하는 비율
+CLAUDE_CONCURRENCY_MIN = 1
+CLAUDE_CONCURRENCY_MAX = 0
+CLAUDE_LATENCY_TOLERANCE = 2.0
+CLAUDE_LOAD_PER_CPU = 1.0
+CLAUDE_CONCURRENCY_BACKOFF = 0.75
+
+# bot-console 연속 메시지 묶기
+# 마지막 메시지 이후 다음 메시지를 기다리는 시간(초, 0이면 묶지 않음),
+# 입력 중 이벤트 이후 기다리는 시간(초), 첫 메시지부터 최대 대기 시간(초)
+CONSOLE_DEBOUNCE = 1.5
+CONSOLE_DEBOUNCE_TYPING = 5.0
+CONSOLE_DEBOUNCE_MAX = 10.0
+
+# 대화 세션 메모리 상한
+# 세션 수 상한 (초과 시 가장 오래 사용하지 않은 세션부터 제거)
+MAX_SESSIONS = 1000
+# 세션당 보관 메시지 수 (bot-console 컨텍스트 10개 + 세션 조회 여유분)
+MAX_SESSION_MESSAGES = 50
+# 유휴 세션 정리 주기(초)와 기준 시간(시간)
+SESSION_CLEANUP_INTERVAL = 600
+SESSION_IDLE_HOURS = 24
+
+# bot-console 대화 컨텍스트 예산 (CLI에 전달하는 "role: content" 텍스트 기준 글자 수)
+CONTEXT_CHAR_BUDGET = 6000
+# 예산 안에 들어가도 포함할 최대 메시지 수
+CONTEXT_MAX_MESSAGES = 20
+# 예산 밖 이전 대화를 요약으로 접어 넣을지 여부와 요약 최대 글자 수
+CONTEXT_SUMMARY = False
+CONTEXT_SUMMARY_CHARS = 1000
+
+# bot-console 생성 방식
+# "eager": 봇 준비/멤버 입장 시 모든 멤버의 콘솔 생성
+# "lazy": /console 명령이나 봇에게 보낸 첫 DM으로 필요한 멤버만 생성 (대규모 서버용)
+CONSOLE_MODE = "eager"
+# lazy 모드에서 이 시간(시간) 이상 메시지가 없는 콘솔은 보관 카테고리로 옮기고, 정리 검사 주기(초)
+CONSOLE_IDLE_HOURS = 72
+CONSOLE_ARCHIVE_INTERVAL = 3600
+# 보관 대신 유휴 콘솔을 영구 삭제할지 여부 (세션 저장소가 있을 때만 적용)
+CONSOLE_ARCHIVE_DELETE = False
+
+# read_messages용 채널별 메시지 캐시
+# 채널당 보관 메시지 수, REST로 다시 맞추기 전까지 신뢰하는 시간(초), 캐시할 채널 수
+MESSAGE_CACHE_SIZE = 100
+MESSAGE_CACHE_TTL = 300
+MESSAGE_CACHE_CHANNELS = 200
+
+# read_messages 한 번에 검사할 최대 메시지 수와 응답 최대 바이트(UTF-8)
+READ_MESSAGES_SCAN_LIMIT = 1000
+READ_MESSAGES_MAX_BYTES = 16000
+
+# send_notification 배치 전송
+# 첫 알림 이후 같은 메시지로 묶을 알림을 기다리는 시간(초), 같은 채널로 보내는 최소 간격(초)
+NOTIFY_BATCH_WINDOW = 0.5
+NOTIFY_MIN_INTERVAL = 1.0
+# 전송 실패 시 재시도 대기 시간(초, 실패할 때마다 두 배)과 상한, 최대 시도 횟수
+NOTIFY_RETRY_BASE = 2.0
+NOTIFY_RETRY_MAX = 300.0
+NOTIFY_MAX_ATTEMPTS = 10
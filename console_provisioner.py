@@ -0,0 +1,152 @@
+"""멤버별 bot-console 채널 일괄 생성 모듈
+
+봇 준비 시 전체 멤버의 콘솔을 동시 요청 수 제한 안에서 병렬로 만들고,
+실패한 멤버는 재시도 큐에 넣어 지연 후 다시 시도한다.
+새로 들어온 멤버(``on_member_join``)도 같은 경로로 처리한다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+from channel_manager import ChannelManager
+
+logger = logging.getLogger(__name__)
+
+# 콘솔 생성 후 호출되는 콜백 (웰컴 메시지 전송 등)
+ConsoleCallback = Callable[[discord.Member, discord.TextChannel], Awaitable[None]]
+
+# 재시도 간격(초). 길이가 최대 재시도 횟수가 된다
+RETRY_DELAYS: Tuple[float, ...] = (5, 30, 120)
+
+
+@dataclass
+class ConsoleProvisionResult:
+    """일괄 생성 결과"""
+
+    ready: int = 0
+    failed: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class ConsoleProvisioner:
+    """bot-console 채널 병렬 생성 + 재시도 큐
+
+    Args:
+        concurrency: 동시에 진행할 콘솔 생성 수 (Discord REST 동시 요청 상한)
+        retry_delays: 실패 시 재시도 전 대기 시간 목록
+    """
+
+    def __init__(self, concurrency: int, retry_delays: Tuple[float, ...] = RETRY_DELAYS):
+        if concurrency < 1:
+            raise ValueError("concurrency는 1 이상이어야 합니다")
+        self.retry_delays = retry_delays
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._retries: Dict[int, asyncio.Task] = {}
+
+    async def provision(
+        self,
+        channel_mgr: ChannelManager,
+        members: Iterable[discord.Member],
+        on_ready: Optional[ConsoleCallback] = None,
+    ) -> ConsoleProvisionResult:
+        """봇이 아닌 멤버 전원의 콘솔을 병렬로 준비한다."""
+        start = time.monotonic()
+        targets = [m for m in members if not m.bot]
+        results = await asyncio.gather(
+            *(self._provision_one(channel_mgr, m, on_ready) for m in targets)
+        )
+        result = ConsoleProvisionResult(elapsed=time.monotonic() - start)
+        for member, ok in zip(targets, results):
+            if ok:
+                result.ready += 1
+            else:
+                result.failed.append(member.name)
+                self._schedule_retry(channel_mgr, member, on_ready, attempt=0)
+        logger.info(
+            "콘솔 준비 완료: %d명 성공, %d명 재시도 대기 (%.2fs)",
+            result.ready, len(result.failed), result.elapsed,
+        )
+        return result
+
+    async def provision_member(
+        self,
+        channel_mgr: ChannelManager,
+        member: discord.Member,
+        on_ready: Optional[ConsoleCallback] = None,
+    ) -> bool:
+        """멤버 한 명의 콘솔을 준비한다. 실패하면 재시도 큐에 넣고 False 반환."""
+        if member.bot:
+            return False
+        if await self._provision_one(channel_mgr, member, on_ready):
+            return True
+        self._schedule_retry(channel_mgr, member, on_ready, attempt=0)
+        return False
+
+    async def _provision_one(
+        self,
+        channel_mgr: ChannelManager,
+        member: discord.Member,
+        on_ready: Optional[ConsoleCallback],
+    ) -> bool:
+        try:
+            async with self._semaphore:
+                channel = await channel_mgr.create_user_console(member)
+            if on_ready is not None:
+                await on_ready(member, channel)
+            return True
+        except Exception as e:
+            logger.warning("콘솔 생성 실패 (%s): %s", member.name, e)
+            return False
+
+    # ------------------------------------------------------------------
+    # 재시도 큐
+    # ------------------------------------------------------------------
+
+    def _schedule_retry(
+        self,
+        channel_mgr: ChannelManager,
+        member: discord.Member,
+        on_ready: Optional[ConsoleCallback],
+        attempt: int,
+    ):
+        if attempt >= len(self.retry_delays):
+            logger.error("콘솔 생성 재시도 한도 초과: %s", member.name)
+            return
+        if member.id in self._retries:
+            return
+        self._retries[member.id] = asyncio.create_task(
+            self._retry(channel_mgr, member, on_ready, attempt)
+        )
+
+    async def _retry(
+        self,
+        channel_mgr: ChannelManager,
+        member: discord.Member,
+        on_ready: Optional[ConsoleCallback],
+        attempt: int,
+    ):
+        try:
+            await asyncio.sleep(self.retry_delays[attempt])
+            ok = await self._provision_one(channel_mgr, member, on_ready)
+        finally:
+            self._retries.pop(member.id, None)
+        if not ok:
+            self._schedule_retry(channel_mgr, member, on_ready, attempt + 1)
+
+    @property
+    def pending_retries(self) -> List[int]:
+        """재시도 대기 중인 멤버 ID 목록"""
+        return list(self._retries)
+
+    async def close(self):
+        """대기 중인 재시도를 취소한다."""
+        tasks = list(self._retries.values())
+        self._retries.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,252 @@
+"""유저별 공정 스케줄러 모듈
+
+bot-console 메시지 처리(Claude CLI 실행)의 동시 실행 수를 제한하면서
+유저마다 대기열을 따로 두고 라운드 로빈(가중치 지원)으로 실행 슬롯을 배분한다.
+한 유저가 메시지를 몰아 보내도 다른 유저의 요청이 밀리지 않는다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 대기 순번 알림 콜백: (전체 대기열 기준 예상 순번) -> None
+QueuedCallback = Callable[[int], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """유저 대기열이 가득 차 요청을 거절할 때 발생"""
+
+
+class _Waiter:
+    __slots__ = ("future", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class FairScheduler:
+    """유저별 대기열 + 라운드 로빈 실행 슬롯 배분기
+
+    Args:
+        max_concurrency: 전체 동시 실행 상한
+        per_user_limit: 유저당 동시 실행 상한
+        max_queue_per_user: 유저당 대기 가능한 요청 수 (초과 시 QueueFullError)
+        weights: 유저별 가중치. 한 차례에 연속으로 받을 수 있는 슬롯 수 (기본 1)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 3,
+        per_user_limit: int = 1,
+        max_queue_per_user: int = 5,
+        weights: Optional[Dict[str, int]] = None,
+    ):
+        if max_concurrency < 1 or per_user_limit < 1:
+            raise ValueError("동시 실행 상한은 1 이상이어야 합니다")
+        self.max_concurrency = max_concurrency
+        self.per_user_limit = per_user_limit
+        self.max_queue_per_user = max_queue_per_user
+        self.weights: Dict[str, int] = dict(weights or {})
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._rotation: Deque[str] = deque()
+        self._credits: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._active = 0
+        # 지표
+        self._served = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # ------------------------------------------------------------------
+    # 슬롯 획득/반환
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, on_queued: Optional[QueuedCallback] = None):
+        """실행 슬롯을 점유하는 async context manager"""
+        await self.acquire(user_id, on_queued)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+    async def acquire(self, user_id: str, on_queued: Optional[QueuedCallback] = None):
+        """실행 슬롯을 얻을 때까지 대기한다.
+
+        바로 실행할 수 없으면 유저 대기열에 넣고, 대기열이 가득 찼으면
+        QueueFullError를 발생시킨다. 대기하게 되면 on_queued로 예상 순번을 알린다.
+        """
+        queue = self._queues.get(user_id)
+        if queue is None and self._can_run(user_id):
+            self._grant(user_id)
+            self._record_wait(0.0)
+            return
+
+        if queue is not None and len(queue) >= self.max_queue_per_user:
+            self._rejected += 1
+            raise QueueFullError(
+                f"대기 중인 요청이 너무 많습니다 (최대 {self.max_queue_per_user}개). "
+                f"이전 응답이 끝난 뒤 다시 보내주세요."
+            )
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        if queue is None:
+            queue = self._queues[user_id] = deque()
+            self._rotation.append(user_id)
+        queue.append(waiter)
+        position = self.queue_position(user_id, len(queue))
+
+        if on_queued is not None:
+            try:
+                await on_queued(position)
+            except Exception:
+                logger.exception("대기 순번 알림 실패 (user=%s)", user_id)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 받은 직후 취소되면 반환한다
+                self.release(user_id)
+            else:
+                self._discard(user_id, waiter)
+            raise
+
+    def set_max_concurrency(self, limit: int):
+        """전체 동시 실행 상한을 바꾼다.
+
+        늘어나면 대기 중인 요청에 바로 슬롯을 배분하고, 줄어들면 실행 중인 요청은
+        그대로 두고 새 상한 아래로 내려갈 때까지 배분하지 않는다.
+        """
+        if limit < 1:
+            raise ValueError("동시 실행 상한은 1 이상이어야 합니다")
+        self.max_concurrency = limit
+        self._dispatch()
+
+    def release(self, user_id: str):
+        """실행 슬롯을 반환하고 다음 대기 요청에 배분한다."""
+        self._active -= 1
+        remaining = self._running.get(user_id, 1) - 1
+        if remaining > 0:
+            self._running[user_id] = remaining
+        else:
+            self._running.pop(user_id, None)
+        self._dispatch()
+
+    # ------------------------------------------------------------------
+    # 내부
+    # ------------------------------------------------------------------
+
+    def _can_run(self, user_id: str) -> bool:
+        return (
+            self._active < self.max_concurrency
+            and self._running.get(user_id, 0) < self.per_user_limit
+        )
+
+    def _grant(self, user_id: str):
+        self._active += 1
+        self._running[user_id] = self._running.get(user_id, 0) + 1
+
+    def _record_wait(self, waited: float):
+        self._served += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _dispatch(self):
+        """라운드 로빈으로 대기 중인 유저에게 빈 슬롯을 배분한다.
+
+        가중치가 w인 유저는 차례가 오면 최대 w개의 슬롯을 연속으로 받은 뒤
+        대기열 맨 뒤로 이동한다.
+        """
+        skipped = 0
+        while self._active < self.max_concurrency and skipped < len(self._rotation):
+            user_id = self._rotation[0]
+            if not self._can_run(user_id):
+                self._rotation.rotate(-1)
+                skipped += 1
+                continue
+
+            queue = self._queues[user_id]
+            waiter = queue.popleft()
+            self._grant(user_id)
+            self._record_wait(time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+            skipped = 0
+
+            credits = self._credits.get(user_id, self.weights.get(user_id, 1)) - 1
+            if not queue:
+                self._drop_user(user_id)
+            elif credits <= 0:
+                self._credits.pop(user_id, None)
+                self._rotation.rotate(-1)
+            else:
+                self._credits[user_id] = credits
+
+    def _discard(self, user_id: str, waiter: _Waiter):
+        """취소된 대기 요청을 대기열에서 제거한다."""
+        queue = self._queues.get(user_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            self._drop_user(user_id)
+
+    def _drop_user(self, user_id: str):
+        self._queues.pop(user_id, None)
+        self._credits.pop(user_id, None)
+        try:
+            self._rotation.remove(user_id)
+        except ValueError:
+            pass
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def queue_position(self, user_id: str, nth: int) -> int:
+        """유저 대기열의 nth번째 요청이 전체에서 몇 번째로 실행될지 추정한다.
+
+        라운드 로빈에서는 다른 유저마다 최대 nth개(가중치 반영)의 요청이 먼저 실행된다.
+        """
+        ahead = 0
+        for other, queue in self._queues.items():
+            if other == user_id:
+                continue
+            ahead += min(len(queue), nth * self.weights.get(other, 1))
+        return ahead + nth
+
+    def queue_depth(self, user_id: str) -> int:
+        queue = self._queues.get(user_id)
+        return len(queue) if queue else 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> dict:
+        """스케줄러 상태 지표"""
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "per_user_limit": self.per_user_limit,
+            "queued": self.queued,
+            "queues": {user_id: len(q) for user_id, q in self._queues.items()},
+            "served": self._served,
+            "rejected": self._rejected,
+            "avg_wait": round(self._total_wait / self._served, 3) if self._served else 0.0,
+            "max_wait": round(self._max_wait, 3),
+        }
@@ -0,0 +1,104 @@
+"""백그라운드 작업 등록/조회 모듈
+
+오래 걸리는 도구 호출(프로젝트 삭제 등)을 백그라운드 태스크로 실행하고
+job id로 진행 상황을 조회할 수 있게 한다.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 100
+
+
+@dataclass
+class Job:
+    """백그라운드 작업 상태"""
+
+    job_id: str
+    kind: str
+    status: str = "running"  # running / completed / failed
+    done: int = 0
+    total: int = 0
+    result: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    def update_progress(self, done: int, total: int):
+        self.done = done
+        self.total = total
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {"done": self.done, "total": self.total},
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobRegistry:
+    """백그라운드 작업 관리자
+
+    완료된 작업은 최근 ``max_finished`` 개까지만 보관한다.
+    """
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[str]]) -> Job:
+        """작업을 백그라운드로 시작하고 즉시 Job을 반환한다.
+
+        Args:
+            kind: 작업 종류 (예: ``delete_project``)
+            run: Job을 받아 진행률을 갱신하고 결과 요약 문자열을 반환하는 코루틴 함수
+        """
+        job = Job(job_id=uuid.uuid4().hex[:12], kind=kind)
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, run))
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[str]]):
+        try:
+            job.result = await run(job)
+            job.status = "completed"
+        except Exception as e:
+            logger.exception("백그라운드 작업 실패: %s (%s)", job.job_id, job.kind)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.now()
+            self._tasks.pop(job.job_id, None)
+            self._prune()
+
+    def _prune(self):
+        finished = [jid for jid, j in self._jobs.items() if j.status != "running"]
+        for jid in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회. 존재하지 않으면 None 반환."""
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str):
+        """작업이 끝날 때까지 대기한다. (테스트/종료 처리용)"""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await task
+
+
+# 전역 인스턴스
+job_registry = JobRegistry()
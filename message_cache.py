@@ -0,0 +1,216 @@
+"""채널별 최근 메시지 캐시 모듈
+
+``read_messages`` 도구가 같은 채널을 반복해서 읽을 때 매번 REST로 히스토리를
+가져오지 않도록 채널마다 최근 메시지를 링 버퍼에 보관한다.
+Gateway 메시지 생성/수정/삭제 이벤트로 갱신하고, 캐시가 요청한 개수만큼
+메시지를 갖고 있지 않거나 TTL이 지났을 때만 REST로 다시 채운다(backfill).
+"""
+
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import AsyncIterator, Deque, Iterable, List, NamedTuple, Optional
+
+import discord
+
+from config import MESSAGE_CACHE_CHANNELS, MESSAGE_CACHE_SIZE, MESSAGE_CACHE_TTL
+
+
+class CachedMessage(NamedTuple):
+    """캐시에 보관하는 메시지 요약 (discord.Message 전체를 붙잡지 않는다)"""
+
+    id: int
+    created_at: datetime
+    author_id: int
+    author: str
+    content: str
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "CachedMessage":
+        return cls(
+            id=message.id,
+            created_at=message.created_at,
+            author_id=message.author.id,
+            author=message.author.display_name,
+            content=message.content,
+        )
+
+    def format(self) -> str:
+        timestamp = self.created_at.strftime("%Y-%m-%d %H:%M")
+        return f"[{timestamp}] {self.author}: {self.content}"
+
+
+class _ChannelEntry:
+    __slots__ = ("messages", "complete", "synced_at")
+
+    def __init__(self, capacity: int):
+        # 오래된 메시지 → 최신 메시지 순서
+        self.messages: Deque[CachedMessage] = deque(maxlen=capacity)
+        # 채널의 첫 메시지까지 모두 담고 있는지 (더 오래된 메시지가 없음)
+        self.complete = False
+        self.synced_at = time.monotonic()
+
+
+class MessageCache:
+    """채널별 최근 메시지 링 캐시
+
+    Gateway 이벤트는 연결된 동안의 메시지를 빠짐없이 전달하므로, 캐시에 쌓인
+    메시지는 최신 메시지부터 끊김 없이 이어진다. 따라서 요청 개수만큼 쌓여 있으면
+    REST 없이 응답할 수 있다. 재연결로 이벤트를 놓쳤을 수 있으면 ``clear`` 한다.
+
+    Args:
+        capacity: 채널당 보관할 메시지 수
+        ttl: REST로 다시 맞추기 전까지 캐시를 신뢰하는 시간(초)
+        max_channels: 캐시할 채널 수 상한 (초과 시 가장 오래 쓰지 않은 채널부터 제거)
+    """
+
+    def __init__(
+        self,
+        capacity: int = MESSAGE_CACHE_SIZE,
+        ttl: float = MESSAGE_CACHE_TTL,
+        max_channels: int = MESSAGE_CACHE_CHANNELS,
+    ):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[int, _ChannelEntry]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _entry(self, channel_id: int) -> _ChannelEntry:
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            entry = self._channels[channel_id] = _ChannelEntry(self.capacity)
+            while len(self._channels) > self.max_channels:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel_id)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Gateway 이벤트 반영
+    # ------------------------------------------------------------------
+
+    def add(self, message: discord.Message):
+        """새 메시지를 캐시에 추가한다."""
+        entry = self._entry(message.channel.id)
+        if len(entry.messages) == self.capacity:
+            # 가장 오래된 메시지가 밀려나므로 더 이상 채널 전체가 아니다
+            entry.complete = False
+        entry.messages.append(CachedMessage.from_message(message))
+
+    def update(self, message: discord.Message):
+        """수정된 메시지를 반영한다. 캐시에 없는 메시지는 무시한다."""
+        entry = self._channels.get(message.channel.id)
+        if entry is None:
+            return
+        for i, cached in enumerate(entry.messages):
+            if cached.id == message.id:
+                entry.messages[i] = CachedMessage.from_message(message)
+                return
+
+    def remove(self, channel_id: int, message_ids: Iterable[int]):
+        """삭제된 메시지를 캐시에서 제거한다."""
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            return
+        ids = set(message_ids)
+        kept = [m for m in entry.messages if m.id not in ids]
+        if len(kept) != len(entry.messages):
+            entry.messages.clear()
+            entry.messages.extend(kept)
+
+    def forget(self, channel_id: int):
+        """채널 캐시를 버린다 (채널 삭제 등)."""
+        self._channels.pop(channel_id, None)
+
+    def clear(self):
+        """모든 캐시를 버린다 (재연결로 이벤트를 놓쳤을 수 있을 때)."""
+        self._channels.clear()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def get(self, channel_id: int, limit: int) -> Optional[List[CachedMessage]]:
+        """최신 메시지부터 limit개를 반환한다. 캐시로 응답할 수 없으면 None."""
+        entry = self._channels.get(channel_id)
+        if entry is None or time.monotonic() - entry.synced_at > self.ttl:
+            return None
+        if len(entry.messages) < limit and not entry.complete:
+            return None
+        self._channels.move_to_end(channel_id)
+        count = min(limit, len(entry.messages))
+        return [entry.messages[-1 - i] for i in range(count)]
+
+    async def recent(self, channel: discord.abc.Messageable, limit: int) -> List[CachedMessage]:
+        """최신 메시지부터 limit개를 반환한다. 캐시가 부족하면 REST로 채운다."""
+        cached = self.get(channel.id, limit)
+        if cached is not None:
+            self._hits += 1
+            return cached
+        self._misses += 1
+        fetched = [CachedMessage.from_message(m) async for m in channel.history(limit=limit)]
+        self._fill(channel.id, fetched, complete=len(fetched) < limit)
+        return fetched
+
+    async def iter_history(
+        self,
+        channel: discord.abc.Messageable,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[CachedMessage]:
+        """before/after(메시지 ID, 미포함) 사이의 메시지를 최신순으로 하나씩 내보낸다.
+
+        캐시에 있는 구간은 메모리에서, 그보다 오래된 구간은 REST로 필요한 만큼만
+        페이지 단위로 가져온다. 소비자가 중간에 멈추면 이후 요청은 보내지 않는다.
+        before가 없고 prefetch가 주어지면 최신 prefetch개(최대 capacity개)를 먼저 캐시에 채운다.
+        """
+        if before is None and prefetch:
+            await self.recent(channel, min(prefetch, self.capacity))
+        cursor = before
+        entry = self._channels.get(channel.id)
+        if entry is not None and time.monotonic() - entry.synced_at <= self.ttl:
+            for msg in reversed(list(entry.messages)):
+                if before is not None and msg.id >= before:
+                    continue
+                if after is not None and msg.id <= after:
+                    return
+                yield msg
+                cursor = msg.id
+            if entry.complete:
+                return
+        async for message in channel.history(
+            limit=None,
+            before=discord.Object(id=cursor) if cursor is not None else None,
+            after=discord.Object(id=after) if after is not None else None,
+            oldest_first=False,
+        ):
+            yield CachedMessage.from_message(message)
+
+    def _fill(self, channel_id: int, fetched: List[CachedMessage], complete: bool):
+        """REST로 가져온 메시지(최신순)로 채널 캐시를 다시 채운다.
+
+        가져오는 동안 Gateway로 들어온 더 최신 메시지는 유지한다.
+        """
+        entry = self._entry(channel_id)
+        newer = list(entry.messages)
+        if fetched and newer:
+            newest = fetched[0].id
+            newer = [m for m in newer if m.id > newest]
+        entry.messages.clear()
+        entry.messages.extend(reversed(fetched))
+        entry.messages.extend(newer)
+        entry.complete = complete and len(fetched) + len(newer) <= self.capacity
+        entry.synced_at = time.monotonic()
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "channels": len(self._channels),
+            "messages": sum(len(e.messages) for e in self._channels.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,98 @@
+"""bot-console 연속 메시지 묶기 모듈
+
+유저가 짧은 메시지를 연달아 보내면 마지막 메시지 뒤 ``window`` 초 동안 다음
+메시지를 기다렸다가 한 프롬프트로 합쳐 CLI를 한 번만 실행한다.
+입력 중(typing) 이벤트가 오면 다음 메시지를 쓰는 중으로 보고 대기를 연장하며,
+첫 메시지부터 ``max_wait`` 초가 지나면 더 기다리지 않는다.
+"""
+
+import asyncio
+import time
+from typing import Dict, Generic, List, Optional, TypeVar
+
+from config import CONSOLE_DEBOUNCE, CONSOLE_DEBOUNCE_MAX, CONSOLE_DEBOUNCE_TYPING
+
+T = TypeVar("T")
+
+
+class _Batch(Generic[T]):
+    __slots__ = ("items", "opened_at", "deadline")
+
+    def __init__(self, item: T, now: float, window: float):
+        self.items: List[T] = [item]
+        self.opened_at = now
+        self.deadline = now + window
+
+
+class MessageDebouncer(Generic[T]):
+    """유저별 메시지 묶음 대기
+
+    Args:
+        window: 마지막 메시지 이후 다음 메시지를 기다리는 시간(초). 0이면 묶지 않는다
+        typing_window: 입력 중 이벤트 이후 기다리는 시간(초)
+        max_wait: 묶음을 연 첫 메시지부터 최대 대기 시간(초)
+    """
+
+    def __init__(
+        self,
+        window: float = CONSOLE_DEBOUNCE,
+        typing_window: float = CONSOLE_DEBOUNCE_TYPING,
+        max_wait: float = CONSOLE_DEBOUNCE_MAX,
+    ):
+        self.window = window
+        self.typing_window = typing_window
+        self.max_wait = max_wait
+        self._batches: Dict[str, _Batch[T]] = {}
+        self._flushed = 0
+        self._merged = 0
+
+    async def collect(self, key: str, item: T) -> Optional[List[T]]:
+        """item을 key의 묶음에 넣는다.
+
+        묶음을 연 호출은 대기가 끝나면 묶인 항목 전체를 도착 순서대로 반환하고,
+        이미 열린 묶음에 합쳐진 호출은 바로 None을 반환한다.
+        """
+        if self.window <= 0:
+            return [item]
+
+        now = time.monotonic()
+        batch = self._batches.get(key)
+        if batch is not None:
+            batch.items.append(item)
+            self._extend(batch, now, self.window)
+            self._merged += 1
+            return None
+
+        batch = self._batches[key] = _Batch(item, now, self.window)
+        try:
+            # 대기 중 deadline이 늘어날 수 있으므로 깰 때마다 다시 계산한다
+            while (remaining := batch.deadline - time.monotonic()) > 0:
+                await asyncio.sleep(remaining)
+        finally:
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+        self._flushed += 1
+        return batch.items
+
+    def typing(self, key: str):
+        """입력 중 이벤트: key의 묶음이 열려 있으면 대기를 연장한다."""
+        batch = self._batches.get(key)
+        if batch is not None:
+            self._extend(batch, time.monotonic(), self.typing_window)
+
+    def _extend(self, batch: _Batch[T], now: float, wait: float):
+        limit = batch.opened_at + self.max_wait
+        batch.deadline = max(batch.deadline, min(now + wait, limit))
+
+    @property
+    def pending(self) -> int:
+        """묶음 대기 중인 유저 수"""
+        return len(self._batches)
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "pending": self.pending,
+            "batches": self._flushed,
+            "merged": self._merged,
+        }
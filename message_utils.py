@@ -0,0 +1,287 @@
+"""Discord 메시지 분할 및 스트리밍 전송 모듈"""
+
+import asyncio
+import re
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set
+
+import discord
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+# 메시지 편집 최소 간격 (초). Discord는 채널당 5초에 약 5회 편집을 허용한다
+STREAM_EDIT_INTERVAL = 1.0
+
+
+# CommonMark 코드 펜스 줄: 최대 3칸 들여쓰기 + 백틱/물결 3개 이상 + info string(언어 태그)
+_FENCE_LINE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})([^\n]*)$", re.MULTILINE)
+
+
+class _Fence(NamedTuple):
+    """열려 있는 코드 펜스"""
+
+    char: str
+    length: int
+    opener: str  # 다음 메시지에서 다시 열 때 쓸 줄 (예: "```python")
+
+    @property
+    def closer(self) -> str:
+        return self.char * self.length
+
+
+def _apply_fence(marker: str, info: str, fence: Optional[_Fence]) -> Optional[_Fence]:
+    """펜스 줄 하나를 지난 뒤의 펜스 상태를 반환한다."""
+    info = info.strip()
+    if fence is None:
+        if marker[0] == "`" and "`" in info:
+            return None  # 백틱 펜스의 info string에는 백틱이 올 수 없다 (인라인 코드)
+        return _Fence(marker[0], len(marker), marker + info)
+    if marker[0] == fence.char and len(marker) >= fence.length and not info:
+        return None
+    return fence
+
+
+def _reserve(fence: Optional[_Fence]) -> int:
+    """열린 펜스를 닫는 줄("\n" + 닫는 표시)에 필요한 글자 수"""
+    return 1 + fence.length if fence is not None else 0
+
+
+class MessageSplitter:
+    """텍스트를 Discord 메시지 길이 제한에 맞게 한 번의 순회로 분할한다.
+
+    남은 텍스트를 잘라 다시 만들지 않고 버퍼 위의 오프셋만 옮기며,
+    메시지 하나 분량의 구간에서만 줄바꿈/공백 위치와 코드 펜스 줄을 찾는다.
+    메시지 경계에서 펜스가 열려 있으면 닫는 줄을 붙이고 다음 메시지를
+    같은 펜스 문자와 언어 태그로 다시 연다. 분할은 줄바꿈 → 공백 → 글자 수
+    순으로 시도하며 모든 조각은 limit 이하이다.
+
+    ``feed`` 로 텍스트를 나눠 넣을 수 있고, 결과는 전체를 한 번에
+    ``split_message`` 한 것과 같다.
+    """
+
+    def __init__(self, limit: int = DISCORD_MESSAGE_LIMIT):
+        self.limit = limit
+        self._buf = ""
+        self._pos = 0
+        self._at_line_start = True
+        self._fence: Optional[_Fence] = None
+        self._pieces: List[str] = []
+        self._pending = 0
+
+    def feed(self, text: str) -> List[str]:
+        """텍스트를 추가하고 완성된 메시지 조각을 반환한다."""
+        self._pieces.append(text)
+        self._pending += len(text)
+        out: List[str] = []
+        # 메시지 하나 분량보다 충분히 쌓였을 때만 버퍼를 합쳐 처리한다
+        if self._pending > 2 * self.limit:
+            self._join()
+            while len(self._buf) - self._pos > self.limit:
+                self._take(out, final=False)
+        return out
+
+    def close(self) -> List[str]:
+        """남은 텍스트를 모두 내보낸다."""
+        self._join()
+        out: List[str] = []
+        while self._pos < len(self._buf):
+            self._take(out, final=True)
+        self._buf = ""
+        self._pos = 0
+        return out
+
+    def _join(self):
+        if self._pieces:
+            self._buf = "".join([self._buf[self._pos:], *self._pieces])
+            self._pos = 0
+            self._pieces.clear()
+            self._pending = 0
+
+    def _scan(self, start: int, end: int, fence: Optional[_Fence]) -> Optional[_Fence]:
+        """[start, end) 구간의 펜스 줄을 반영한 펜스 상태"""
+        if self._buf.find("`", start, end) == -1 and self._buf.find("~", start, end) == -1:
+            return fence
+        for m in _FENCE_LINE_RE.finditer(self._buf, start, end):
+            if m.start() == start and not self._at_line_start:
+                continue  # 잘린 줄의 뒷부분은 줄의 시작이 아니다
+            fence = _apply_fence(m.group(1), m.group(2), fence)
+        return fence
+
+    def _take(self, out: List[str], final: bool):
+        """버퍼 맨 앞에서 메시지 하나를 잘라 out에 추가하고 오프셋을 옮긴다.
+
+        final이 아니면 뒤에 텍스트가 더 올 수 있으므로, 한 메시지 분량보다
+        많이 남아 있을 때만 자른다.
+        """
+        buf, pos, end = self._buf, self._pos, len(self._buf)
+        if self._at_line_start:
+            # 메시지 맨 앞의 빈 줄은 버린다
+            while pos < end and buf[pos] == "\n":
+                pos += 1
+            if pos > self._pos:
+                self._pos = pos
+                if end - pos <= self.limit and not final:
+                    return
+            if pos >= end:
+                return
+
+        fence = self._fence
+        prefix = fence.opener + "\n" if fence is not None else ""
+        room = self.limit - len(prefix)
+        if room <= 2 * _reserve(fence):
+            # 펜스 줄만으로 메시지가 차는 경우: 펜스 처리를 포기한다
+            fence, prefix, room = None, "", self.limit
+
+        # 남은 텍스트가 한 메시지에 들어가는 경우
+        if end - pos <= room:
+            state = self._scan(pos, end, fence)
+            if end - pos + _reserve(state) <= room:
+                self._emit(out, prefix, pos, end, state)
+                self._pos, self._fence = end, state
+                return
+
+        # 줄바꿈 기준 분할 (닫는 줄 공간이 부족하면 앞 줄바꿈으로 물러난다)
+        window = room
+        while True:
+            split = buf.rfind("\n", pos, pos + window + 1)
+            if split <= pos:
+                break
+            state = self._scan(pos, split, fence)
+            if split - pos + _reserve(state) <= room:
+                self._emit(out, prefix, pos, split, state)
+                self._pos, self._fence, self._at_line_start = split + 1, state, True
+                return
+            window = room - _reserve(state)
+
+        # 한 줄이 한 메시지보다 길면 공백 또는 글자 수 기준으로 자른다
+        window = max(1, room - _reserve(self._scan(pos, pos + room, fence)))
+        while True:
+            cut = buf.rfind(" ", pos, pos + window + 1)
+            nxt = cut + 1
+            if cut <= pos + window // 2:
+                cut = nxt = pos + window
+            state = self._scan(pos, cut, fence)
+            if cut - pos + _reserve(state) <= room or window == 1:
+                break
+            window = max(1, room - _reserve(state))
+        self._emit(out, prefix, pos, cut, state)
+        self._pos, self._fence, self._at_line_start = nxt, state, False
+
+    def _emit(self, out: List[str], prefix: str, start: int, end: int, fence: Optional[_Fence]):
+        body = self._buf[start:end]
+        if not body.strip():
+            return
+        suffix = "\n" + fence.closer if fence is not None else ""
+        out.append(prefix + body + suffix)
+
+
+def iter_split(pieces: Iterable[str], limit: int = DISCORD_MESSAGE_LIMIT) -> Iterator[str]:
+    """텍스트 조각 이터레이터를 받아 완성되는 대로 메시지 조각을 내보낸다."""
+    splitter = MessageSplitter(limit)
+    for piece in pieces:
+        yield from splitter.feed(piece)
+    yield from splitter.close()
+
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """텍스트를 Discord 메시지 길이 제한에 맞게 분할한다. 코드블록을 인식한다."""
+    if not text:
+        return []
+    return list(iter_split((text,), limit))
+
+
+class StreamingReply:
+    """CLI 출력 조각을 받아 Discord 메시지로 점진적으로 게시한다.
+
+    첫 조각은 도착 즉시 전송하고, 이후 변경은 ``interval`` 초에 한 번씩
+    마지막 메시지를 편집하는 방식으로 반영한다. 2000자를 넘으면
+    ``split_message`` 기준으로 새 메시지를 이어서 보낸다.
+    """
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        interval: float = STREAM_EDIT_INTERVAL,
+        limit: int = DISCORD_MESSAGE_LIMIT,
+    ):
+        self.channel = channel
+        self.interval = interval
+        self.limit = limit
+        self._buffer: List[str] = []
+        self._messages: List[discord.Message] = []
+        self._contents: List[str] = []
+        self._last_flush = 0.0
+        self._pending: Optional[asyncio.Task] = None
+        # 예약 반영 태스크 (대기 중 + 반영 중)
+        self._tasks: Set[asyncio.Task] = set()
+        self._cancelled = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        """스트리밍된 텍스트가 있는지 여부"""
+        return bool(self._buffer)
+
+    @property
+    def messages(self) -> List[discord.Message]:
+        return list(self._messages)
+
+    async def feed(self, text: str):
+        """텍스트 조각을 추가한다. 편집 간격이 지났으면 즉시 반영한다."""
+        if not text or self._cancelled:
+            return
+        self._buffer.append(text)
+        wait = self.interval - (time.monotonic() - self._last_flush)
+        if wait <= 0:
+            await self._flush()
+        elif self._pending is None:
+            self._pending = asyncio.create_task(self._flush_later(wait))
+            self._tasks.add(self._pending)
+            self._pending.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._pending = None
+        await self._flush()
+
+    async def _flush(self):
+        async with self._lock:
+            self._last_flush = time.monotonic()
+            chunks = split_message("".join(self._buffer), self.limit)
+            for i, chunk in enumerate(chunks):
+                if i < len(self._messages):
+                    if self._contents[i] != chunk:
+                        await self._messages[i].edit(content=chunk)
+                        self._contents[i] = chunk
+                else:
+                    self._messages.append(await self.channel.send(chunk))
+                    self._contents.append(chunk)
+
+    async def finish(self, final_text: Optional[str] = None) -> List[discord.Message]:
+        """남은 내용을 모두 반영한다.
+
+        스트리밍된 텍스트가 없으면 final_text를 한 번에 전송한다.
+        """
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._cancelled:
+            return self.messages
+        if not self._buffer and final_text:
+            self._buffer.append(final_text)
+        if self._buffer:
+            await self._flush()
+        return self.messages
+
+    async def cancel(self):
+        """요청이 취소됐을 때 호출한다.
+
+        예약되었거나 진행 중인 반영을 멈추고 끝날 때까지 기다리므로,
+        이후에 보내는 안내 메시지 뒤에 부분 응답이 게시되거나 편집되지 않는다.
+        """
+        self._cancelled = True
+        self._pending = None
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
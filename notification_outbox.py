@@ -0,0 +1,420 @@
+"""알림/메시지 outbox 모듈
+
+``send_notification`` / ``send_message`` 도구는 전송할 내용을 채널별 outbox에 넣고
+바로 반환한다. 채널마다 짧은 시간(window) 안에 들어온 알림을 한 메시지(최대 10개
+Embed)로 묶어 채널 rate-limit 간격을 지키며 전송하고, 실패하면 지수 백오프로
+재시도한다. 저장소(``store``)를 연결하면 전송 전 디스크에 먼저 기록하므로
+재시작해도 보내지 못한 항목을 이어서 전송한다. 저장소 접근은 이벤트 루프를 막지
+않도록 ``asyncio.to_thread`` 로 실행한다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional
+
+import discord
+
+from config import (
+    NOTIFY_BATCH_WINDOW,
+    NOTIFY_MAX_ATTEMPTS,
+    NOTIFY_MIN_INTERVAL,
+    NOTIFY_RETRY_BASE,
+    NOTIFY_RETRY_MAX,
+)
+
+if TYPE_CHECKING:
+    from outbox_store import SQLiteOutboxStore
+
+logger = logging.getLogger(__name__)
+
+# Discord 메시지 하나에 담을 수 있는 Embed 수와 Embed 전체 글자 수 상한
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+# Embed 설명(description) 글자 수 상한
+MAX_EMBED_DESCRIPTION = 4096
+
+MAX_TRACKED_NOTIFICATIONS = 1000
+
+# 항목 종류: Embed 알림(묶어서 전송) / 일반 메시지(하나씩 전송)
+KIND_EMBED = "embed"
+KIND_MESSAGE = "message"
+
+# 채널 ID → 채널 (재시작 후 저장소의 항목을 복원할 때 사용)
+ChannelResolver = Callable[[int], Optional[discord.abc.Messageable]]
+
+
+@dataclass
+class Notification:
+    """outbox에 들어간 항목 하나의 전송 상태"""
+
+    notification_id: str
+    channel_name: str
+    kind: str = KIND_EMBED
+    idempotency_key: Optional[str] = None
+    status: str = "queued"  # queued / sent / failed
+    attempts: int = 0
+    error: Optional[str] = None
+    message_id: Optional[int] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    sent_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "notification_id": self.notification_id,
+            "channel": self.channel_name,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "message_id": str(self.message_id) if self.message_id else None,
+            "created_at": self.created_at.isoformat(),
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+
+class _Entry:
+    __slots__ = ("notification", "embed", "content")
+
+    def __init__(
+        self,
+        notification: Notification,
+        embed: Optional[discord.Embed] = None,
+        content: Optional[str] = None,
+    ):
+        self.notification = notification
+        self.embed = embed
+        self.content = content
+
+    def __len__(self) -> int:
+        return len(self.embed) if self.embed is not None else len(self.content or "")
+
+
+class _ChannelQueue:
+    __slots__ = ("channel", "pending", "retry", "task", "last_sent")
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self.pending: Deque[_Entry] = deque()
+        # 실패한 묶음. 새 항목을 섞지 않고 같은 묶음 그대로 다시 보낸다
+        self.retry: List[_Entry] = []
+        self.task: Optional[asyncio.Task] = None
+        self.last_sent = 0.0
+
+
+def _batch_nonce(batch: List[_Entry]) -> str:
+    """묶음에 든 항목 ID 전체로 만든 nonce (Discord nonce는 최대 25자)"""
+    if len(batch) == 1:
+        return batch[0].notification.notification_id
+    ids = ",".join(e.notification.notification_id for e in batch)
+    return hashlib.sha1(ids.encode()).hexdigest()[:25]
+
+
+def _is_permanent(error: Exception) -> bool:
+    """재시도해도 성공할 수 없는 오류인지 (권한 없음, 채널 삭제, 잘못된 요청)"""
+    return (
+        isinstance(error, discord.HTTPException)
+        and 400 <= error.status < 500
+        and error.status != 429
+    )
+
+
+class NotificationOutbox:
+    """채널별 알림/메시지 outbox
+
+    Args:
+        window: 첫 알림 이후 같은 메시지로 묶을 알림을 기다리는 시간(초)
+        min_interval: 같은 채널로 메시지를 보내는 최소 간격(초)
+        max_tracked: 상태를 메모리에 보관할 최근 항목 수
+        retry_base: 첫 재시도 대기 시간(초). 이후 실패할 때마다 두 배
+        retry_max: 재시도 대기 시간 상한(초)
+        max_attempts: 최대 전송 시도 횟수 (초과 시 failed)
+        store: 디스크 저장소 (선택)
+    """
+
+    def __init__(
+        self,
+        window: float = NOTIFY_BATCH_WINDOW,
+        min_interval: float = NOTIFY_MIN_INTERVAL,
+        max_tracked: int = MAX_TRACKED_NOTIFICATIONS,
+        retry_base: float = NOTIFY_RETRY_BASE,
+        retry_max: float = NOTIFY_RETRY_MAX,
+        max_attempts: int = NOTIFY_MAX_ATTEMPTS,
+        store: Optional["SQLiteOutboxStore"] = None,
+    ):
+        self.window = window
+        self.min_interval = min_interval
+        self.max_tracked = max_tracked
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_attempts = max_attempts
+        self.store = store
+        self._queues: Dict[int, _ChannelQueue] = {}
+        self._notifications: "OrderedDict[str, Notification]" = OrderedDict()
+        self._keys: Dict[str, str] = {}
+        # 저장소 복원은 프로세스당 한 번만 한다 (재연결 때마다 다시 넣으면 중복 전송된다)
+        self._restored = False
+        self._sent_messages = 0
+        self._sent = 0
+        self._failed = 0
+        self._retries = 0
+
+    # ------------------------------------------------------------------
+    # 등록
+    # ------------------------------------------------------------------
+
+    async def enqueue(
+        self,
+        channel: discord.abc.Messageable,
+        embed: Optional[discord.Embed] = None,
+        content: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Notification:
+        """Embed 알림 또는 일반 메시지를 outbox에 넣고 즉시 반환한다.
+
+        같은 idempotency_key로 이미 등록된 항목이 있으면 새로 넣지 않고 그 항목을 반환한다.
+        저장소가 있으면 먼저 디스크에 기록한 뒤 전송 대기열에 넣는다.
+        """
+        if idempotency_key:
+            existing = await self._find_by_key(idempotency_key)
+            if existing is not None:
+                return existing
+
+        notification = Notification(
+            notification_id=uuid.uuid4().hex[:12],
+            channel_name=channel.name,
+            kind=KIND_EMBED if embed is not None else KIND_MESSAGE,
+            idempotency_key=idempotency_key,
+        )
+        entry = _Entry(notification, embed=embed, content=content)
+        # 기록하는 동안 같은 키로 들어온 요청이 이 항목을 찾도록 먼저 추적한다
+        self._track(notification)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(
+                    self.store.add, notification, channel.id, entry.embed, entry.content
+                )
+            except Exception:
+                self._untrack(notification)
+                raise
+        self._push(channel, entry)
+        return notification
+
+    async def restore(self, resolve_channel: ChannelResolver) -> int:
+        """저장소에 남은 미전송 항목을 다시 대기열에 넣고 복원한 수를 반환한다.
+
+        재시작 직후 한 번만 복원한다. 이후 항목은 이 프로세스의 대기열에 이미 들어 있으므로
+        재연결(on_ready)마다 다시 호출해도 아무것도 하지 않는다.
+        """
+        if self.store is None or self._restored:
+            return 0
+        self._restored = True
+        await asyncio.to_thread(self.store.prune)
+        restored = 0
+        for channel_id, notification, embed, content in await asyncio.to_thread(
+            self.store.pending
+        ):
+            if notification.notification_id in self._notifications:
+                continue
+            channel = resolve_channel(channel_id)
+            if channel is None:
+                await self._finish_failed([notification], "채널을 찾을 수 없습니다")
+                continue
+            self._track(notification)
+            self._push(channel, _Entry(notification, embed=embed, content=content))
+            restored += 1
+        if restored:
+            logger.info("미전송 알림 %d건 복원", restored)
+        return restored
+
+    async def _find_by_key(self, key: str) -> Optional[Notification]:
+        notification = self._tracked_by_key(key)
+        if notification is None and self.store is not None:
+            stored = await asyncio.to_thread(self.store.get_by_key, key)
+            # 조회하는 동안 같은 키로 등록된 항목이 있으면 그쪽을 쓴다
+            notification = self._tracked_by_key(key) or stored
+        return notification
+
+    def _tracked_by_key(self, key: str) -> Optional[Notification]:
+        notification_id = self._keys.get(key)
+        if notification_id is None:
+            return None
+        return self._notifications.get(notification_id)
+
+    def _track(self, notification: Notification):
+        self._notifications[notification.notification_id] = notification
+        if notification.idempotency_key:
+            self._keys[notification.idempotency_key] = notification.notification_id
+        while len(self._notifications) > self.max_tracked:
+            _, old = self._notifications.popitem(last=False)
+            if old.idempotency_key:
+                self._keys.pop(old.idempotency_key, None)
+
+    def _untrack(self, notification: Notification):
+        self._notifications.pop(notification.notification_id, None)
+        if notification.idempotency_key:
+            self._keys.pop(notification.idempotency_key, None)
+
+    def _push(self, channel: discord.abc.Messageable, entry: _Entry):
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = _ChannelQueue(channel)
+        queue.pending.append(entry)
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._flush_loop(channel.id, queue))
+
+    # ------------------------------------------------------------------
+    # 전송
+    # ------------------------------------------------------------------
+
+    async def _flush_loop(self, channel_id: int, queue: _ChannelQueue):
+        try:
+            while queue.retry or queue.pending:
+                wait = max(self.window, queue.last_sent + self.min_interval - time.monotonic())
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                batch = queue.retry or self._take_batch(queue.pending)
+                queue.retry = []
+                if not await self._send(queue, batch):
+                    # 실패한 묶음은 새 항목을 더하지 않고 그대로 백오프 후 재시도한다
+                    # (첫 전송이 실제로는 성공했다면 같은 nonce로 중복 전송이 막힌다)
+                    queue.retry = [e for e in batch if e.notification.status == "queued"]
+                    if queue.retry:
+                        attempts = queue.retry[0].notification.attempts
+                        await asyncio.sleep(
+                            min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                        )
+        finally:
+            queue.task = None
+            if not queue.pending and not queue.retry:
+                self._queues.pop(channel_id, None)
+
+    @staticmethod
+    def _take_batch(pending: Deque[_Entry]) -> List[_Entry]:
+        """메시지 하나로 보낼 항목을 꺼낸다.
+
+        Embed 알림은 Embed 10개, 전체 6000자까지 묶고 일반 메시지는 하나씩 보낸다.
+        """
+        batch = [pending.popleft()]
+        if batch[0].embed is None:
+            return batch
+        size = len(batch[0])
+        while pending and len(batch) < MAX_EMBEDS_PER_MESSAGE and pending[0].embed is not None:
+            size += len(pending[0])
+            if size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            batch.append(pending.popleft())
+        return batch
+
+    async def _send(self, queue: _ChannelQueue, batch: List[_Entry]) -> bool:
+        """batch를 한 메시지로 보낸다. 성공하면 True.
+
+        nonce로 묶음의 항목 ID 전체에서 만든 값을 넘겨, 전송은 됐지만 기록 전에 끊겨
+        같은 묶음을 다시 보내도 Discord가 중복 메시지를 만들지 않게 한다.
+        """
+        nonce = _batch_nonce(batch)
+        try:
+            if batch[0].embed is None:
+                message = await queue.channel.send(batch[0].content, nonce=nonce)
+            else:
+                message = await queue.channel.send(
+                    embeds=[e.embed for e in batch], nonce=nonce
+                )
+        except Exception as e:
+            await self._record_failure(queue, batch, e)
+            return False
+        finally:
+            queue.last_sent = time.monotonic()
+
+        self._sent_messages += 1
+        self._sent += len(batch)
+        now = datetime.now()
+        message_id = getattr(message, "id", None)
+        for entry in batch:
+            notification = entry.notification
+            notification.attempts += 1
+            notification.status = "sent"
+            notification.error = None
+            notification.message_id = message_id
+            notification.sent_at = now
+        if self.store is not None:
+            await asyncio.to_thread(self.store.mark_sent, [e.notification for e in batch])
+        return True
+
+    async def _record_failure(
+        self, queue: _ChannelQueue, batch: List[_Entry], error: Exception
+    ):
+        permanent = _is_permanent(error)
+        logger.warning(
+            "알림 전송 실패 (%s, %d건, %s): %s",
+            queue.channel.name, len(batch), "중단" if permanent else "재시도", error,
+        )
+        retrying = []
+        failed = []
+        for entry in batch:
+            notification = entry.notification
+            notification.attempts += 1
+            if permanent or notification.attempts >= self.max_attempts:
+                failed.append(notification)
+            else:
+                notification.error = str(error)
+                retrying.append(notification)
+        if failed:
+            await self._finish_failed(failed, str(error))
+        if retrying:
+            self._retries += len(retrying)
+            if self.store is not None:
+                await asyncio.to_thread(self.store.mark_attempt, retrying)
+
+    async def _finish_failed(self, notifications: List[Notification], error: str):
+        for notification in notifications:
+            notification.status = "failed"
+            notification.error = error
+        self._failed += len(notifications)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.mark_failed, notifications)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    async def get(self, notification_id: str) -> Optional[Notification]:
+        notification = self._notifications.get(notification_id)
+        if notification is None and self.store is not None:
+            notification = await asyncio.to_thread(self.store.get, notification_id)
+        return notification
+
+    @property
+    def pending(self) -> int:
+        return sum(len(q.pending) + len(q.retry) for q in self._queues.values())
+
+    async def drain(self, timeout: Optional[float] = None):
+        """대기 중인 항목이 모두 처리될 때까지 기다린다."""
+        tasks = [q.task for q in self._queues.values() if q.task is not None]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    async def close(self, timeout: Optional[float] = None):
+        """timeout 동안 남은 항목을 보내 보고, 나머지는 저장소에 남긴 채 멈춘다."""
+        await self.drain(timeout)
+        tasks = [q.task for q in self._queues.values() if q.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "sent": self._sent,
+            "failed": self._failed,
+            "retries": self._retries,
+            "messages": self._sent_messages,
+            "durable": self.store is not None,
+        }
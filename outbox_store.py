@@ -0,0 +1,170 @@
+"""알림/메시지 outbox 영속 저장소 모듈
+
+``NotificationOutbox`` 에 연결해 전송 전 항목을 SQLite(WAL)에 먼저 기록한다.
+Discord가 느리거나 장애가 나도, 봇이 재시작돼도 보내지 못한 항목이 사라지지 않는다.
+``NotificationOutbox`` 는 커밋이 이벤트 루프를 막지 않도록 ``asyncio.to_thread`` 로
+호출하므로, 연결 하나를 잠금으로 보호해 여러 스레드에서 공유한다.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+import discord
+
+from notification_outbox import KIND_EMBED, Notification
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE,
+    channel_id INTEGER NOT NULL,
+    channel_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    message_id INTEGER,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, created_at);
+"""
+
+_COLUMNS = (
+    "id, idempotency_key, channel_name, kind, status, attempts, error,"
+    " message_id, created_at, sent_at"
+)
+
+# 전송/실패가 끝난 항목을 보관하는 기간(초)
+FINISHED_RETENTION = 7 * 24 * 3600
+
+PendingRow = Tuple[int, Notification, Optional[discord.Embed], Optional[str]]
+
+
+def _to_notification(row: tuple) -> Notification:
+    (notification_id, key, channel_name, kind, status, attempts, error,
+     message_id, created_at, sent_at) = row
+    return Notification(
+        notification_id=notification_id,
+        channel_name=channel_name,
+        kind=kind,
+        idempotency_key=key,
+        status=status,
+        attempts=attempts,
+        error=error,
+        message_id=message_id,
+        created_at=datetime.fromtimestamp(created_at),
+        sent_at=datetime.fromtimestamp(sent_at) if sent_at else None,
+    )
+
+
+class SQLiteOutboxStore:
+    """SQLite(WAL) 기반 outbox 저장소
+
+    Args:
+        path: 데이터베이스 파일 경로
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # asyncio.to_thread로 여러 스레드에서 호출된다
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(
+        self,
+        notification: Notification,
+        channel_id: int,
+        embed: Optional[discord.Embed],
+        content: Optional[str],
+    ):
+        """새 항목을 기록한다."""
+        payload = json.dumps(embed.to_dict(), ensure_ascii=False) if embed is not None else content
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO outbox (id, idempotency_key, channel_id, channel_name, kind,"
+                " payload, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    notification.notification_id, notification.idempotency_key,
+                    channel_id, notification.channel_name, notification.kind,
+                    payload, notification.created_at.timestamp(),
+                ),
+            )
+
+    def mark_sent(self, notifications: Iterable[Notification]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'sent', attempts = ?, error = NULL,"
+                " message_id = ?, sent_at = ? WHERE id = ?",
+                [
+                    (n.attempts, n.message_id, n.sent_at.timestamp(), n.notification_id)
+                    for n in notifications
+                ],
+            )
+
+    def mark_attempt(self, notifications: Iterable[Notification]):
+        """재시도 대기 중인 항목의 시도 횟수와 마지막 오류를 기록한다."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = ?, error = ? WHERE id = ?",
+                [(n.attempts, n.error, n.notification_id) for n in notifications],
+            )
+
+    def mark_failed(self, notifications: Iterable[Notification]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+                [(n.attempts, n.error, n.notification_id) for n in notifications],
+            )
+
+    def pending(self) -> List[PendingRow]:
+        """아직 보내지 못한 항목을 등록 순서대로 반환한다."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT channel_id, payload, {_COLUMNS} FROM outbox"
+                " WHERE status = 'queued' ORDER BY created_at, rowid"
+            ).fetchall()
+        result: List[PendingRow] = []
+        for channel_id, payload, *columns in rows:
+            notification = _to_notification(tuple(columns))
+            if notification.kind == KIND_EMBED:
+                embed = discord.Embed.from_dict(json.loads(payload))
+                result.append((channel_id, notification, embed, None))
+            else:
+                result.append((channel_id, notification, None, payload))
+        return result
+
+    def get(self, notification_id: str) -> Optional[Notification]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE id = ?", (notification_id,)
+            ).fetchone()
+        return _to_notification(row) if row else None
+
+    def get_by_key(self, key: str) -> Optional[Notification]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE idempotency_key = ?", (key,)
+            ).fetchone()
+        return _to_notification(row) if row else None
+
+    def prune(self, retention: float = FINISHED_RETENTION) -> int:
+        """retention보다 오래된 전송 완료/실패 항목을 지우고 지운 수를 반환한다."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status != 'queued' AND created_at < ?",
+                (time.time() - retention,),
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
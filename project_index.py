@@ -0,0 +1,240 @@
+"""프로젝트 카테고리/채널 인메모리 인덱스 모듈
+
+카테고리 이름 규칙 ``{project_name} / {team_name}`` 을 기반으로
+프로젝트 → 팀 → 카테고리(채널 목록) 구조를 유지한다.
+봇 준비 시 한 번 구축하고 이후에는 Gateway 채널 이벤트로 증분 갱신한다.
+
+같은 이름의 카테고리가 여러 개면 ID가 가장 작은(가장 먼저 만든) 카테고리를 그 팀으로
+사용한다. 등록·이벤트 순서와 관계없이 항상 같은 카테고리가 선택된다.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+
+PROJECT_SEPARATOR = " / "
+
+
+def parse_category_name(name: str) -> Optional[Tuple[str, str]]:
+    """카테고리 이름을 (프로젝트명, 팀명)으로 분리한다. 규칙에 맞지 않으면 None."""
+    if PROJECT_SEPARATOR not in name:
+        return None
+    project_name, team_name = name.split(PROJECT_SEPARATOR, 1)
+    return project_name, team_name
+
+
+class ProjectIndex:
+    """프로젝트 → 팀 → 카테고리 인덱스"""
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self._projects: Dict[str, Dict[str, discord.CategoryChannel]] = {}
+        self._category_keys: Dict[int, Tuple[str, str]] = {}
+        # 같은 이름의 카테고리도 모두 보관해 선택된 카테고리가 지워지면 다음 것으로 넘긴다
+        self._categories: Dict[int, discord.CategoryChannel] = {}
+        self._channels: Dict[int, Dict[int, discord.abc.GuildChannel]] = {}
+        self._channel_parent: Dict[int, int] = {}
+        self._lookup: Dict[Tuple[str, str], discord.abc.GuildChannel] = {}
+        # 변경될 때마다 증가하는 버전과 (버전, JSON) 스냅샷 캐시 (키: detailed 여부)
+        self._version = 0
+        self._snapshots: Dict[bool, Tuple[int, str]] = {}
+        self.rebuild()
+
+    def rebuild(self):
+        """guild.categories 전체를 스캔하여 인덱스를 다시 구축한다."""
+        self._projects.clear()
+        self._category_keys.clear()
+        self._categories.clear()
+        self._channels.clear()
+        self._channel_parent.clear()
+        self._lookup.clear()
+        self._version += 1
+        for category in self.guild.categories:
+            if self.add_category(category) is None:
+                continue
+            for channel in category.channels:
+                self.add_channel(channel, category)
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def add_category(self, category: discord.CategoryChannel) -> Optional[Tuple[str, str]]:
+        """프로젝트 카테고리를 등록한다. 규칙에 맞지 않으면 무시하고 None 반환."""
+        key = parse_category_name(category.name)
+        if key is None:
+            return None
+        project_name, team_name = key
+        teams = self._projects.setdefault(project_name, {})
+        current = teams.get(team_name)
+        if current is None or current.id == category.id or category.id < current.id:
+            teams[team_name] = category
+        self._category_keys[category.id] = key
+        self._categories[category.id] = category
+        self._channels.setdefault(category.id, {})
+        self._invalidate(project_name)
+        return key
+
+    def remove_category(self, category: discord.CategoryChannel):
+        """카테고리와 소속 채널을 인덱스에서 제거한다."""
+        key = self._category_keys.pop(category.id, None)
+        if key is None:
+            return
+        project_name, team_name = key
+        del self._categories[category.id]
+        teams = self._projects.get(project_name, {})
+        current = teams.get(team_name)
+        if current is not None and current.id == category.id:
+            # 같은 이름의 다른 카테고리가 남아 있으면 그중 ID가 가장 작은 것으로 넘긴다
+            remaining = [cid for cid, k in self._category_keys.items() if k == key]
+            if remaining:
+                teams[team_name] = self._categories[min(remaining)]
+            else:
+                del teams[team_name]
+        if not teams:
+            self._projects.pop(project_name, None)
+        for channel_id in self._channels.pop(category.id, {}):
+            self._channel_parent.pop(channel_id, None)
+        self._invalidate(project_name)
+
+    def add_channel(
+        self,
+        channel: discord.abc.GuildChannel,
+        category: Optional[discord.CategoryChannel] = None,
+    ):
+        """프로젝트 카테고리 소속 채널을 등록한다.
+
+        category를 생략하면 ``channel.category_id`` 로 소속을 판단한다.
+        """
+        category_id = category.id if category is not None else channel.category_id
+        channels = self._channels.get(category_id)
+        if channels is None:
+            return
+        channels[channel.id] = channel
+        self._channel_parent[channel.id] = category_id
+        self._invalidate(self._category_keys[category_id][0])
+
+    def remove_channel(self, channel: discord.abc.GuildChannel):
+        """채널을 인덱스에서 제거한다."""
+        category_id = self._channel_parent.pop(channel.id, None)
+        if category_id is None:
+            return
+        self._channels[category_id].pop(channel.id, None)
+        self._invalidate(self._category_keys[category_id][0])
+
+    def on_channel_create(self, channel: discord.abc.GuildChannel):
+        """``on_guild_channel_create`` 이벤트 반영"""
+        if isinstance(channel, discord.CategoryChannel):
+            self.add_category(channel)
+        else:
+            self.add_channel(channel)
+
+    def on_channel_delete(self, channel: discord.abc.GuildChannel):
+        """``on_guild_channel_delete`` 이벤트 반영"""
+        if isinstance(channel, discord.CategoryChannel):
+            self.remove_category(channel)
+        else:
+            self.remove_channel(channel)
+
+    def on_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        """``on_guild_channel_update`` 이벤트 반영 (이름 변경, 카테고리 이동)"""
+        if isinstance(after, discord.CategoryChannel):
+            channels = list(self._channels.get(before.id, {}).values())
+            self.remove_category(before)
+            if self.add_category(after) is not None:
+                for channel in channels:
+                    self.add_channel(channel, after)
+        else:
+            self.remove_channel(before)
+            self.add_channel(after)
+
+    def _invalidate(self, project_name: str):
+        """프로젝트의 채널 검색 캐시를 무효화하고 스냅샷 버전을 올린다."""
+        self._version += 1
+        for key in [k for k in self._lookup if k[0] == project_name]:
+            del self._lookup[key]
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """인덱스가 바뀔 때마다 증가하는 버전"""
+        return self._version
+
+    @property
+    def project_count(self) -> int:
+        return len(self._projects)
+
+    def has_project(self, project_name: str) -> bool:
+        return project_name in self._projects
+
+    def get_teams(self, project_name: str) -> Dict[str, discord.CategoryChannel]:
+        """프로젝트의 팀명 → 카테고리 매핑의 얕은 복사본을 반환한다."""
+        return dict(self._projects.get(project_name, {}))
+
+    def get_category(
+        self, project_name: str, team_name: str
+    ) -> Optional[discord.CategoryChannel]:
+        return self._projects.get(project_name, {}).get(team_name)
+
+    def get_channels(self, category: discord.CategoryChannel) -> List[discord.abc.GuildChannel]:
+        """인덱스에 등록된 카테고리 소속 채널 목록"""
+        return list(self._channels.get(category.id, {}).values())
+
+    def find_channel(self, project_name: str, keyword: str):
+        """프로젝트 카테고리 내에서 keyword를 포함하는 채널을 찾는다.
+
+        결과는 (프로젝트, keyword) 단위로 캐시되며 해당 프로젝트에
+        변경이 생기면 무효화된다.
+        """
+        key = (project_name, keyword)
+        cached = self._lookup.get(key)
+        if cached is not None:
+            return cached
+        for category in self._projects.get(project_name, {}).values():
+            for channel in self._channels[category.id].values():
+                if keyword in channel.name:
+                    self._lookup[key] = channel
+                    return channel
+        return None
+
+    def list_projects(self) -> Dict[str, List[str]]:
+        """프로젝트명 → 팀명 목록"""
+        return {name: list(teams) for name, teams in self._projects.items()}
+
+    def project_tree(self) -> Dict[str, Dict[str, dict]]:
+        """프로젝트명 → 팀명 → 카테고리 ID, 채널 수, 채널 목록(ID, 이름)"""
+        return {
+            project_name: {
+                team_name: {
+                    "category_id": str(category.id),
+                    "channel_count": len(self._channels[category.id]),
+                    "channels": [
+                        {"id": str(ch.id), "name": ch.name}
+                        for ch in self._channels[category.id].values()
+                    ],
+                }
+                for team_name, category in teams.items()
+            }
+            for project_name, teams in self._projects.items()
+        }
+
+    def snapshot(self, detailed: bool = False) -> str:
+        """``list_projects`` 응답용 JSON 문자열
+
+        인덱스 버전이 바뀌기 전까지 직렬화 결과를 재사용한다.
+        detailed이면 팀별 채널 수와 ID를 포함한다.
+        """
+        cached = self._snapshots.get(detailed)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        data = self.project_tree() if detailed else self.list_projects()
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        self._snapshots[detailed] = (self._version, text)
+        return text
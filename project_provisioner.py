@@ -0,0 +1,230 @@
+"""프로젝트 카테고리/채널 동시 생성·삭제 모듈
+
+카테고리를 동시에 생성하고, 각 카테고리가 준비되는 즉시 소속 채널 생성을
+시작한다. 삭제는 반대로 채널 삭제를 병렬로 수행하고 비워진 카테고리부터
+삭제한다. 모든 REST 호출은 하나의 세마포어로 동시 요청 수가 제한되며,
+실제 rate-limit 대기는 discord.py의 라우트별 버킷 처리에 맡긴다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import discord
+
+from config import DISCORD_API_CONCURRENCY
+from project_index import ProjectIndex
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ProvisionStep:
+    """단일 REST 호출의 소요 시간"""
+
+    label: str
+    elapsed: float
+
+
+@dataclass
+class ProvisionResult:
+    """프로젝트 생성 결과"""
+
+    category_names: List[str] = field(default_factory=list)
+    channel_count: int = 0
+    steps: List[ProvisionStep] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def timing_summary(self) -> str:
+        """전체/단계별 평균 소요 시간 요약 문자열"""
+        categories = [s.elapsed for s in self.steps if s.label.startswith("category:")]
+        channels = [s.elapsed for s in self.steps if s.label.startswith("channel:")]
+        parts = [f"소요 시간 {self.elapsed:.2f}초"]
+        if categories:
+            parts.append(f"카테고리 평균 {sum(categories) / len(categories):.2f}초")
+        if channels:
+            parts.append(f"채널 평균 {sum(channels) / len(channels):.2f}초")
+        return f"{parts[0]} ({', '.join(parts[1:])})" if len(parts) > 1 else parts[0]
+
+
+@dataclass
+class TeardownResult:
+    """프로젝트 삭제 결과"""
+
+    deleted_categories: int = 0
+    deleted_channels: int = 0
+    failures: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ProjectProvisioner:
+    """동시 요청 수가 제한된 프로젝트 생성기"""
+
+    def __init__(self, concurrency: int = DISCORD_API_CONCURRENCY):
+        if concurrency < 1:
+            raise ValueError("concurrency는 1 이상이어야 합니다")
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _timed(
+        self,
+        label: str,
+        call: Callable[[], Awaitable[T]],
+        result: ProvisionResult,
+    ) -> T:
+        """세마포어 안에서 REST 호출을 실행하고 소요 시간을 기록한다."""
+        async with self._semaphore:
+            started = time.perf_counter()
+            value = await call()
+            elapsed = time.perf_counter() - started
+        result.steps.append(ProvisionStep(label, elapsed))
+        logger.info("provision %s %.3fs", label, elapsed)
+        return value
+
+    async def provision(
+        self,
+        guild: discord.Guild,
+        project_name: str,
+        teams: Dict[str, List[str]],
+        index: Optional[ProjectIndex] = None,
+    ) -> ProvisionResult:
+        """팀별 카테고리와 채널을 생성한다.
+
+        Args:
+            guild: 대상 guild
+            project_name: 프로젝트명
+            teams: 팀명 → 채널명 목록
+            index: 생성 결과를 반영할 프로젝트 인덱스 (선택)
+
+        Returns:
+            ProvisionResult: 생성된 카테고리명, 채널 수, 단계별 소요 시간
+        """
+        result = ProvisionResult()
+        started = time.perf_counter()
+
+        async def create_team(team_name: str, channels: List[str]) -> str:
+            category_name = f"{project_name} / {team_name}"
+            category = await self._timed(
+                f"category:{category_name}",
+                lambda: guild.create_category(category_name),
+                result,
+            )
+            if index is not None:
+                index.add_category(category)
+
+            async def create_channel(position: int, ch_name: str):
+                channel = await self._timed(
+                    f"channel:{ch_name}",
+                    lambda: category.create_text_channel(ch_name, position=position),
+                    result,
+                )
+                if index is not None:
+                    index.add_channel(channel, category)
+                result.channel_count += 1
+
+            # 동시 생성 시 완료 순서가 섞이므로 position으로 템플릿 순서를 유지한다
+            await asyncio.gather(
+                *(create_channel(i, name) for i, name in enumerate(channels))
+            )
+            return category_name
+
+        result.category_names = list(
+            await asyncio.gather(
+                *(create_team(name, channels) for name, channels in teams.items())
+            )
+        )
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            "provision '%s' 완료: 카테고리 %d개, 채널 %d개, %.3fs",
+            project_name, len(result.category_names), result.channel_count, result.elapsed,
+        )
+        return result
+
+    async def teardown(
+        self,
+        project_name: str,
+        categories: List[discord.CategoryChannel],
+        index: Optional[ProjectIndex] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> TeardownResult:
+        """프로젝트 카테고리와 채널을 삭제한다.
+
+        카테고리별로 채널 삭제를 병렬로 수행하고, 모든 채널이 삭제된
+        카테고리만 삭제한다. 이미 삭제된 채널(NotFound)은 성공으로 간주한다.
+
+        Args:
+            project_name: 프로젝트명 (로그용)
+            categories: 삭제할 카테고리 목록
+            index: 삭제 결과를 반영할 프로젝트 인덱스 (선택)
+            on_progress: ``(완료 수, 전체 수)`` 진행률 콜백 (선택)
+
+        Returns:
+            TeardownResult: 삭제된 카테고리/채널 수와 실패 목록
+        """
+        result = TeardownResult()
+        started = time.perf_counter()
+        channels_by_category = {
+            category.id: (
+                index.get_channels(category) if index is not None
+                else list(category.channels)
+            )
+            for category in categories
+        }
+        total = len(categories) + sum(len(chs) for chs in channels_by_category.values())
+        done = 0
+
+        def advance():
+            nonlocal done
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total)
+
+        async def delete(target) -> bool:
+            try:
+                async with self._semaphore:
+                    await target.delete()
+            except discord.NotFound:
+                pass
+            except Exception as e:
+                result.failures.append(f"{target.name}: {e}")
+                return False
+            return True
+
+        async def delete_channel(channel) -> bool:
+            ok = await delete(channel)
+            if ok:
+                if index is not None:
+                    index.remove_channel(channel)
+                result.deleted_channels += 1
+            advance()
+            return ok
+
+        async def delete_category(category):
+            results = await asyncio.gather(
+                *(delete_channel(ch) for ch in channels_by_category[category.id])
+            )
+            if not all(results):
+                result.failures.append(f"{category.name}: 채널 삭제 실패로 카테고리를 남겨둠")
+                advance()
+                return
+            if await delete(category):
+                if index is not None:
+                    index.remove_category(category)
+                result.deleted_categories += 1
+            advance()
+
+        await asyncio.gather(*(delete_category(c) for c in categories))
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            "teardown '%s' 완료: 카테고리 %d개, 채널 %d개, 실패 %d건, %.3fs",
+            project_name, result.deleted_categories, result.deleted_channels,
+            len(result.failures), result.elapsed,
+        )
+        return result
@@ -3,10 +3,11 @@ import datetime
 import json
 import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from typing import Any
 
 import discord
+from discord import app_commands
 import mcp.types as types
 import uvicorn
 from dotenv import load_dotenv
@@ -17,12 +18,51 @@ from starlette.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
-from starlette.routing import Mount
-
-from channel_manager import ChannelManager
-from claude_code_client import ClaudeCodeClient
-from config import CUSTOM_TEAM_CHANNELS, DEFAULT_TEAMS, NOTIFICATION_TYPES
+from starlette.routing import Mount, Route
+
+from channel_manager import ChannelManager, ConsoleRegistry
+from claude_code_client import (
+    DEFAULT_CPU_LIMIT,
+    DEFAULT_MAX_OUTPUT_BYTES,
+    DEFAULT_MEMORY_LIMIT_MB,
+    ClaudeCodeClient,
+    truncate_text,
+)
+from claude_worker_pool import ClaudeWorkerPool, build_worker_command
+from console_provisioner import ConsoleProvisioner
+from adaptive_limiter import AdaptiveLimiter, default_max_limit
+from config import (
+    CLAUDE_CONCURRENCY_MAX,
+    CLAUDE_CONCURRENCY_MIN,
+    CLAUDE_MAX_CONCURRENCY,
+    CLAUDE_MAX_QUEUE_PER_USER,
+    CLAUDE_PER_USER_CONCURRENCY,
+    CLAUDE_SUPERSEDE,
+    CONSOLE_ARCHIVE_DELETE,
+    CONSOLE_ARCHIVE_INTERVAL,
+    CONSOLE_DEBOUNCE,
+    CONSOLE_IDLE_HOURS,
+    CONSOLE_MODE,
+    CONTEXT_CHAR_BUDGET,
+    CONTEXT_SUMMARY,
+    CUSTOM_TEAM_CHANNELS,
+    DEFAULT_TEAMS,
+    DISCORD_API_CONCURRENCY,
+    NOTIFICATION_TYPES,
+    READ_MESSAGES_MAX_BYTES,
+    READ_MESSAGES_SCAN_LIMIT,
+)
+from fair_scheduler import FairScheduler, QueueFullError
+from jobs import job_registry
+from message_cache import MessageCache
+from message_debouncer import MessageDebouncer
+from message_utils import DISCORD_MESSAGE_LIMIT, StreamingReply, split_message
+from notification_outbox import MAX_EMBED_DESCRIPTION, NotificationOutbox
+from outbox_store import SQLiteOutboxStore
+from project_index import ProjectIndex
+from project_provisioner import ProjectProvisioner
 from session_manager import session_manager
+from session_store import SQLiteSessionStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +74,51 @@ load_dotenv()
 DISCORD_TOKEN = os.environ.get('DISCORD_TOKEN')
 DISCORD_GUILD_ID = os.environ.get('DISCORD_GUILD_ID')
 API_KEY = os.environ.get('API_KEY')
+DISCORD_API_CONCURRENCY = int(
+    os.environ.get('DISCORD_API_CONCURRENCY', DISCORD_API_CONCURRENCY)
+)
+# Claude 응답을 생성되는 대로 Discord에 스트리밍할지 여부
+STREAM_RESPONSES = os.environ.get('STREAM_RESPONSES', '1') != '0'
+# 상주 Claude CLI 워커 수 (0이면 매 메시지마다 CLI를 새로 실행)
+CLAUDE_POOL_SIZE = int(os.environ.get('CLAUDE_POOL_SIZE', '0'))
+# CLI 실행당 최대 출력(바이트), CPU 시간(초), 주소 공간(MB) 제한 (0이면 제한 없음)
+CLAUDE_MAX_OUTPUT_BYTES = int(os.environ.get('CLAUDE_MAX_OUTPUT_BYTES', DEFAULT_MAX_OUTPUT_BYTES))
+CLAUDE_CPU_LIMIT = int(os.environ.get('CLAUDE_CPU_LIMIT', DEFAULT_CPU_LIMIT))
+CLAUDE_MEMORY_LIMIT_MB = int(os.environ.get('CLAUDE_MEMORY_LIMIT_MB', DEFAULT_MEMORY_LIMIT_MB))
+# bot-console 대화 컨텍스트 예산(글자 수)과 이전 대화 요약 사용 여부
+CONTEXT_CHAR_BUDGET = int(os.environ.get('CONTEXT_CHAR_BUDGET', CONTEXT_CHAR_BUDGET))
+CONTEXT_SUMMARY = os.environ.get('CONTEXT_SUMMARY', '1' if CONTEXT_SUMMARY else '0') != '0'
+# bot-console 생성 방식 ("eager" | "lazy")과 lazy 모드 유휴 콘솔 정리 기준(시간)
+CONSOLE_MODE = os.environ.get('CONSOLE_MODE', CONSOLE_MODE)
+CONSOLE_IDLE_HOURS = float(os.environ.get('CONSOLE_IDLE_HOURS', CONSOLE_IDLE_HOURS))
+# 유휴 콘솔을 보관 대신 영구 삭제할지 여부
+CONSOLE_ARCHIVE_DELETE = os.environ.get(
+    'CONSOLE_ARCHIVE_DELETE', '1' if CONSOLE_ARCHIVE_DELETE else '0'
+) != '0'
+# 대화 세션 저장 경로 (미설정 시 메모리에만 보관)
+SESSION_DB_PATH = os.environ.get('SESSION_DB_PATH')
+# 알림/메시지 outbox 저장 경로 (미설정 시 메모리에만 보관)
+OUTBOX_PATH = os.environ.get('OUTBOX_PATH')
+CLAUDE_MAX_CONCURRENCY = int(
+    os.environ.get('CLAUDE_MAX_CONCURRENCY', CLAUDE_MAX_CONCURRENCY)
+)
+CLAUDE_PER_USER_CONCURRENCY = int(
+    os.environ.get('CLAUDE_PER_USER_CONCURRENCY', CLAUDE_PER_USER_CONCURRENCY)
+)
+# 전체 동시 실행 수 자동 조절 범위 (최댓값 0이면 CPU 수, 최솟값=최댓값이면 고정)
+CLAUDE_CONCURRENCY_MIN = int(
+    os.environ.get('CLAUDE_CONCURRENCY_MIN', CLAUDE_CONCURRENCY_MIN)
+)
+CLAUDE_CONCURRENCY_MAX = int(
+    os.environ.get('CLAUDE_CONCURRENCY_MAX', CLAUDE_CONCURRENCY_MAX)
+) or max(default_max_limit(), CLAUDE_CONCURRENCY_MIN)
+CLAUDE_MAX_QUEUE_PER_USER = int(
+    os.environ.get('CLAUDE_MAX_QUEUE_PER_USER', CLAUDE_MAX_QUEUE_PER_USER)
+)
+# 응답 대기 중 새 메시지가 오면 이전 요청을 취소할지("cancel") 뒤에 줄 세울지("queue")
+CLAUDE_SUPERSEDE = os.environ.get('CLAUDE_SUPERSEDE', CLAUDE_SUPERSEDE)
+# 연달아 보낸 bot-console 메시지를 한 번에 처리하기 위해 기다리는 시간(초, 0이면 사용 안 함)
+CONSOLE_DEBOUNCE = float(os.environ.get('CONSOLE_DEBOUNCE', CONSOLE_DEBOUNCE))
 
 if not DISCORD_TOKEN or not DISCORD_GUILD_ID:
     raise SystemExit("DISCORD_TOKEN과 DISCORD_GUILD_ID 환경 변수를 설정해주세요.")
@@ -46,6 +131,7 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 bot = discord.Client(intents=intents)
+tree = app_commands.CommandTree(bot)
 
 # MCP 서버
 server = Server("project-bot")
@@ -88,99 +174,337 @@ async def lifespan(app):
         yield
 
 
+async def api_stats(request: Request):
+    """메시지 처리 대기열/워커 풀 지표"""
+    return JSONResponse({
+        "scheduler": scheduler.stats(),
+        "concurrency": concurrency_limiter.stats(),
+        "worker_pool": claude_client.pool.stats() if claude_client.pool else None,
+        "sessions": session_manager.memory_stats(),
+        "message_cache": message_cache.stats(),
+        "notifications": notification_outbox.stats(),
+        "debounce": message_debouncer.stats(),
+    })
+
+
 starlette_app = Starlette(
-    routes=[Mount("/mcp", app=session_mgr.handle_request)],
+    routes=[
+        Route("/api/stats", api_stats),
+        Mount("/mcp", app=session_mgr.handle_request),
+    ],
     lifespan=lifespan,
     middleware=[Middleware(APIKeyMiddleware)],
 )
 
 # Claude Code CLI 클라이언트
-claude_client = ClaudeCodeClient()
-
-# 동시 실행 제한
-_semaphore = asyncio.Semaphore(3)
-
-
-def split_message(text: str, limit: int = 2000) -> list[str]:
-    """텍스트를 Discord 메시지 길이 제한에 맞게 분할한다. 코드블록을 인식한다."""
-    if not text:
-        return []
-    chunks = []
-    while len(text) > limit:
-        split_at = text.rfind('\n', 0, limit)
-        if split_at == -1:
-            split_at = text.rfind(' ', 0, limit)
-        if split_at == -1:
-            split_at = limit
-        chunk = text[:split_at]
-        open_blocks = chunk.count('```')
-        # 코드블록 래핑 시 split_at이 너무 작으면 진행이 안 됨 (무한루프 방지)
-        if open_blocks % 2 == 1 and split_at < limit // 2:
-            split_at = limit
-            chunk = text[:split_at]
-            open_blocks = chunk.count('```')
-        if open_blocks % 2 == 1:  # 열린 코드블록 존재
-            chunk += '\n```'
-            text = '```\n' + text[split_at:].lstrip('\n')
-        else:
-            text = text[split_at:].lstrip('\n')
-        chunks.append(chunk)
-    if text:
-        chunks.append(text)
-    return chunks
+claude_client = ClaudeCodeClient(
+    max_output_bytes=CLAUDE_MAX_OUTPUT_BYTES,
+    cpu_limit=CLAUDE_CPU_LIMIT,
+    memory_limit_mb=CLAUDE_MEMORY_LIMIT_MB,
+)
+if CLAUDE_POOL_SIZE > 0:
+    claude_client.pool = ClaudeWorkerPool(
+        build_worker_command(claude_client.model),
+        max_workers=CLAUDE_POOL_SIZE,
+        max_output_bytes=CLAUDE_MAX_OUTPUT_BYTES,
+        memory_limit_mb=CLAUDE_MEMORY_LIMIT_MB,
+    )
+
+
+def release_worker(user_id: int | str):
+    """세션이 끝나거나 콘솔이 정리된 유저의 상주 워커 할당을 해제한다."""
+    if claude_client.pool is not None:
+        claude_client.pool.release(str(user_id))
+
+
+session_manager.on_session_end = release_worker
+
+# 대화 세션 영속화
+if SESSION_DB_PATH:
+    session_manager.store = SQLiteSessionStore(SESSION_DB_PATH)
+
+# 동시 실행 제한 (유저별 대기열, 라운드 로빈)
+scheduler = FairScheduler(
+    max_concurrency=CLAUDE_MAX_CONCURRENCY,
+    per_user_limit=CLAUDE_PER_USER_CONCURRENCY,
+    max_queue_per_user=CLAUDE_MAX_QUEUE_PER_USER,
+)
+
+# 응답 시간/호스트 부하에 따라 스케줄러 동시 실행 상한 조절
+concurrency_limiter = AdaptiveLimiter(
+    initial=CLAUDE_MAX_CONCURRENCY,
+    min_limit=CLAUDE_CONCURRENCY_MIN,
+    max_limit=CLAUDE_CONCURRENCY_MAX,
+    on_change=scheduler.set_max_concurrency,
+)
+scheduler.set_max_concurrency(concurrency_limiter.limit)
+
+# 프로젝트 카테고리/채널 생성기 (Discord REST 동시 요청 제한 공유)
+provisioner = ProjectProvisioner(concurrency=DISCORD_API_CONCURRENCY)
+
+
+# 멤버별 bot-console 채널 생성기 (실패 시 재시도 큐)
+console_provisioner = ConsoleProvisioner(concurrency=DISCORD_API_CONCURRENCY)
+
+# send_notification / send_message 채널별 전송 outbox
+notification_outbox = NotificationOutbox()
+if OUTBOX_PATH:
+    notification_outbox.store = SQLiteOutboxStore(OUTBOX_PATH)
+
+# bot-console 연속 메시지 묶기 (입력 중 이벤트로 대기 연장)
+message_debouncer: MessageDebouncer[discord.Message] = MessageDebouncer(window=CONSOLE_DEBOUNCE)
+
+# read_messages용 채널별 최근 메시지 캐시 (Gateway 이벤트로 갱신)
+message_cache = MessageCache()
+
+# bot-console 채널 ID ↔ 소유 멤버 ID (on_message 필터)
+console_registry = ConsoleRegistry()
+
+# bot-console 채널 관리자 (카테고리/콘솔 맵 캐시 유지)
+_channel_manager: ChannelManager | None = None
+
+
+def get_channel_manager(guild: discord.Guild) -> ChannelManager:
+    """guild에 대한 ChannelManager를 반환한다. 없거나 다른 guild면 새로 만든다."""
+    global _channel_manager
+    if _channel_manager is None or _channel_manager.guild is not guild:
+        _channel_manager = ChannelManager(
+            guild, registry=console_registry, on_forget=release_worker
+        )
+    return _channel_manager
+
+
+async def send_console_welcome(member: discord.Member, channel: discord.TextChannel):
+    """새로 만든(메시지 없는) 콘솔 채널에 웰컴 메시지를 보낸다."""
+    if channel.last_message_id is None:
+        await channel.send(
+            f"👋 {member.mention}님, 여기는 AI 프로젝트 관리 채널입니다.\n"
+            f"메시지를 보내면 AI가 프로젝트를 관리해드립니다."
+        )
+
+
+def lazy_consoles() -> bool:
+    """콘솔을 필요할 때만 만드는 모드인지 확인한다."""
+    return CONSOLE_MODE == "lazy"
+
+
+async def open_console(member: discord.Member) -> discord.TextChannel:
+    """멤버의 bot-console 채널을 가져오거나 만들고, 새 채널이면 웰컴 메시지를 보낸다."""
+    channel = await get_channel_manager(member.guild).create_user_console(member)
+    await send_console_welcome(member, channel)
+    return channel
+
+
+# lazy 모드 유휴 콘솔 정리 태스크
+_console_archive_task: asyncio.Task | None = None
+
+
+def delete_idle_consoles() -> bool:
+    """유휴 콘솔을 영구 삭제할지 확인한다.
+
+    세션을 메모리에만 보관하면 콘솔과 함께 대화 컨텍스트도 사라지므로 삭제하지 않고 보관한다.
+    """
+    if CONSOLE_ARCHIVE_DELETE and not SESSION_DB_PATH:
+        logger.warning("SESSION_DB_PATH 없이 CONSOLE_ARCHIVE_DELETE를 켤 수 없어 유휴 콘솔을 보관합니다")
+        return False
+    return CONSOLE_ARCHIVE_DELETE
+
+
+async def _archive_idle_consoles(guild: discord.Guild):
+    delete = delete_idle_consoles()
+    while True:
+        await asyncio.sleep(CONSOLE_ARCHIVE_INTERVAL)
+        try:
+            archived = await get_channel_manager(guild).archive_idle_consoles(
+                CONSOLE_IDLE_HOURS, delete=delete
+            )
+            if archived:
+                logger.info(f"유휴 bot-console {archived}개 정리")
+        except Exception:
+            logger.exception("유휴 bot-console 정리 실패")
 
 
 @bot.event
 async def on_ready():
-    """봇이 준비되면 모든 멤버에게 bot-console 채널을 자동 생성한다."""
+    """봇이 준비되면 모든 멤버에게 bot-console 채널을 자동 생성한다.
+
+    lazy 모드에서는 채널을 만들지 않고 /console 명령을 등록한 뒤 유휴 콘솔 정리를 시작한다.
+    """
+    global _console_archive_task
     guild = bot.get_guild(DISCORD_GUILD_ID)
     if not guild:
         return
 
-    channel_mgr = ChannelManager(guild)
+    get_project_index(guild)
+    # 재연결 중 놓친 메시지 이벤트가 있을 수 있으므로 캐시를 비운다
+    message_cache.clear()
+    # 재시작 전에 보내지 못한 알림/메시지를 이어서 전송한다
+    await notification_outbox.restore(bot.get_channel)
 
-    for member in guild.members:
-        if member.bot:
-            continue
+    channel_mgr = get_channel_manager(guild)
+    channel_mgr.rebuild()
+    await channel_mgr.tag_consoles()
+    if lazy_consoles():
         try:
-            channel = await channel_mgr.create_user_console(member)
-            if channel.last_message_id is None:
-                await channel.send(
-                    f"👋 {member.mention}님, 여기는 AI 프로젝트 관리 채널입니다.\n"
-                    f"메시지를 보내면 AI가 프로젝트를 관리해드립니다."
-                )
-        except Exception:
-            continue
+            await tree.sync(guild=guild)
+        except discord.HTTPException as e:
+            logger.warning(f"/console 명령 등록 실패: {e}")
+        if _console_archive_task is None or _console_archive_task.done():
+            _console_archive_task = asyncio.create_task(_archive_idle_consoles(guild))
+        return
+
+    await console_provisioner.provision(
+        channel_mgr, guild.members, on_ready=send_console_welcome
+    )
+
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    """새로 들어온 멤버의 bot-console 채널을 만든다."""
+    if member.bot or member.guild.id != DISCORD_GUILD_ID or lazy_consoles():
+        return
+    await console_provisioner.provision_member(
+        get_channel_manager(member.guild), member, on_ready=send_console_welcome
+    )
+
+
+@tree.command(
+    name="console",
+    description="나의 AI bot-console 채널을 엽니다",
+    guild=discord.Object(id=DISCORD_GUILD_ID),
+)
+async def console_command(interaction: discord.Interaction):
+    """/console: 호출한 멤버의 bot-console 채널을 열고 링크를 안내한다."""
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        channel = await open_console(interaction.user)
+    except Exception as e:
+        await interaction.followup.send(f"⚠️ 콘솔 채널을 만들지 못했습니다: {e}", ephemeral=True)
+        return
+    await interaction.followup.send(f"🤖 {channel.mention} 채널에서 대화하세요.", ephemeral=True)
+
+
+async def open_console_from_dm(message: discord.Message):
+    """봇에게 온 DM에 대해 보낸 멤버의 bot-console 채널을 열고 안내한다."""
+    guild = bot.get_guild(DISCORD_GUILD_ID)
+    member = guild.get_member(message.author.id) if guild else None
+    if member is None:
+        return
+    try:
+        channel = await open_console(member)
+    except Exception as e:
+        await message.channel.send(f"⚠️ 콘솔 채널을 만들지 못했습니다: {e}")
+        return
+    await message.channel.send(f"🤖 {channel.mention} 채널에서 대화를 이어가주세요.")
+
+
+# 유저별로 처리 중인 bot-console 요청 (cancel 모드에서 새 메시지가 오면 취소)
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def supersede_previous(user_id: str):
+    """유저의 이전 요청을 취소하고, 이전 요청이 CLI 프로세스를 정리할 때까지 기다린다."""
+    current = asyncio.current_task()
+    previous = _inflight.get(user_id)
+    _inflight[user_id] = current
+    if previous is not None and previous is not current and not previous.done():
+        previous.cancel()
+        await asyncio.wait({previous})
 
 
 @bot.event
 async def on_message(message: discord.Message):
     """bot-console 채널 메시지를 감지하여 Claude Code CLI로 AI 응답을 전송한다."""
+    if message.guild is not None and message.guild.id == DISCORD_GUILD_ID:
+        message_cache.add(message)
+
     if message.author.bot:
         return
 
-    if not ChannelManager.is_console_channel(message.channel):
+    if isinstance(message.channel, discord.DMChannel):
+        if lazy_consoles():
+            await open_console_from_dm(message)
+        return
+
+    if message.channel.id not in console_registry:
         return
 
     user_id = str(message.author.id)
-    session = session_manager.get_or_create_session(user_id)
+    batch = await message_debouncer.collect(user_id, message)
+    if batch is None:
+        return  # 먼저 온 메시지와 묶여 함께 처리된다
+    content = "\n".join(m.content for m in batch)
 
-    # 컨텍스트는 현재 메시지 추가 전에 가져온다
-    context_messages = session.get_recent_messages(limit=10)
-    session.add_message("user", message.content)
+    supersede = CLAUDE_SUPERSEDE == "cancel"
+    if supersede:
+        await supersede_previous(user_id)
 
-    async with _semaphore:
-        async with message.channel.typing():
-            result = await claude_client.send_message(
-                message.content, context_messages=context_messages
-            )
+    try:
+        await respond_in_console(message, user_id, content)
+    except asyncio.CancelledError:
+        if supersede and _inflight.get(user_id) is not asyncio.current_task():
+            await message.channel.send("⏹️ 새 메시지가 도착해 이전 요청을 취소했습니다.")
+        raise
+    finally:
+        if _inflight.get(user_id) is asyncio.current_task():
+            del _inflight[user_id]
 
-        if result.success:
-            session.add_message("assistant", result.text)
-            for chunk in split_message(result.text):
-                await message.channel.send(chunk)
-        else:
-            await message.channel.send(f"⚠️ {result.error}")
+
+async def respond_in_console(message: discord.Message, user_id: str, content: str):
+    """실행 슬롯을 받아 content에 대한 Claude Code CLI 응답을 bot-console 채널에 전송한다."""
+
+    async def notify_queued(position: int):
+        await message.channel.send(f"⏳ 대기열 {position}번째입니다. 앞선 요청이 끝나면 처리합니다.")
+
+    try:
+        await scheduler.acquire(user_id, on_queued=notify_queued)
+    except QueueFullError as e:
+        await message.channel.send(f"⚠️ {e}")
+        return
+
+    try:
+        session = await session_manager.load_or_create_session(user_id)
+
+        # 컨텍스트는 현재 메시지 추가 전에 가져온다 (CLI 대화를 이어가지 못할 때만 전송)
+        context_messages = session.build_context(
+            budget=CONTEXT_CHAR_BUDGET, summarize=CONTEXT_SUMMARY
+        )
+        session.add_message("user", content)
+
+        reply = StreamingReply(message.channel)
+        try:
+            async with message.channel.typing():
+                with concurrency_limiter.measure() as measurement:
+                    result = await claude_client.send_message(
+                        content,
+                        context_messages=context_messages,
+                        session_key=user_id,
+                        on_text=reply.feed if STREAM_RESPONSES else None,
+                        resume_id=session.cli_session_id,
+                    )
+                    measurement.failed = not result.success
+
+            if result.success:
+                session.cli_session_id = result.session_id
+                session.add_message("assistant", result.text)
+                await reply.finish(result.text)
+            else:
+                await reply.finish()
+                await message.channel.send(f"⚠️ {result.error}")
+        except asyncio.CancelledError:
+            # 예약된 부분 응답 반영이 취소 안내 뒤에 게시되지 않도록 먼저 멈춘다
+            await reply.cancel()
+            raise
+    finally:
+        scheduler.release(user_id)
+
+
+@bot.event
+async def on_typing(channel, user, when):
+    """bot-console에서 입력 중이면 메시지 묶음 대기를 연장한다."""
+    if getattr(user, "bot", False) or channel.id not in console_registry:
+        return
+    message_debouncer.typing(str(user.id))
 
 
 def get_guild() -> discord.Guild:
@@ -191,16 +515,66 @@ def get_guild() -> discord.Guild:
     return guild
 
 
+# 프로젝트 인덱스 (on_ready에서 구축, 채널 이벤트로 증분 갱신)
+_project_index: ProjectIndex | None = None
+
+
+def get_project_index(guild: discord.Guild) -> ProjectIndex:
+    """guild에 대한 프로젝트 인덱스를 반환한다. 없거나 다른 guild면 새로 구축한다."""
+    global _project_index
+    if _project_index is None or _project_index.guild is not guild:
+        _project_index = ProjectIndex(guild)
+    return _project_index
+
+
+def _indexed_event_guild(channel) -> bool:
+    """이벤트 채널이 인덱스 대상 guild 소속인지 확인한다."""
+    return (
+        _project_index is not None
+        and channel.guild.id == _project_index.guild.id
+    )
+
+
+@bot.event
+async def on_guild_channel_create(channel):
+    if _indexed_event_guild(channel):
+        _project_index.on_channel_create(channel)
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    if _indexed_event_guild(channel):
+        _project_index.on_channel_delete(channel)
+    if _channel_manager is not None and channel.guild.id == _channel_manager.guild.id:
+        _channel_manager.forget_channel(channel)
+    message_cache.forget(channel.id)
+
+
+@bot.event
+async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent):
+    # payload.message는 discord.py 2.5부터 제공된다 (requirements.txt)
+    message_cache.update(payload.message)
+
+
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    message_cache.remove(payload.channel_id, (payload.message_id,))
+
+
+@bot.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+    message_cache.remove(payload.channel_id, payload.message_ids)
+
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    if _indexed_event_guild(after):
+        _project_index.on_channel_update(before, after)
+
+
 def find_channel(guild: discord.Guild, project_name: str, keyword: str):
     """프로젝트 카테고리 내에서 keyword를 포함하는 채널을 찾는다."""
-    prefix = f"{project_name} / "
-    for category in guild.categories:
-        if not category.name.startswith(prefix):
-            continue
-        for channel in category.channels:
-            if keyword in channel.name:
-                return channel
-    return None
+    return get_project_index(guild).find_channel(project_name, keyword)
 
 
 # ---------------------------------------------------------------------------
@@ -260,16 +634,49 @@ async def list_tools() -> list[types.Tool]:
                 "type": "object",
                 "properties": {
                     "project_name": {"type": "string", "description": "삭제할 프로젝트명"},
+                    "background": {
+                        "type": "boolean",
+                        "description": "true면 즉시 job id를 반환하고 백그라운드에서 삭제 (기본값 false)",
+                        "default": False,
+                    },
                 },
                 "required": ["project_name"],
             },
         ),
+        types.Tool(
+            name="get_job_status",
+            description="백그라운드 작업의 진행 상황을 조회합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string", "description": "작업 ID"},
+                },
+                "required": ["job_id"],
+            },
+        ),
+        types.Tool(
+            name="get_notification_status",
+            description="send_notification / send_message로 보낸 항목의 전송 상태를 조회합니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "notification_id": {"type": "string", "description": "알림 ID"},
+                },
+                "required": ["notification_id"],
+            },
+        ),
         types.Tool(
             name="list_projects",
             description="등록된 모든 프로젝트 목록을 조회합니다",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "detailed": {
+                        "type": "boolean",
+                        "description": "팀별 카테고리/채널 ID와 채널 수 포함 여부 (기본값 false)",
+                        "default": False,
+                    },
+                },
             },
         ),
         types.Tool(
@@ -285,6 +692,10 @@ async def list_tools() -> list[types.Tool]:
                         "description": "알림 타입 (plan/question/complete/error/build/test/deploy)",
                         "enum": list(NOTIFICATION_TYPES.keys()),
                     },
+                    "idempotency_key": {
+                        "type": "string",
+                        "description": "중복 전송 방지 키 (같은 키로 다시 호출하면 기존 항목 반환)",
+                    },
                 },
                 "required": ["project_name", "message", "event_type"],
             },
@@ -301,13 +712,20 @@ async def list_tools() -> list[types.Tool]:
                         "description": "채널 검색 키워드",
                     },
                     "content": {"type": "string", "description": "메시지 내용"},
+                    "idempotency_key": {
+                        "type": "string",
+                        "description": "중복 전송 방지 키 (같은 키로 다시 호출하면 기존 항목 반환)",
+                    },
                 },
                 "required": ["project_name", "channel_keyword", "content"],
             },
         ),
         types.Tool(
             name="read_messages",
-            description="특정 채널의 최근 메시지를 읽어옵니다",
+            description=(
+                "특정 채널의 최근 메시지를 읽어옵니다. "
+                "결과 끝에 before 커서가 있으면 그 값으로 이전 메시지를 이어서 읽을 수 있습니다"
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -318,9 +736,37 @@ async def list_tools() -> list[types.Tool]:
                     },
                     "limit": {
                         "type": "integer",
-                        "description": "조회할 메시지 수 (기본값 10)",
+                        "description": f"조회할 메시지 수 (기본값 10, 상한 {READ_MESSAGES_SCAN_LIMIT})",
                         "default": 10,
                     },
+                    "before": {
+                        "type": "string",
+                        "description": "이 메시지 ID보다 이전 메시지만 조회 (페이지 커서)",
+                    },
+                    "after": {
+                        "type": "string",
+                        "description": "이 메시지 ID보다 이후 메시지만 조회",
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "이 시각(ISO 8601, UTC) 이후 메시지만 조회",
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "이 시각(ISO 8601, UTC) 이전 메시지만 조회",
+                    },
+                    "author": {
+                        "type": "string",
+                        "description": "작성자 표시 이름에 포함된 문자열 (대소문자 무시)",
+                    },
+                    "contains": {
+                        "type": "string",
+                        "description": "메시지 내용에 포함된 문자열 (대소문자 무시)",
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": f"응답 최대 바이트 (기본값/상한 {READ_MESSAGES_MAX_BYTES})",
+                    },
                 },
                 "required": ["project_name", "channel_keyword"],
             },
@@ -334,6 +780,7 @@ async def list_tools() -> list[types.Tool]:
 
 async def handle_create_project(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
+    index = get_project_index(guild)
     project_name = arguments["project_name"]
 
     custom_teams_raw = arguments.get("teams", "")
@@ -342,9 +789,6 @@ async def handle_create_project(arguments: dict[str, Any]) -> list[types.TextCon
     else:
         team_names = None
 
-    created_categories = []
-    created_channels = []
-
     if team_names is None:
         teams = DEFAULT_TEAMS
     else:
@@ -354,35 +798,28 @@ async def handle_create_project(arguments: dict[str, Any]) -> list[types.TextCon
                 ch.format(team_name=name) for ch in CUSTOM_TEAM_CHANNELS
             ]
 
-    for team_name, channels in teams.items():
-        category_name = f"{project_name} / {team_name}"
-        category = await guild.create_category(category_name)
-        created_categories.append(category_name)
-
-        for ch_name in channels:
-            await category.create_text_channel(ch_name)
-            created_channels.append(ch_name)
+    result = await provisioner.provision(guild, project_name, teams, index)
 
     summary = (
         f"프로젝트 '{project_name}' 생성 완료\n"
-        f"카테고리 {len(created_categories)}개, 채널 {len(created_channels)}개 생성됨\n"
-        f"카테고리: {', '.join(created_categories)}"
+        f"카테고리 {len(result.category_names)}개, 채널 {result.channel_count}개 생성됨\n"
+        f"카테고리: {', '.join(result.category_names)}\n"
+        f"{result.timing_summary()}"
     )
     return [types.TextContent(type="text", text=summary)]
 
 
 async def handle_add_team(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
+    index = get_project_index(guild)
     project_name = arguments["project_name"]
     team_name = arguments["team_name"]
-    prefix = f"{project_name} / "
 
-    project_categories = [c for c in guild.categories if c.name.startswith(prefix)]
-    if not project_categories:
+    if not index.has_project(project_name):
         raise ValueError(f"프로젝트 '{project_name}'를 찾을 수 없습니다")
 
     new_category_name = f"{project_name} / {team_name}"
-    if any(c.name == new_category_name for c in guild.categories):
+    if index.get_category(project_name, team_name) is not None:
         raise ValueError(f"팀 '{team_name}'이(가) 이미 존재합니다")
 
     if team_name in DEFAULT_TEAMS:
@@ -390,37 +827,38 @@ async def handle_add_team(arguments: dict[str, Any]) -> list[types.TextContent]:
     else:
         channels = [ch.format(team_name=team_name) for ch in CUSTOM_TEAM_CHANNELS]
 
-    category = await guild.create_category(new_category_name)
-    for ch_name in channels:
-        await category.create_text_channel(ch_name)
+    result = await provisioner.provision(
+        guild, project_name, {team_name: channels}, index
+    )
 
     summary = (
         f"팀 '{team_name}' 추가 완료 (프로젝트: {project_name})\n"
         f"카테고리: {new_category_name}\n"
-        f"채널 {len(channels)}개 생성됨"
+        f"채널 {result.channel_count}개 생성됨\n"
+        f"{result.timing_summary()}"
     )
     return [types.TextContent(type="text", text=summary)]
 
 
 async def handle_add_channel(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
+    index = get_project_index(guild)
     project_name = arguments["project_name"]
     team_name = arguments["team_name"]
     channel_name = arguments["channel_name"]
 
     target_name = f"{project_name} / {team_name}"
-    category = next(
-        (c for c in guild.categories if c.name == target_name), None
-    )
+    category = index.get_category(project_name, team_name)
     if category is None:
         raise ValueError(
             f"카테고리 '{target_name}'를 찾을 수 없습니다"
         )
 
-    if any(ch.name == channel_name for ch in category.channels):
+    if any(ch.name == channel_name for ch in index.get_channels(category)):
         raise ValueError(f"채널 '{channel_name}'이(가) 이미 존재합니다")
 
-    await category.create_text_channel(channel_name)
+    channel = await category.create_text_channel(channel_name)
+    index.add_channel(channel, category)
 
     summary = (
         f"채널 '{channel_name}' 생성 완료\n"
@@ -431,41 +869,61 @@ async def handle_add_channel(arguments: dict[str, Any]) -> list[types.TextConten
 
 async def handle_delete_project(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
+    index = get_project_index(guild)
     project_name = arguments["project_name"]
-    prefix = f"{project_name} / "
+    background = arguments.get("background", False)
 
-    targets = [c for c in guild.categories if c.name.startswith(prefix)]
+    targets = list(index.get_teams(project_name).values())
     if not targets:
         raise ValueError(f"프로젝트 '{project_name}'를 찾을 수 없습니다")
 
-    deleted_channels = 0
-    for category in targets:
-        for channel in category.channels:
-            await channel.delete()
-            deleted_channels += 1
-        await category.delete()
+    async def run(on_progress=None) -> str:
+        result = await provisioner.teardown(
+            project_name, targets, index, on_progress=on_progress
+        )
+        summary = (
+            f"프로젝트 '{project_name}' 삭제 완료\n"
+            f"카테고리 {result.deleted_categories}개, 채널 {result.deleted_channels}개 삭제됨\n"
+            f"소요 시간 {result.elapsed:.2f}초"
+        )
+        if result.failures:
+            summary += f"\n실패 {len(result.failures)}건:\n" + "\n".join(result.failures)
+        return summary
 
-    summary = (
-        f"프로젝트 '{project_name}' 삭제 완료\n"
-        f"카테고리 {len(targets)}개, 채널 {deleted_channels}개 삭제됨"
-    )
-    return [types.TextContent(type="text", text=summary)]
+    if background:
+        job = job_registry.submit(
+            "delete_project", lambda job: run(on_progress=job.update_progress)
+        )
+        return [types.TextContent(
+            type="text",
+            text=(
+                f"프로젝트 '{project_name}' 삭제 작업 시작\n"
+                f"job_id: {job.job_id} (get_job_status로 진행 상황 조회)"
+            ),
+        )]
+
+    return [types.TextContent(type="text", text=await run())]
+
+
+async def handle_get_job_status(arguments: dict[str, Any]) -> list[types.TextContent]:
+    job_id = arguments["job_id"]
+    job = job_registry.get(job_id)
+    if job is None:
+        raise ValueError(f"작업 '{job_id}'를 찾을 수 없습니다")
+    return [types.TextContent(
+        type="text", text=json.dumps(job.to_dict(), ensure_ascii=False, indent=2)
+    )]
 
 
 async def handle_list_projects(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
-    projects: dict[str, list[str]] = {}
-
-    for category in guild.categories:
-        if " / " not in category.name:
-            continue
-        project_name, team_name = category.name.split(" / ", 1)
-        projects.setdefault(project_name, []).append(team_name)
+    index = get_project_index(guild)
 
-    if not projects:
+    if not index.project_count:
         return [types.TextContent(type="text", text="등록된 프로젝트가 없습니다")]
 
-    return [types.TextContent(type="text", text=json.dumps(projects, ensure_ascii=False, indent=2))]
+    detailed = bool(arguments.get("detailed", False))
+    return [types.TextContent(type="text", text=index.snapshot(detailed=detailed))]
 
 
 async def handle_send_notification(arguments: dict[str, Any]) -> list[types.TextContent]:
@@ -476,18 +934,13 @@ async def handle_send_notification(arguments: dict[str, Any]) -> list[types.Text
 
     if event_type not in NOTIFICATION_TYPES:
         raise ValueError(f"알 수 없는 event_type: {event_type}")
+    # 대기열에 넣은 뒤에는 실패를 알릴 수 없으므로 Discord가 거절할 길이는 먼저 막는다
+    if len(message) > MAX_EMBED_DESCRIPTION:
+        raise ValueError(
+            f"알림 내용이 너무 깁니다 ({len(message)}자, 최대 {MAX_EMBED_DESCRIPTION}자)"
+        )
 
-    prefix = f"{project_name} / "
-    notification_channel = None
-    for category in guild.categories:
-        if not category.name.startswith(prefix):
-            continue
-        for channel in category.channels:
-            if "claude-알림" in channel.name:
-                notification_channel = channel
-                break
-        if notification_channel:
-            break
+    notification_channel = find_channel(guild, project_name, "claude-알림")
 
     if notification_channel is None:
         raise ValueError(
@@ -502,11 +955,26 @@ async def handle_send_notification(arguments: dict[str, Any]) -> list[types.Text
         timestamp=datetime.datetime.now(datetime.timezone.utc),
     )
 
-    await notification_channel.send(embed=embed)
+    notification = await notification_outbox.enqueue(
+        notification_channel, embed=embed, idempotency_key=arguments.get("idempotency_key")
+    )
 
     return [types.TextContent(
         type="text",
-        text=f"알림 전송 완료 [{nt['label']}] → {notification_channel.name}",
+        text=(
+            f"알림 전송 예약 [{nt['label']}] → {notification_channel.name}\n"
+            f"notification_id: {notification.notification_id}"
+        ),
+    )]
+
+
+async def handle_get_notification_status(arguments: dict[str, Any]) -> list[types.TextContent]:
+    notification_id = arguments["notification_id"]
+    notification = await notification_outbox.get(notification_id)
+    if notification is None:
+        raise ValueError(f"알림 '{notification_id}'를 찾을 수 없습니다")
+    return [types.TextContent(
+        type="text", text=json.dumps(notification.to_dict(), ensure_ascii=False, indent=2)
     )]
 
 
@@ -515,6 +983,11 @@ async def handle_send_message(arguments: dict[str, Any]) -> list[types.TextConte
     project_name = arguments["project_name"]
     keyword = arguments["channel_keyword"]
     content = arguments["content"]
+    # 대기열에 넣은 뒤에는 실패를 알릴 수 없으므로 Discord가 거절할 길이는 먼저 막는다
+    if len(content) > DISCORD_MESSAGE_LIMIT:
+        raise ValueError(
+            f"메시지가 너무 깁니다 ({len(content)}자, 최대 {DISCORD_MESSAGE_LIMIT}자)"
+        )
 
     channel = find_channel(guild, project_name, keyword)
     if channel is None:
@@ -522,19 +995,62 @@ async def handle_send_message(arguments: dict[str, Any]) -> list[types.TextConte
             f"프로젝트 '{project_name}'에서 '{keyword}' 채널을 찾을 수 없습니다"
         )
 
-    await channel.send(content)
+    notification = await notification_outbox.enqueue(
+        channel, content=content, idempotency_key=arguments.get("idempotency_key")
+    )
 
     return [types.TextContent(
         type="text",
-        text=f"메시지 전송 완료 → {channel.name}",
+        text=(
+            f"메시지 전송 예약 → {channel.name}\n"
+            f"notification_id: {notification.notification_id}"
+        ),
     )]
 
 
+def _parse_message_id(value: Any, name: str) -> int | None:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}는 메시지 ID(숫자)여야 합니다: {value}")
+
+
+def _parse_snowflake_time(value: str | None, name: str, high: bool) -> int | None:
+    """ISO 8601 시각을 같은 시각의 메시지 ID 경계로 바꾼다 (시간대 없으면 UTC)."""
+    if not value:
+        return None
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name}는 ISO 8601 시각이어야 합니다: {value}")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return discord.utils.time_snowflake(moment, high=high)
+
+
 async def handle_read_messages(arguments: dict[str, Any]) -> list[types.TextContent]:
     guild = get_guild()
     project_name = arguments["project_name"]
     keyword = arguments["channel_keyword"]
-    limit = arguments.get("limit", 10)
+    # 한 번에 훑는 메시지 수 상한을 넘는 limit은 의미가 없고 REST 조회만 늘린다
+    limit = max(1, min(int(arguments.get("limit", 10)), READ_MESSAGES_SCAN_LIMIT))
+    max_bytes = min(
+        arguments.get("max_bytes") or READ_MESSAGES_MAX_BYTES, READ_MESSAGES_MAX_BYTES
+    )
+
+    # 시간 범위는 메시지 ID 경계로 바꿔 커서와 합친다
+    before = _parse_message_id(arguments.get("before"), "before")
+    after = _parse_message_id(arguments.get("after"), "after")
+    until = _parse_snowflake_time(arguments.get("until"), "until", high=False)
+    since = _parse_snowflake_time(arguments.get("since"), "since", high=True)
+    if until is not None:
+        before = until if before is None else min(before, until)
+    if since is not None:
+        after = since if after is None else max(after, since)
+    author = (arguments.get("author") or "").casefold()
+    contains = (arguments.get("contains") or "").casefold()
 
     channel = find_channel(guild, project_name, keyword)
     if channel is None:
@@ -542,15 +1058,56 @@ async def handle_read_messages(arguments: dict[str, Any]) -> list[types.TextCont
             f"프로젝트 '{project_name}'에서 '{keyword}' 채널을 찾을 수 없습니다"
         )
 
-    messages = []
-    async for msg in channel.history(limit=limit):
-        timestamp = msg.created_at.strftime("%Y-%m-%d %H:%M")
-        messages.append(f"[{timestamp}] {msg.author.display_name}: {msg.content}")
-
-    if not messages:
+    lines: list[str] = []
+    size = 0
+    scanned = 0
+    cursor = None
+    # 다음 페이지가 있는지 알기 위해 한 개 더 읽는다
+    history = message_cache.iter_history(
+        channel, before=before, after=after, prefetch=limit + 1
+    )
+    async with aclosing(history):
+        async for msg in history:
+            if len(lines) >= limit or scanned >= READ_MESSAGES_SCAN_LIMIT:
+                break
+            if author and author not in msg.author.casefold():
+                cursor = msg.id
+                scanned += 1
+                continue
+            if contains and contains not in msg.content.casefold():
+                cursor = msg.id
+                scanned += 1
+                continue
+            line = msg.format()
+            cost = len(line.encode()) + 1
+            if size + cost > max_bytes:
+                if not lines:
+                    # 한 메시지가 max_bytes보다 길면 잘라서라도 돌려줘야 다음 페이지로 넘어갈 수 있다
+                    lines.append(truncate_text(line, max(max_bytes - 4, 0)) + "…")
+                    cursor = msg.id
+                    scanned += 1
+                break
+            lines.append(line)
+            size += cost
+            cursor = msg.id
+            scanned += 1
+        else:
+            # 범위 끝까지 읽었으면 이어서 읽을 메시지가 없다
+            cursor = None
+
+    if cursor is not None:
+        more = f"(더 이전 메시지: before={cursor})"
+        if not lines:
+            return [types.TextContent(
+                type="text",
+                text=f"최근 {scanned}개 중 조건에 맞는 메시지가 없습니다 {more}",
+            )]
+        lines.append(more)
+
+    if not lines:
         return [types.TextContent(type="text", text="메시지가 없습니다")]
 
-    return [types.TextContent(type="text", text="\n".join(messages))]
+    return [types.TextContent(type="text", text="\n".join(lines))]
 
 
 # 도구 이름 → 핸들러 매핑
@@ -559,8 +1116,10 @@ TOOL_HANDLERS = {
     "add_team": handle_add_team,
     "add_channel": handle_add_channel,
     "delete_project": handle_delete_project,
+    "get_job_status": handle_get_job_status,
     "list_projects": handle_list_projects,
     "send_notification": handle_send_notification,
+    "get_notification_status": handle_get_notification_status,
     "send_message": handle_send_message,
     "read_messages": handle_read_messages,
 }
@@ -593,6 +1152,9 @@ async def run_mcp_server():
 
 
 async def main():
+    if claude_client.pool is not None:
+        await claude_client.pool.start()
+    session_manager.start_cleanup()
     try:
         await asyncio.gather(
             bot.start(DISCORD_TOKEN),
@@ -601,6 +1163,15 @@ async def main():
     except Exception as e:
         logger.error(f"서비스 종료: {e}")
     finally:
+        await session_manager.stop_cleanup()
+        await console_provisioner.close()
+        await notification_outbox.close(timeout=10)
+        if _console_archive_task is not None:
+            _console_archive_task.cancel()
+        if session_manager.store is not None:
+            session_manager.store.close()
+        if claude_client.pool is not None:
+            await claude_client.pool.close()
         if not bot.is_closed():
             await bot.close()
 
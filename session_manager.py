@@ -1,32 +1,253 @@
 """유저별 대화 세션 관리 모듈"""
 
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict, deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterator, List, Optional
+
+from config import (
+    CONTEXT_CHAR_BUDGET,
+    CONTEXT_MAX_MESSAGES,
+    CONTEXT_SUMMARY_CHARS,
+    MAX_SESSION_MESSAGES,
+    MAX_SESSIONS,
+    SESSION_CLEANUP_INTERVAL,
+    SESSION_IDLE_HOURS,
+)
+
+if TYPE_CHECKING:
+    from session_store import SQLiteSessionStore, StoredSession
+
+logger = logging.getLogger(__name__)
+
+
+# 역할 문자열 ↔ 정수 코드 (메시지마다 문자열을 들고 있지 않도록 정수로 보관)
+_ROLE_NAMES: List[str] = ["user", "assistant", "system"]
+_ROLE_CODES: Dict[str, int] = {name: i for i, name in enumerate(_ROLE_NAMES)}
+
+
+def _role_code(role: str) -> int:
+    code = _ROLE_CODES.get(role)
+    if code is None:
+        code = _ROLE_CODES[role] = len(_ROLE_NAMES)
+        _ROLE_NAMES.append(sys.intern(role))
+    return code
+
+
+class Message:
+    """대화 메시지 레코드
+
+    ``__slots__`` 로 인스턴스 dict를 없애고 역할은 정수 코드로 보관한다.
+    기존 ``{"role": ..., "content": ...}`` dict와 같은 방식으로
+    ``message["role"]`` 조회와 dict 비교를 지원한다.
+    """
+
+    __slots__ = ("_role", "content", "timestamp", "size")
+
+    def __init__(self, role: str, content: str, timestamp: Optional[float] = None):
+        self._role = _role_code(role)
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+        # 컨텍스트 텍스트("role: content\n")로 변환했을 때의 글자 수
+        self.size = len(role) + len(content) + 3
+
+    @property
+    def role(self) -> str:
+        return _ROLE_NAMES[self._role]
+
+    def __getitem__(self, key: str) -> str:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Message):
+            return self._role == other._role and self.content == other.content
+        if isinstance(other, dict):
+            return other == self.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+
+class MessageWindow(Sequence):
+    """세션 메시지 버퍼의 최근 구간을 복사 없이 보여주는 뷰
+
+    버퍼가 바뀌면(메시지 추가 등) 뷰의 내용도 달라지므로
+    같은 이벤트 루프 단계 안에서만 사용한다.
+    """
+
+    __slots__ = ("_buffer", "_start", "_len")
+
+    def __init__(self, buffer: Deque[Message], limit: int):
+        size = len(buffer)
+        self._buffer = buffer
+        self._len = size if limit <= 0 else min(limit, size)
+        self._start = size - self._len
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        return self._buffer[self._start + index]
+
+    def __iter__(self) -> Iterator[Message]:
+        return islice(self._buffer, self._start, self._start + self._len)
+
+
+def _message_buffer() -> Deque[Message]:
+    return deque(maxlen=MAX_SESSION_MESSAGES)
+
+
+_TRUNCATED = "…(생략)"
+_SUMMARY_LINE_CHARS = 120
+
+
+def _truncate(message: Message, budget: int) -> Message:
+    """메시지 본문을 컨텍스트 예산에 맞게 자른 사본을 반환한다."""
+    keep = max(0, budget - (message.size - len(message.content)) - len(_TRUNCATED))
+    return Message(message.role, message.content[:keep] + _TRUNCATED, message.timestamp)
+
+
+def _summary_line(message: Message) -> str:
+    """요약에 넣을 한 줄: 본문 첫 줄을 앞부분만 남긴다."""
+    text = message.content.strip().split("\n", 1)[0]
+    if len(text) > _SUMMARY_LINE_CHARS:
+        text = text[:_SUMMARY_LINE_CHARS] + "…"
+    return f"- {message.role}: {text}"
 
 
 @dataclass
 class ConversationSession:
-    """유저별 대화 세션"""
+    """유저별 대화 세션
+
+    메시지는 최근 ``MAX_SESSION_MESSAGES`` 개만 보관하는 링 버퍼에 저장된다.
+    store가 연결되어 있으면 변경 사항을 저장소에도 기록한다.
+    """
 
     user_id: str
-    messages: List[Dict[str, str]] = field(default_factory=list)
+    messages: Deque[Message] = field(default_factory=_message_buffer)
     created_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
+    store: Optional["SQLiteSessionStore"] = field(default=None, repr=False, compare=False)
+    # 컨텍스트 예산 밖으로 밀려난 이전 대화의 요약과, 요약에 반영된 메시지 수
+    summary: List[str] = field(default_factory=list, repr=False)
+    # Claude CLI가 보관 중인 대화 ID (``--resume`` 으로 이어가며 메모리에만 보관)
+    cli_session_id: Optional[str] = field(default=None, repr=False)
+    _summarized: int = field(default=0, repr=False)
+    _total: int = field(default=0, repr=False)
 
     def add_message(self, role: str, content: str):
         """메시지 추가"""
-        self.messages.append({"role": role, "content": content})
         self.last_activity = datetime.now()
+        message = Message(role, content, self.last_activity.timestamp())
+        self.messages.append(message)
+        self._total += 1
+        if self.store is not None:
+            self.store.append(self.user_id, role, content, message.timestamp)
 
-    def get_recent_messages(self, limit: int = 10) -> List[Dict[str, str]]:
+    def get_recent_messages(self, limit: int = 10) -> List[Message]:
         """최근 N개 메시지 반환"""
-        return self.messages[-limit:]
+        return list(self.iter_recent(limit))
+
+    def iter_recent(self, limit: int = 10) -> MessageWindow:
+        """최근 N개 메시지를 복사 없이 보여주는 뷰를 반환한다. 0이면 전체."""
+        return MessageWindow(self.messages, limit)
+
+    def build_context(
+        self,
+        budget: int = CONTEXT_CHAR_BUDGET,
+        max_messages: int = CONTEXT_MAX_MESSAGES,
+        summarize: bool = False,
+        summary_chars: int = CONTEXT_SUMMARY_CHARS,
+    ) -> List[Message]:
+        """CLI에 전달할 대화 컨텍스트를 글자 수 예산 안에서 고른다.
+
+        최근 메시지부터 거슬러 올라가며 예산과 ``max_messages`` 안에 드는 만큼 담는다.
+        가장 최근 메시지 하나가 예산을 넘으면 잘라서 담는다.
+        summarize가 True면 예산 밖으로 밀려난 이전 대화를 한 줄씩 요약해
+        맨 앞에 ``system`` 메시지로 붙인다. 요약은 세션에 캐시되어 새로
+        밀려난 메시지만 추가로 반영된다.
+        """
+        if summarize:
+            budget -= summary_chars
+        selected: List[Message] = []
+        used = 0
+        for message in reversed(self.messages):
+            if len(selected) >= max_messages:
+                break
+            if used + message.size > budget:
+                if not selected and budget > 0:
+                    selected.append(_truncate(message, budget))
+                break
+            selected.append(message)
+            used += message.size
+        selected.reverse()
+
+        if summarize:
+            self._fold_summary(len(self.messages) - len(selected), summary_chars)
+            if self.summary:
+                text = "이전 대화 요약:\n" + "\n".join(self.summary)
+                selected.insert(0, Message("system", text))
+        return selected
+
+    def _fold_summary(self, omitted: int, summary_chars: int):
+        """버퍼 앞쪽 omitted개 메시지 중 아직 요약되지 않은 것을 요약에 추가한다."""
+        first = self._total - len(self.messages)  # 버퍼 맨 앞 메시지의 누적 번호
+        start = max(self._summarized, first)
+        end = first + omitted
+        if end <= start:
+            return
+        for message in islice(self.messages, start - first, end - first):
+            self.summary.append(_summary_line(message))
+        self._summarized = end
+        # 요약이 상한을 넘으면 오래된 줄부터 버린다
+        size = sum(len(line) + 1 for line in self.summary)
+        while self.summary and size > summary_chars:
+            size -= len(self.summary.pop(0)) + 1
 
     def clear(self):
         """대화 히스토리 초기화"""
         self.messages.clear()
+        self.summary.clear()
+        self.cli_session_id = None
+        self._summarized = self._total
         self.last_activity = datetime.now()
+        if self.store is not None:
+            self.store.clear(self.user_id)
+
+    def memory_usage(self) -> int:
+        """메시지 본문이 차지하는 대략적인 메모리(바이트)"""
+        return sum(
+            sys.getsizeof(m) + sys.getsizeof(m.content) + sys.getsizeof(m.timestamp)
+            for m in self.messages
+        )
 
     def to_dict(self, message_limit: int = 0) -> dict:
         """세션 정보를 딕셔너리로 직렬화한다.
@@ -41,21 +262,86 @@ class ConversationSession:
             "last_activity": self.last_activity.isoformat(),
         }
         if message_limit > 0:
-            data["recent_messages"] = self.get_recent_messages(limit=message_limit)
+            data["recent_messages"] = [
+                m.to_dict() for m in self.iter_recent(limit=message_limit)
+            ]
         return data
 
 
 class SessionManager:
-    """전역 세션 관리자"""
+    """전역 세션 관리자
+
+    세션은 최근 사용 순서로 유지되며 ``max_sessions`` 를 넘으면
+    가장 오래 사용하지 않은 세션부터 제거한다(LRU).
 
-    def __init__(self):
-        self._sessions: Dict[str, ConversationSession] = {}
+    store를 연결하면 메모리에서 제거된 세션도 저장소에 남아 있다가
+    해당 유저가 다시 접근할 때 최근 메시지를 읽어 복원한다.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        store: Optional["SQLiteSessionStore"] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.store = store
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._evicted = 0
+        self._expired = 0
+        self._cleanup_task: Optional[asyncio.Task] = None
+        # 세션이 메모리에서 제거될 때 유저 ID로 호출된다 (상주 워커 반납 등)
+        self.on_session_end: Optional[Callable[[str], None]] = None
 
     def get_or_create_session(self, user_id: str) -> ConversationSession:
         """세션 조회 또는 생성"""
-        if user_id not in self._sessions:
-            self._sessions[user_id] = ConversationSession(user_id=user_id)
-        return self._sessions[user_id]
+        session = self._sessions.get(user_id)
+        if session is not None:
+            self._sessions.move_to_end(user_id)
+            return session
+        stored = self._load_stored(user_id) if self.store is not None else None
+        return self._insert(self._restore(user_id, stored))
+
+    async def load_or_create_session(self, user_id: str) -> ConversationSession:
+        """세션 조회 또는 생성. 저장소 읽기는 이벤트 루프 밖(스레드)에서 실행한다."""
+        session = self._sessions.get(user_id)
+        if session is not None:
+            self._sessions.move_to_end(user_id)
+            return session
+        stored = None
+        if self.store is not None:
+            stored = await asyncio.to_thread(self._load_stored, user_id)
+            # 읽는 동안 다른 요청이 같은 세션을 만들었으면 그 세션을 쓴다
+            session = self._sessions.get(user_id)
+            if session is not None:
+                self._sessions.move_to_end(user_id)
+                return session
+        return self._insert(self._restore(user_id, stored))
+
+    def _insert(self, session: ConversationSession) -> ConversationSession:
+        self._sessions[session.user_id] = session
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            self._evicted += 1
+            logger.info("세션 수 상한 초과로 세션 제거: %s", evicted_id)
+            self._ended(evicted_id)
+        return session
+
+    def _load_stored(self, user_id: str) -> Optional["StoredSession"]:
+        try:
+            return self.store.load(user_id, MAX_SESSION_MESSAGES)
+        except Exception:
+            logger.exception("세션 복원 실패: %s", user_id)
+            return None
+
+    def _restore(self, user_id: str, stored: Optional["StoredSession"]) -> ConversationSession:
+        """저장소에서 읽은 세션이 있으면 복원하고, 없으면 새 세션을 만든다."""
+        session = ConversationSession(user_id=user_id, store=self.store)
+        if stored is not None:
+            session.messages.extend(stored.messages)
+            session._total = len(stored.messages)
+            session.created_at = stored.created_at
+            session.last_activity = stored.last_activity
+        return session
 
     def get_session(self, user_id: str):
         """세션 조회. 존재하지 않으면 None 반환."""
@@ -67,10 +353,16 @@ class SessionManager:
 
     def delete_session(self, user_id: str):
         """세션 삭제"""
-        self._sessions.pop(user_id, None)
+        if self._sessions.pop(user_id, None) is not None:
+            self._ended(user_id)
+        if self.store is not None:
+            self.store.delete(user_id)
+
+    def cleanup_old_sessions(self, hours: int = SESSION_IDLE_HOURS) -> int:
+        """오래된 세션 정리. 삭제된 세션 수 반환
 
-    def cleanup_old_sessions(self, hours: int = 24) -> int:
-        """오래된 세션 정리. 삭제된 세션 수 반환"""
+        메모리에서만 제거하며 저장소에 기록된 히스토리는 유지된다.
+        """
         cutoff = datetime.now() - timedelta(hours=hours)
         to_delete = [
             uid
@@ -79,13 +371,74 @@ class SessionManager:
         ]
         for uid in to_delete:
             del self._sessions[uid]
+            self._ended(uid)
+        self._expired += len(to_delete)
         return len(to_delete)
 
+    def _ended(self, user_id: str):
+        if self.on_session_end is not None:
+            self.on_session_end(user_id)
+
+    # ------------------------------------------------------------------
+    # 주기적 정리
+    # ------------------------------------------------------------------
+
+    def start_cleanup(
+        self,
+        interval: float = SESSION_CLEANUP_INTERVAL,
+        hours: int = SESSION_IDLE_HOURS,
+    ) -> asyncio.Task:
+        """유휴 세션을 주기적으로 정리하는 백그라운드 태스크를 시작한다."""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop(interval, hours))
+        return self._cleanup_task
+
+    async def stop_cleanup(self):
+        """주기적 정리 태스크를 중지한다."""
+        task, self._cleanup_task = self._cleanup_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _cleanup_loop(self, interval: float, hours: int):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                deleted = self.cleanup_old_sessions(hours=hours)
+                if deleted:
+                    logger.info("유휴 세션 %d개 정리", deleted)
+                if self.store is not None:
+                    self.store.compact(MAX_SESSION_MESSAGES)
+            except Exception:
+                logger.exception("세션 정리 실패")
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
     @property
     def active_count(self) -> int:
         """활성 세션 수"""
         return len(self._sessions)
 
+    def memory_stats(self) -> dict:
+        """세션 메모리 사용 지표"""
+        sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "max_sessions": self.max_sessions,
+            "messages": sum(len(s.messages) for s in sessions),
+            "max_messages_per_session": MAX_SESSION_MESSAGES,
+            "approx_bytes": sum(s.memory_usage() for s in sessions),
+            "evicted": self._evicted,
+            "expired": self._expired,
+            "store": self.store.stats() if self.store is not None else None,
+        }
+
 
 # 전역 인스턴스
 session_manager = SessionManager()
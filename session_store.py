@@ -0,0 +1,228 @@
+"""대화 세션 영속 저장소 모듈
+
+``SessionManager`` 에 연결해 재시작 후에도 유저별 대화 컨텍스트를 복원한다.
+쓰기는 전용 스레드가 큐에 쌓인 변경을 묶어서(batch) SQLite(WAL)에 기록하므로
+이벤트 루프를 막지 않는다. 세션 히스토리는 해당 유저가 처음 다시 메시지를
+보낼 때 최근 N개만 읽어 온다(lazy load).
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from session_manager import Message
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_activity REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_user ON messages (user_id, id);
+"""
+
+_STOP = object()
+
+
+@dataclass
+class StoredSession:
+    """저장소에서 읽어 온 세션"""
+
+    created_at: datetime
+    last_activity: datetime
+    messages: List[Message]
+
+
+class SQLiteSessionStore:
+    """SQLite(WAL) 기반 세션 저장소
+
+    Args:
+        path: 데이터베이스 파일 경로
+        batch_size: 한 트랜잭션에 묶어 기록할 최대 변경 수
+    """
+
+    def __init__(self, path: str, batch_size: int = 200):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending: Dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        # 유저별 남은 변경이 기록될 때마다 깨운다
+        self._settled = threading.Condition(self._pending_lock)
+        self._written = 0
+        self._batches = 0
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.close()
+        # load()는 asyncio.to_thread로 여러 스레드에서 호출될 수 있다
+        self._reader = self._connect(check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="session-store-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ------------------------------------------------------------------
+    # 쓰기 (큐에 넣고 즉시 반환)
+    # ------------------------------------------------------------------
+
+    def append(self, user_id: str, role: str, content: str, timestamp: Optional[float] = None):
+        """메시지 추가를 기록한다."""
+        self._enqueue(user_id, ("append", user_id, role, content, timestamp or time.time()))
+
+    def clear(self, user_id: str):
+        """유저의 메시지 히스토리를 지운다 (세션은 유지)."""
+        self._enqueue(user_id, ("clear", user_id))
+
+    def delete(self, user_id: str):
+        """유저 세션과 메시지를 삭제한다."""
+        self._enqueue(user_id, ("delete", user_id))
+
+    def compact(self, keep: int):
+        """유저별로 최근 keep개를 제외한 메시지를 삭제한다."""
+        self._queue.put(("compact", keep))
+
+    def _enqueue(self, user_id: str, op: tuple):
+        with self._pending_lock:
+            self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        self._queue.put(op)
+
+    def _writer_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(op is _STOP for op in batch)
+                ops = [op for op in batch if op is not _STOP]
+                try:
+                    with conn:
+                        for op in ops:
+                            self._apply(conn, op)
+                    self._written += len(ops)
+                    self._batches += 1
+                except Exception:
+                    logger.exception("세션 저장 실패 (%d건)", len(ops))
+                finally:
+                    self._settle(ops)
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, op: tuple):
+        kind = op[0]
+        if kind == "append":
+            _, user_id, role, content, ts = op
+            conn.execute(
+                "INSERT INTO sessions (user_id, created_at, last_activity) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET last_activity = excluded.last_activity",
+                (user_id, ts, ts),
+            )
+            conn.execute(
+                "INSERT INTO messages (user_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (user_id, role, content, ts),
+            )
+        elif kind == "clear":
+            conn.execute("DELETE FROM messages WHERE user_id = ?", (op[1],))
+        elif kind == "delete":
+            conn.execute("DELETE FROM messages WHERE user_id = ?", (op[1],))
+            conn.execute("DELETE FROM sessions WHERE user_id = ?", (op[1],))
+        elif kind == "compact":
+            conn.execute(
+                "DELETE FROM messages WHERE id IN ("
+                " SELECT id FROM (SELECT id, ROW_NUMBER() OVER ("
+                "  PARTITION BY user_id ORDER BY id DESC) AS rn FROM messages)"
+                " WHERE rn > ?)",
+                (op[1],),
+            )
+
+    def _settle(self, ops: List[tuple]):
+        with self._pending_lock:
+            for op in ops:
+                if op[0] == "compact":
+                    continue
+                user_id = op[1]
+                remaining = self._pending.get(user_id, 0) - 1
+                if remaining > 0:
+                    self._pending[user_id] = remaining
+                else:
+                    self._pending.pop(user_id, None)
+            self._settled.notify_all()
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+
+    def load(self, user_id: str, limit: int) -> Optional[StoredSession]:
+        """유저 세션과 최근 limit개 메시지를 읽는다. 없으면 None.
+
+        이 유저의 변경이 아직 기록되지 않았으면 그 변경이 기록될 때까지만 기다린다.
+        블로킹 호출이므로 이벤트 루프에서는 ``asyncio.to_thread`` 로 호출한다.
+        """
+        with self._settled:
+            self._settled.wait_for(lambda: user_id not in self._pending)
+        with self._reader_lock:
+            row = self._reader.execute(
+                "SELECT created_at, last_activity FROM sessions WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            rows: List[Tuple[str, str, float]] = self._reader.execute(
+                "SELECT role, content, created_at FROM messages"
+                " WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+        return StoredSession(
+            created_at=datetime.fromtimestamp(row[0]),
+            last_activity=datetime.fromtimestamp(row[1]),
+            messages=[Message(role, content, ts) for role, content, ts in reversed(rows)],
+        )
+
+    def flush(self):
+        """큐에 쌓인 변경이 모두 기록될 때까지 기다린다."""
+        self._queue.join()
+
+    def close(self):
+        """남은 변경을 기록하고 저장소를 닫는다."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._reader.close()
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "queued": self._queue.qsize(),
+            "written": self._written,
+            "batches": self._batches,
+        }
@@ -0,0 +1,146 @@
+"""adaptive_limiter 단위 테스트"""
+
+import time
+
+import pytest
+
+from adaptive_limiter import MIN_SAMPLES, AdaptiveLimiter
+
+
+def make_limiter(load=0.1, **kwargs):
+    changes = []
+    kwargs.setdefault("min_limit", 1)
+    kwargs.setdefault("max_limit", 10)
+    limiter = AdaptiveLimiter(
+        on_change=changes.append, load_fn=lambda: load, **kwargs
+    )
+    return limiter, changes
+
+
+def run_batch(limiter, latency, count=None):
+    """상한만큼 동시에 실행한 것처럼 응답 시간을 기록한다."""
+    count = count or limiter.limit
+    limiter._inflight = count
+    limiter._peak = max(limiter._peak, count)
+    for _ in range(count):
+        limiter._inflight -= 1
+        limiter.record(time.monotonic(), latency)
+
+
+class TestAdaptiveLimiter:
+    def test_invalid_range(self):
+        with pytest.raises(ValueError):
+            AdaptiveLimiter(initial=2, min_limit=3, max_limit=2)
+        with pytest.raises(ValueError):
+            AdaptiveLimiter(initial=2, min_limit=0, max_limit=2)
+
+    def test_initial_clamped(self):
+        limiter, _ = make_limiter(initial=20, max_limit=4)
+        assert limiter.limit == 4
+
+    def test_additive_increase_when_healthy(self):
+        """상한까지 사용 중이고 응답이 정상이면 상한만큼 실행마다 1씩 늘린다"""
+        limiter, changes = make_limiter(initial=2)
+        run_batch(limiter, 1.0)
+        assert limiter.limit == 3
+        run_batch(limiter, 1.0)
+        assert limiter.limit == 4
+        assert changes == [3, 4]
+
+    def test_no_increase_when_underused(self):
+        limiter, changes = make_limiter(initial=3)
+        for _ in range(10):
+            with limiter.measure():
+                pass
+        assert limiter.limit == 3
+        assert changes == []
+
+    def test_increase_capped_at_max(self):
+        limiter, _ = make_limiter(initial=2, max_limit=3)
+        for _ in range(5):
+            run_batch(limiter, 1.0)
+        assert limiter.limit == 3
+
+    def test_latency_spike_decreases(self):
+        limiter, changes = make_limiter(initial=8)
+        for _ in range(MIN_SAMPLES):
+            limiter.record(time.monotonic(), 1.0)
+        limiter.record(time.monotonic(), 10.0)
+        assert limiter.limit == 6
+        assert changes == [6]
+        assert limiter.stats()["decreases"] == 1
+
+    def test_single_slow_run_before_warmup_ignored(self):
+        limiter, _ = make_limiter(initial=4)
+        limiter.record(time.monotonic(), 1.0)
+        limiter.record(time.monotonic(), 10.0)
+        assert limiter.limit == 4
+
+    def test_high_load_decreases(self):
+        limiter, _ = make_limiter(load=2.5, initial=4)
+        limiter.record(time.monotonic(), 1.0)
+        assert limiter.limit == 3
+
+    def test_load_ignored_when_disabled(self):
+        limiter, _ = make_limiter(load=2.5, initial=4, load_per_cpu=0)
+        limiter.record(time.monotonic(), 1.0)
+        assert limiter.limit == 4
+
+    def test_runs_started_before_decrease_do_not_decrease_again(self):
+        """축소 전에 시작한 실행이 늦게 끝나도 한 번만 줄인다"""
+        limiter, _ = make_limiter(load=2.5, initial=8)
+        started = time.monotonic()
+        limiter.record(started, 1.0)
+        limiter.record(started, 1.0)
+        limiter.record(started, 1.0)
+        assert limiter.limit == 6
+        limiter.record(time.monotonic(), 1.0)
+        assert limiter.limit == 4
+
+    def test_never_below_min(self):
+        limiter, _ = make_limiter(load=2.5, initial=2, min_limit=2)
+        limiter.record(time.monotonic(), 1.0)
+        assert limiter.limit == 2
+
+    def test_measure_skips_cancelled(self):
+        limiter, _ = make_limiter(initial=2)
+        with pytest.raises(KeyboardInterrupt):
+            with limiter.measure():
+                assert limiter.inflight == 1
+                raise KeyboardInterrupt
+        assert limiter.inflight == 0
+        assert limiter.stats()["samples"] == 0
+
+    def test_failures_kept_out_of_latency_samples(self):
+        """빨리 끝난 실패가 평소 응답 시간을 끌어내리거나 상한을 늘리지 않는다"""
+        limiter, changes = make_limiter(initial=2)
+        for _ in range(MIN_SAMPLES):
+            limiter.record(time.monotonic(), 10.0)
+        for _ in range(20):
+            with limiter.measure() as measurement:
+                measurement.failed = True
+        stats = limiter.stats()
+        assert stats["samples"] == MIN_SAMPLES
+        assert stats["failures"] == 20
+        assert stats["latency_baseline"] == 10.0
+        assert stats["latency_recent"] == 10.0
+        assert stats["latency_failed"] is not None
+        # 실패 뒤 평소 수준의 정상 응답은 느려진 것으로 보지 않는다
+        limiter.record(time.monotonic(), 10.0)
+        assert limiter.stats()["decreases"] == 0
+        assert changes == []
+
+    def test_failure_under_high_load_decreases(self):
+        limiter, _ = make_limiter(load=2.5, initial=4)
+        limiter.record(time.monotonic(), 0.1, failed=True)
+        assert limiter.limit == 3
+        assert limiter.stats()["samples"] == 0
+
+    def test_stats(self):
+        limiter, _ = make_limiter(initial=3, min_limit=1, max_limit=8)
+        with limiter.measure():
+            pass
+        stats = limiter.stats()
+        assert (stats["limit"], stats["min"], stats["max"]) == (3, 1, 8)
+        assert stats["samples"] == 1
+        assert stats["load_per_cpu"] == 0.1
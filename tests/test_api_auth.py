@@ -4,6 +4,7 @@ import os
 
 os.environ.setdefault("DISCORD_TOKEN", "test-token")
 os.environ.setdefault("DISCORD_GUILD_ID", "123456789")
+os.environ.setdefault("CONSOLE_DEBOUNCE", "0")
 
 from unittest.mock import patch
 
@@ -56,3 +57,19 @@ class TestAPIKeyMiddleware:
             )
         assert response.status_code == 503
         assert "설정되지 않았습니다" in response.json()["error"]
+
+
+class TestStatsEndpoint:
+    def test_stats_returns_scheduler_metrics(self):
+        """/api/stats는 스케줄러 지표를 반환한다"""
+        with patch("server.API_KEY", "test-secret-key"):
+            client = TestClient(starlette_app, raise_server_exceptions=False)
+            response = client.get(
+                "/api/stats", headers={"X-API-Key": "test-secret-key"}
+            )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["scheduler"]["active"] == 0
+        assert "queued" in body["scheduler"]
+        assert body["concurrency"]["limit"] == body["scheduler"]["max_concurrency"]
+        assert body["concurrency"]["min"] <= body["concurrency"]["max"]
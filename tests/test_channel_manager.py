@@ -5,13 +5,24 @@ from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import discord
 
-from channel_manager import BOT_CONSOLE_CATEGORY, BOT_CONSOLE_PREFIX, ChannelManager
+from datetime import timedelta
+
+from channel_manager import (
+    ARCHIVE_CATEGORY,
+    BOT_CONSOLE_CATEGORY,
+    BOT_CONSOLE_PREFIX,
+    ChannelManager,
+    ConsoleRegistry,
+    member_tag,
+    parse_member_tag,
+)
 
 
 def make_mock_guild(categories=None):
     guild = MagicMock()
     guild.categories = categories or []
     guild.create_category = AsyncMock()
+    guild.get_channel = MagicMock(return_value=None)
     guild.me = MagicMock()
     guild.default_role = MagicMock()
     return guild
@@ -138,13 +149,446 @@ class TestGetUserConsole:
         assert result is None
 
 
+def make_tagged_channel(name, member_id):
+    ch = MagicMock()
+    ch.name = name
+    ch.topic = f"{name} {member_tag(member_id)}"
+    return ch
+
+
 class TestIsConsoleChannel:
     def test_true(self):
-        ch = MagicMock()
-        ch.name = "bot-console-alice"
-        assert ChannelManager.is_console_channel(ch) is True
+        ch = make_tagged_channel("bot-console-alice", 1)
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch])
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+        mgr.rebuild()
+        assert mgr.is_console_channel(ch) is True
+        assert mgr.console_owner(ch) == 1
 
     def test_false(self):
         ch = MagicMock()
         ch.name = "💬-자유톡"
-        assert ChannelManager.is_console_channel(ch) is False
+        mgr = ChannelManager(make_mock_guild())
+        mgr.rebuild()
+        assert mgr.is_console_channel(ch) is False
+
+    def test_name_alone_not_console(self):
+        """이름만 bot-console인 채널은 등록된 콘솔이 아니다"""
+        ch = MagicMock()
+        ch.name = "bot-console-alice"
+        assert ChannelManager(make_mock_guild()).is_console_channel(ch) is False
+
+
+class TestConsoleRegistry:
+    def test_bidirectional(self):
+        registry = ConsoleRegistry()
+        registry.register(10, 1)
+        assert 10 in registry
+        assert registry.owner_of(10) == 1
+        assert registry.console_of(1) == 10
+
+    def test_reregister_replaces(self):
+        """멤버의 새 콘솔을 등록하면 이전 채널 매핑은 지워진다"""
+        registry = ConsoleRegistry()
+        registry.register(10, 1)
+        registry.register(11, 1)
+        assert 10 not in registry
+        assert registry.console_of(1) == 11
+        assert len(registry) == 1
+
+    def test_unregister(self):
+        registry = ConsoleRegistry()
+        registry.register(10, 1)
+        assert registry.unregister_channel(10) == 1
+        assert registry.console_of(1) is None
+        assert registry.unregister_channel(10) is None
+
+    def test_parse_member_tag(self):
+        assert parse_member_tag(f"alice님의 AI 대화 채널 {member_tag(42)}") == 42
+        assert parse_member_tag("alice님의 AI 대화 채널") is None
+        assert parse_member_tag(None) is None
+
+
+class TestMemberIdLookup:
+    def test_created_console_tagged(self):
+        """새 콘솔 토픽에 멤버 태그를 남긴다"""
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+        member = make_mock_member("alice")
+        member.id = 42
+
+        asyncio.run(mgr.create_user_console(member))
+
+        topic = cat.create_text_channel.call_args.kwargs["topic"]
+        assert parse_member_tag(topic) == 42
+
+    def test_rebuild_survives_rename(self):
+        """재시작 후 태그로 복원해 이름이 바뀐 멤버의 콘솔도 찾는다"""
+        ch = make_tagged_channel("bot-console-alice", 42)
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch])
+        registry = ConsoleRegistry()
+        mgr = ChannelManager(make_mock_guild(categories=[cat]), registry=registry)
+        mgr.rebuild()
+        member = make_mock_member("alice-renamed")
+        member.id = 42
+
+        assert registry.owner_of(ch.id) == 42
+        assert asyncio.run(mgr.get_user_console(member)) is ch
+
+    def test_untagged_console_migrated(self):
+        """태그 없는 이전 콘솔은 이름으로 찾은 뒤 태그를 붙인다"""
+        ch = MagicMock()
+        ch.name = "bot-console-alice"
+        ch.topic = "alice님의 AI 대화 채널"
+        ch.edit = AsyncMock()
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch])
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+        member = make_mock_member("alice")
+        member.id = 42
+
+        assert asyncio.run(mgr.get_user_console(member)) is ch
+        assert parse_member_tag(ch.edit.call_args.kwargs["topic"]) == 42
+        assert mgr.is_console_channel(ch)
+
+    def test_rebuild_registers_untagged_console(self):
+        """rebuild는 태그 없는 이전 콘솔을 이름이 같은 멤버에게 등록하고 태그를 붙인다"""
+        ch = MagicMock()
+        ch.name = "bot-console-alice"
+        ch.topic = "alice님의 AI 대화 채널"
+        ch.edit = AsyncMock()
+        orphan = MagicMock()
+        orphan.name = "bot-console-left"
+        orphan.topic = None
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch, orphan])
+        guild = make_mock_guild(categories=[cat])
+        alice = make_mock_member("alice")
+        alice.id = 42
+        guild.members = [alice]
+        mgr = ChannelManager(guild)
+
+        mgr.rebuild()
+
+        assert mgr.registry.owner_of(ch.id) == 42
+        assert not mgr.is_console_channel(orphan)
+        assert mgr.console_count == 2
+
+        asyncio.run(mgr.tag_consoles())
+        assert parse_member_tag(ch.edit.call_args.kwargs["topic"]) == 42
+        asyncio.run(mgr.tag_consoles())
+        ch.edit.assert_called_once()
+
+    def test_forget_unregisters(self):
+        ch = make_tagged_channel("bot-console-alice", 42)
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch])
+        forgotten = []
+        mgr = ChannelManager(make_mock_guild(categories=[cat]), on_forget=forgotten.append)
+        mgr.rebuild()
+
+        mgr.forget_channel(ch)
+        mgr.forget_channel(ch)
+
+        assert not mgr.is_console_channel(ch)
+        assert mgr.registry.console_of(42) is None
+        assert forgotten == [42]
+
+    def test_forget_by_id_from_event_object(self):
+        """삭제 이벤트의 채널 객체가 생성 때 받은 객체와 달라도 등록을 지운다"""
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        cat.id = 1
+        created = MagicMock()
+        created.id = 7
+        created.category_id = 1
+        cat.create_text_channel = AsyncMock(return_value=created)
+        mgr = ChannelManager(make_mock_guild(categories=[cat]), capacity=1)
+        member = make_mock_member("alice")
+        member.id = 42
+
+        event_channel = MagicMock()
+        event_channel.id = 7
+        event_channel.category_id = 1
+
+        async def main():
+            await mgr.create_user_console(member)
+            mgr.forget_channel(event_channel)
+            return await mgr.get_user_console(member)
+
+        assert asyncio.run(main()) is None
+        assert mgr.registry.console_of(42) is None
+        assert mgr._load[1] == 0
+
+
+class TestConsoleCache:
+    def test_concurrent_creates_single_category(self):
+        """동시에 콘솔을 만들어도 카테고리는 한 번만 생성된다"""
+        guild = make_mock_guild()
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+
+        async def create_category(name):
+            await asyncio.sleep(0.01)
+            return cat
+
+        guild.create_category = AsyncMock(side_effect=create_category)
+        mgr = ChannelManager(guild)
+
+        async def main():
+            await asyncio.gather(
+                *(mgr.create_user_console(make_mock_member(f"u{i}")) for i in range(5))
+            )
+
+        asyncio.run(main())
+        guild.create_category.assert_called_once()
+        assert cat.create_text_channel.call_count == 5
+
+    def test_existing_consoles_indexed_once(self):
+        """기존 콘솔은 한 번 구축한 맵에서 찾는다"""
+        existing = MagicMock()
+        existing.name = f"{BOT_CONSOLE_PREFIX}alice"
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[existing])
+        guild = make_mock_guild(categories=[cat])
+        mgr = ChannelManager(guild)
+
+        alice = make_mock_member("alice")
+
+        async def main():
+            first = await mgr.create_user_console(alice)
+            cat.channels = []  # 맵 구축 이후에는 category.channels를 다시 보지 않는다
+            second = await mgr.get_user_console(alice)
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first is existing and second is existing
+        cat.create_text_channel.assert_not_called()
+
+    def test_created_console_cached(self):
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        new_ch = MagicMock()
+        cat.create_text_channel = AsyncMock(return_value=new_ch)
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+
+        bob = make_mock_member("bob")
+
+        async def main():
+            await mgr.create_user_console(bob)
+            return await mgr.get_user_console(bob)
+
+        assert asyncio.run(main()) is new_ch
+
+    def test_forget_channel(self):
+        existing = MagicMock()
+        existing.name = f"{BOT_CONSOLE_PREFIX}alice"
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[existing])
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+
+        async def main():
+            await mgr.get_user_console(make_mock_member("alice"))
+            mgr.forget_channel(existing)
+            return await mgr.get_user_console(make_mock_member("alice"))
+
+        assert asyncio.run(main()) is None
+
+
+class TestShardedCategories:
+    def test_overflow_creates_next_category(self):
+        """카테고리가 가득 차면 다음 번호 카테고리에 만든다"""
+        first = make_mock_category(BOT_CONSOLE_CATEGORY)
+        second = make_mock_category(f"{BOT_CONSOLE_CATEGORY} 2")
+        guild = make_mock_guild()
+        guild.create_category = AsyncMock(side_effect=[first, second])
+        mgr = ChannelManager(guild, capacity=2)
+
+        async def main():
+            for name in ("a", "b", "c"):
+                await mgr.create_user_console(make_mock_member(name))
+
+        asyncio.run(main())
+        assert [c.args[0] for c in guild.create_category.call_args_list] == [
+            BOT_CONSOLE_CATEGORY,
+            f"{BOT_CONSOLE_CATEGORY} 2",
+        ]
+        assert first.create_text_channel.call_count == 2
+        assert second.create_text_channel.call_count == 1
+
+    def test_existing_shards_discovered(self):
+        """기존 샤드 카테고리의 콘솔과 빈자리를 찾는다"""
+        full_ch = MagicMock()
+        full_ch.name = f"{BOT_CONSOLE_PREFIX}alice"
+        first = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[full_ch])
+        bob_ch = MagicMock()
+        bob_ch.name = f"{BOT_CONSOLE_PREFIX}bob"
+        second = make_mock_category(f"{BOT_CONSOLE_CATEGORY} 2", channels=[bob_ch])
+        guild = make_mock_guild(categories=[first, second])
+        mgr = ChannelManager(guild, capacity=1)
+
+        async def main():
+            found = await mgr.get_user_console(make_mock_member("bob"))
+            await mgr.create_user_console(make_mock_member("carol"))
+            return found
+
+        assert asyncio.run(main()) is bob_ch
+        guild.create_category.assert_called_once_with(f"{BOT_CONSOLE_CATEGORY} 3")
+
+    def test_member_id_cache(self):
+        """이름이 바뀌어도 멤버 ID로 같은 콘솔을 찾는다"""
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        new_ch = MagicMock()
+        cat.create_text_channel = AsyncMock(return_value=new_ch)
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+        member = make_mock_member("alice")
+        member.id = 42
+
+        async def main():
+            await mgr.create_user_console(member)
+            member.name = "alice2"
+            return await mgr.create_user_console(member)
+
+        assert asyncio.run(main()) is new_ch
+        cat.create_text_channel.assert_called_once()
+
+    def test_failed_create_releases_slot(self):
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        cat.create_text_channel = AsyncMock(side_effect=[Exception("오류"), MagicMock()])
+        guild = make_mock_guild(categories=[cat])
+        mgr = ChannelManager(guild, capacity=1)
+
+        async def main():
+            try:
+                await mgr.create_user_console(make_mock_member("a"))
+            except Exception:
+                pass
+            await mgr.create_user_console(make_mock_member("b"))
+
+        asyncio.run(main())
+        guild.create_category.assert_not_called()
+
+
+class TestArchiveIdleConsoles:
+    def _channel(self, name, idle_hours):
+        ch = MagicMock()
+        ch.name = name
+        ch.last_message_id = discord.utils.time_snowflake(
+            discord.utils.utcnow() - timedelta(hours=idle_hours)
+        )
+        ch.delete = AsyncMock()
+        ch.edit = AsyncMock()
+        ch.send = AsyncMock()
+        ch.overwrites = {}
+        return ch
+
+    def test_archives_only_idle(self):
+        """유휴 콘솔은 지우지 않고 보관 카테고리로 옮겨 읽기 전용으로 바꾼다"""
+        idle = self._channel(f"{BOT_CONSOLE_PREFIX}alice", 100)
+        owner = MagicMock(spec=discord.Member)
+        owner.id = 42
+        everyone = MagicMock(spec=discord.Role)
+        idle.overwrites = {
+            everyone: discord.PermissionOverwrite(read_messages=False),
+            owner: discord.PermissionOverwrite(read_messages=True, send_messages=True),
+        }
+        active = self._channel(f"{BOT_CONSOLE_PREFIX}bob", 1)
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[idle, active])
+        guild = make_mock_guild(categories=[cat])
+        archive = make_mock_category(ARCHIVE_CATEGORY)
+        guild.create_category = AsyncMock(return_value=archive)
+        mgr = ChannelManager(guild)
+
+        archived = asyncio.run(mgr.archive_idle_consoles(72))
+
+        assert archived == 1
+        idle.delete.assert_not_called()
+        active.edit.assert_not_called()
+        guild.create_category.assert_called_once_with(ARCHIVE_CATEGORY)
+        kwargs = idle.edit.call_args.kwargs
+        assert kwargs["category"] is archive
+        assert kwargs["overwrites"][owner].send_messages is False
+        assert kwargs["overwrites"][owner].read_messages is True
+        assert kwargs["overwrites"][everyone].read_messages is False
+        assert mgr.console_count == 1
+
+    def test_delete_opt_in(self):
+        idle = self._channel(f"{BOT_CONSOLE_PREFIX}alice", 100)
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[idle])
+        guild = make_mock_guild(categories=[cat])
+        mgr = ChannelManager(guild)
+
+        assert asyncio.run(mgr.archive_idle_consoles(72, delete=True)) == 1
+        idle.delete.assert_called_once()
+        idle.edit.assert_not_called()
+        guild.create_category.assert_not_called()
+
+    def test_reopen_restores_archived_console(self):
+        """보관된 콘솔은 다시 열면 같은 채널을 되돌리고 전송 권한을 돌려준다"""
+        idle = make_tagged_channel(f"{BOT_CONSOLE_PREFIX}alice", 42)
+        idle.last_message_id = discord.utils.time_snowflake(
+            discord.utils.utcnow() - timedelta(hours=100)
+        )
+        idle.category_id = 1
+        idle.edit = AsyncMock()
+        idle.send = AsyncMock()
+        owner = MagicMock(spec=discord.Member)
+        owner.id = 42
+        idle.overwrites = {owner: discord.PermissionOverwrite(send_messages=True)}
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[idle])
+        cat.id = 1
+        archive = make_mock_category(ARCHIVE_CATEGORY)
+        archive.id = 2
+        guild = make_mock_guild(categories=[cat])
+        guild.create_category = AsyncMock(return_value=archive)
+        mgr = ChannelManager(guild)
+        member = make_mock_member("alice")
+        member.id = 42
+
+        async def main():
+            await mgr.archive_idle_consoles(72)
+            assert not mgr.is_console_channel(idle)
+            idle.category_id = 2
+            return await mgr.create_user_console(member)
+
+        assert asyncio.run(main()) is idle
+        assert idle.edit.call_args.kwargs["category"] is cat
+        assert idle.edit.call_args.kwargs["overwrites"][owner].send_messages is True
+        idle.send.assert_called_once()
+        cat.create_text_channel.assert_not_called()
+        assert mgr.is_console_channel(idle)
+        assert mgr._load[1] == 1 and mgr._archive_load[1] == 0
+
+    def test_no_messages_uses_created_at(self):
+        ch = MagicMock()
+        ch.name = f"{BOT_CONSOLE_PREFIX}alice"
+        ch.last_message_id = None
+        ch.created_at = discord.utils.utcnow() - timedelta(hours=1)
+        ch.delete = AsyncMock()
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY, channels=[ch])
+        mgr = ChannelManager(make_mock_guild(categories=[cat]))
+
+        assert asyncio.run(mgr.archive_idle_consoles(72)) == 0
+        ch.delete.assert_not_called()
+
+    def test_uses_live_channel_from_guild_cache(self):
+        """생성 때 받은 객체 대신 guild 캐시의 최신 객체로 활동 시각을 본다"""
+        cat = make_mock_category(BOT_CONSOLE_CATEGORY)
+        created = MagicMock()
+        created.id = 7
+        created.last_message_id = None
+        created.created_at = discord.utils.utcnow() - timedelta(hours=100)
+        created.delete = AsyncMock()
+        cat.create_text_channel = AsyncMock(return_value=created)
+        guild = make_mock_guild(categories=[cat])
+        mgr = ChannelManager(guild)
+        member = make_mock_member("alice")
+        member.id = 42
+
+        # CHANNEL_CREATE 이후 캐시에는 다른 객체가 있고 메시지도 그쪽에만 반영된다
+        cached = self._channel(f"{BOT_CONSOLE_PREFIX}alice", 1)
+        cached.id = 7
+        guild.get_channel = MagicMock(side_effect=lambda cid: cached if cid == 7 else None)
+
+        async def main():
+            await mgr.create_user_console(member)
+            archived = await mgr.archive_idle_consoles(72)
+            return archived, await mgr.get_user_console(member)
+
+        archived, console = asyncio.run(main())
+        assert archived == 0
+        created.delete.assert_not_called()
+        cached.delete.assert_not_called()
+        assert console is cached
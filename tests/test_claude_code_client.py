@@ -1,18 +1,66 @@
 """claude_code_client 단위 테스트"""
 
 import asyncio
+import json
 import os
+import signal
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from claude_code_client import (
     ClaudeCodeClient,
     ClaudeResponse,
     DEFAULT_TIMEOUT,
     ALLOWED_TOOLS,
     MCP_CONFIG_PATH,
+    MEMFD_SUPPORTED,
+    PRLIMIT_SUPPORTED,
+    STDERR_LIMIT,
+    TRUNCATED_MARKER,
+    StreamTextExtractor,
+    apply_limits,
+    kill_process_tree,
+    open_context,
+    read_capped,
 )
 
 
+@pytest.fixture(autouse=True)
+def _no_real_prlimit(request):
+    """mock 프로세스의 가짜 pid에 실제 prlimit을 걸지 않도록 막는다"""
+    with patch("claude_code_client.apply_limits") as mock_limits:
+        yield mock_limits
+
+
+class FakeStream:
+    """read(n)만 지원하는 StreamReader 대용"""
+
+    def __init__(self, data=b"", hang=False):
+        self._data = data
+        self._hang = hang
+
+    async def read(self, n=-1):
+        if not self._data:
+            if self._hang:
+                await asyncio.Event().wait()
+            return b""
+        chunk, self._data = self._data[:n], self._data[n:]
+        return chunk
+
+
+def make_process(stdout=b"", stderr=b"", returncode=0, hang=False):
+    """stdout/stderr 출력을 흉내 내는 mock 프로세스"""
+    process = MagicMock()
+    process.pid = 4321
+    process.stdout = FakeStream(stdout, hang=hang)
+    process.stderr = FakeStream(stderr)
+    process.wait = AsyncMock(return_value=returncode)
+    process.returncode = returncode
+    return process
+
+
 class TestClaudeCodeClient:
     def _run(self, coro):
         return asyncio.run(coro)
@@ -20,9 +68,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_send_message_success(self, mock_exec):
         """정상 응답을 반환한다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"Hello from Claude", b"")
-        process.returncode = 0
+        process = make_process(b"Hello from Claude")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -35,9 +81,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_cmd_includes_model_flag(self, mock_exec):
         """--model 플래그가 포함된다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -51,9 +95,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_cmd_includes_mcp_config(self, mock_exec):
         """--mcp-config과 --strict-mcp-config 플래그가 포함된다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -67,10 +109,8 @@ class TestClaudeCodeClient:
 
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_allowed_tools_comma_separated(self, mock_exec):
-        """--allowedTools가 쉼표로 구분된 8개 도구를 포함한다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        """--allowedTools가 쉼표로 구분된 9개 도구를 포함한다"""
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -81,14 +121,12 @@ class TestClaudeCodeClient:
         idx = cmd.index("--allowedTools")
         tools_arg = cmd[idx + 1]
         assert tools_arg == ",".join(ALLOWED_TOOLS)
-        assert len(tools_arg.split(",")) == 8
+        assert len(tools_arg.split(",")) == 10
 
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_user_message_is_last_arg(self, mock_exec):
         """user_message가 cmd의 맨 마지막 인자이다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -100,9 +138,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_context_messages_adds_system_prompt_file(self, mock_exec):
         """context_messages가 있으면 --append-system-prompt-file을 추가한다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -120,9 +156,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_no_context_no_system_prompt_file(self, mock_exec):
         """context_messages가 없으면 --append-system-prompt-file을 추가하지 않는다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -131,12 +165,11 @@ class TestClaudeCodeClient:
         cmd = mock_exec.call_args.args
         assert "--append-system-prompt-file" not in cmd
 
+    @patch("claude_code_client.MEMFD_SUPPORTED", False)
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_tempfile_cleaned_up_after_success(self, mock_exec):
-        """성공 시 tempfile이 삭제된다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        """memfd 미지원 환경에서는 tempfile을 쓰고 성공 시 삭제한다"""
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -148,12 +181,11 @@ class TestClaudeCodeClient:
         temp_path = cmd[idx + 1]
         assert not os.path.exists(temp_path)
 
+    @patch("claude_code_client.MEMFD_SUPPORTED", False)
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_tempfile_cleaned_up_after_error(self, mock_exec):
         """에러 시에도 tempfile이 삭제된다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"", b"error")
-        process.returncode = 1
+        process = make_process(b"", b"error", returncode=1)
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -165,12 +197,55 @@ class TestClaudeCodeClient:
         temp_path = cmd[idx + 1]
         assert not os.path.exists(temp_path)
 
+    @pytest.mark.skipif(not MEMFD_SUPPORTED, reason="memfd 미지원 플랫폼")
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_context_via_memfd(self, mock_exec):
+        """memfd로 컨텍스트를 전달하고 fd를 자식 프로세스에 상속시킨다"""
+        seen = {}
+
+        async def fake_exec(*cmd, **kwargs):
+            path = cmd[cmd.index("--append-system-prompt-file") + 1]
+            seen["path"] = path
+            seen["pass_fds"] = kwargs.get("pass_fds")
+            with open(path) as f:
+                seen["content"] = f.read()
+            process = make_process(b"response")
+            return process
+
+        mock_exec.side_effect = fake_exec
+
+        client = ClaudeCodeClient()
+        context = [{"role": "user", "content": "이전 질문"}]
+        with patch("claude_code_client.tempfile.NamedTemporaryFile") as mock_tmp:
+            self._run(client.send_message("질문", context_messages=context))
+            mock_tmp.assert_not_called()
+
+        fd = int(seen["path"].rsplit("/", 1)[1])
+        assert seen["path"].startswith("/dev/fd/")
+        assert seen["pass_fds"] == (fd,)
+        assert seen["content"] == "이전 대화 컨텍스트:\nuser: 이전 질문"
+        # 실행 후 fd는 닫힌다
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+    @pytest.mark.skipif(not MEMFD_SUPPORTED, reason="memfd 미지원 플랫폼")
+    def test_memfd_readable_by_child_process(self):
+        """실제 자식 프로세스가 /dev/fd 경로로 컨텍스트를 읽을 수 있다"""
+        import subprocess
+
+        handle = open_context("컨텍스트 내용")
+        try:
+            out = subprocess.run(
+                ["cat", handle.path], pass_fds=handle.pass_fds, capture_output=True, check=True
+            ).stdout
+        finally:
+            handle.close()
+        assert out.decode() == "컨텍스트 내용"
+
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_custom_model(self, mock_exec):
         """커스텀 모델을 설정할 수 있다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"response", b"")
-        process.returncode = 0
+        process = make_process(b"response")
         mock_exec.return_value = process
 
         client = ClaudeCodeClient(model="opus")
@@ -183,9 +258,7 @@ class TestClaudeCodeClient:
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_nonzero_exit_code(self, mock_exec):
         """CLI가 비정상 종료하면 에러를 반환한다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"", b"error occurred")
-        process.returncode = 1
+        process = make_process(b"", b"error occurred", returncode=1)
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -194,12 +267,23 @@ class TestClaudeCodeClient:
         assert result.success is False
         assert "error occurred" in result.error
 
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_truncated_multibyte_stderr(self, mock_exec):
+        """STDERR_LIMIT에서 글자 중간이 잘려도 오류 응답으로 돌려준다"""
+        stderr = "오류".encode() * (STDERR_LIMIT // 5)
+        assert len(stderr) > STDERR_LIMIT and STDERR_LIMIT % 3
+        mock_exec.return_value = make_process(b"", stderr, returncode=1)
+
+        client = ClaudeCodeClient()
+        result = self._run(client.send_message("테스트"))
+
+        assert result.success is False
+        assert "오류오류" in result.error
+
     @patch("claude_code_client.asyncio.create_subprocess_exec")
     def test_nonzero_exit_no_stderr(self, mock_exec):
         """stderr 없이 비정상 종료하면 알 수 없는 오류를 반환한다"""
-        process = AsyncMock()
-        process.communicate.return_value = (b"", b"")
-        process.returncode = 1
+        process = make_process(returncode=1)
         mock_exec.return_value = process
 
         client = ClaudeCodeClient()
@@ -208,13 +292,12 @@ class TestClaudeCodeClient:
         assert result.success is False
         assert "알 수 없는 오류" in result.error
 
+    @patch("claude_code_client.os.killpg")
     @patch("claude_code_client.asyncio.wait_for", side_effect=asyncio.TimeoutError)
     @patch("claude_code_client.asyncio.create_subprocess_exec")
-    def test_timeout(self, mock_exec, mock_wait_for):
-        """타임아웃 시 에러를 반환한다"""
-        process = AsyncMock()
-        process.kill = MagicMock()
-        process.communicate = AsyncMock(return_value=(b"", b""))
+    def test_timeout(self, mock_exec, mock_wait_for, mock_killpg):
+        """타임아웃 시 CLI 프로세스 그룹을 종료하고 에러를 반환한다"""
+        process = make_process()
         mock_exec.return_value = process
 
         client = ClaudeCodeClient(timeout=5)
@@ -222,7 +305,26 @@ class TestClaudeCodeClient:
 
         assert result.success is False
         assert "시간 초과" in result.error
-        process.kill.assert_called_once()
+        mock_killpg.assert_called_once_with(4321, signal.SIGKILL)
+        process.wait.assert_awaited()
+
+    @patch("claude_code_client.os.killpg")
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_cancel_kills_process(self, mock_exec, mock_killpg):
+        """요청이 취소되면 CLI 프로세스 그룹을 종료한다"""
+        process = make_process(hang=True)
+        mock_exec.return_value = process
+
+        async def main():
+            task = asyncio.create_task(ClaudeCodeClient().send_message("테스트"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        self._run(main())
+        mock_killpg.assert_called_once_with(4321, signal.SIGKILL)
+        process.wait.assert_awaited()
 
     @patch(
         "claude_code_client.asyncio.create_subprocess_exec",
@@ -262,12 +364,331 @@ class TestClaudeCodeClient:
         resp_err = ClaudeResponse(text="", success=False, error="오류")
         assert resp_err.error == "오류"
 
-    def test_allowed_tools_has_8_entries(self):
-        """ALLOWED_TOOLS에 8개 도구가 정의되어 있다"""
-        assert len(ALLOWED_TOOLS) == 8
+    def test_allowed_tools_has_10_entries(self):
+        """ALLOWED_TOOLS에 10개 도구가 정의되어 있다"""
+        assert len(ALLOWED_TOOLS) == 10
         assert all(t.startswith("mcp__project-bot__") for t in ALLOWED_TOOLS)
 
     def test_mcp_config_path_is_absolute(self):
         """MCP_CONFIG_PATH가 절대 경로이다"""
         assert os.path.isabs(MCP_CONFIG_PATH)
         assert MCP_CONFIG_PATH.endswith("mcp-config.json")
+
+
+
+def make_json_process(result, session_id="sess-1", is_error=False, returncode=0):
+    """--output-format json 결과를 흉내 내는 mock 프로세스"""
+    output = {"type": "result", "is_error": is_error, "result": result, "session_id": session_id}
+    return make_process(json.dumps(output).encode(), returncode=returncode)
+
+
+class TestResume:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_json_result_session_id(self, mock_exec):
+        """JSON 결과에서 응답 텍스트와 CLI 대화 ID를 꺼낸다"""
+        mock_exec.return_value = make_json_process("안녕하세요", session_id="abc")
+
+        result = self._run(ClaudeCodeClient().send_message("안녕"))
+
+        assert result.success is True
+        assert result.text == "안녕하세요"
+        assert result.session_id == "abc"
+        cmd = mock_exec.call_args.args
+        assert cmd[cmd.index("--output-format") + 1] == "json"
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_json_error_result(self, mock_exec):
+        mock_exec.return_value = make_json_process("max turns", is_error=True)
+
+        result = self._run(ClaudeCodeClient().send_message("안녕"))
+
+        assert result.success is False
+        assert "max turns" in result.error
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_resume_skips_context(self, mock_exec):
+        """resume_id가 있으면 --resume만 넘기고 컨텍스트는 보내지 않는다"""
+        mock_exec.return_value = make_json_process("응답", session_id="abc")
+
+        result = self._run(ClaudeCodeClient().send_message(
+            "새 질문",
+            context_messages=[{"role": "user", "content": "이전 질문"}],
+            resume_id="abc",
+        ))
+
+        mock_exec.assert_called_once()
+        cmd = mock_exec.call_args.args
+        assert cmd[cmd.index("--resume") + 1] == "abc"
+        assert "--append-system-prompt-file" not in cmd
+        assert cmd[-1] == "새 질문"
+        assert result.session_id == "abc"
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_resume_failure_replays_context(self, mock_exec):
+        """대화를 이어가지 못하면 컨텍스트를 넘겨 새 대화로 다시 실행한다"""
+        missing = make_process(b"", b"No conversation found", returncode=1)
+        mock_exec.side_effect = [missing, make_json_process("응답", session_id="new")]
+
+        result = self._run(ClaudeCodeClient().send_message(
+            "새 질문",
+            context_messages=[{"role": "user", "content": "이전 질문"}],
+            resume_id="old",
+        ))
+
+        assert mock_exec.call_count == 2
+        retry_cmd = mock_exec.call_args_list[1].args
+        assert "--resume" not in retry_cmd
+        assert "--append-system-prompt-file" in retry_cmd
+        assert result.success is True
+        assert result.session_id == "new"
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_stream_session_id(self, mock_exec):
+        """stream-json의 system/result 이벤트에서 CLI 대화 ID를 꺼낸다"""
+        mock_exec.return_value = make_stream_process([
+            {"type": "system", "subtype": "init", "session_id": "abc"},
+            delta("Hi"),
+            {"type": "result", "is_error": False, "result": "Hi", "session_id": "abc"},
+        ])
+
+        async def on_text(text):
+            pass
+
+        result = self._run(ClaudeCodeClient().send_message("안녕", on_text=on_text))
+        assert result.session_id == "abc"
+
+
+def make_stream_process(lines, stderr=b"", returncode=0):
+    """stream-json stdout을 흉내 내는 mock 프로세스"""
+    process = MagicMock()
+
+    async def stdout_iter():
+        for line in lines:
+            yield (json.dumps(line) + "\n").encode()
+
+    process.pid = 4321
+    process.stdout = stdout_iter()
+    process.stderr = FakeStream(stderr)
+    process.wait = AsyncMock(return_value=returncode)
+    process.returncode = returncode
+    return process
+
+
+def delta(text):
+    return {
+        "type": "stream_event",
+        "event": {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}},
+    }
+
+
+MESSAGE_START = {"type": "stream_event", "event": {"type": "message_start"}}
+
+
+class TestStreamTextExtractor:
+    def test_text_delta(self):
+        extractor = StreamTextExtractor()
+        assert extractor.feed(MESSAGE_START) == ""
+        assert extractor.feed(delta("안녕")) == "안녕"
+
+    def test_separates_messages(self):
+        extractor = StreamTextExtractor()
+        extractor.feed(MESSAGE_START)
+        extractor.feed(delta("도구 호출 전"))
+        extractor.feed(MESSAGE_START)
+        assert extractor.feed(delta("완료")) == "\n\n완료"
+
+    def test_assistant_fallback(self):
+        extractor = StreamTextExtractor()
+        event = {
+            "type": "assistant",
+            "message": {"content": [{"type": "text", "text": "전체"}, {"type": "tool_use"}]},
+        }
+        assert extractor.feed(event) == "전체"
+
+    def test_assistant_ignored_after_delta(self):
+        extractor = StreamTextExtractor()
+        extractor.feed(delta("부분"))
+        event = {"type": "assistant", "message": {"content": [{"type": "text", "text": "부분"}]}}
+        assert extractor.feed(event) == ""
+
+
+class TestStreaming:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_on_text_receives_chunks(self, mock_exec):
+        """on_text를 지정하면 stream-json 조각이 순서대로 전달된다"""
+        mock_exec.return_value = make_stream_process([
+            MESSAGE_START,
+            delta("Hello "),
+            delta("world"),
+            {"type": "result", "is_error": False, "result": "Hello world"},
+        ])
+        chunks = []
+
+        async def on_text(text):
+            chunks.append(text)
+
+        client = ClaudeCodeClient()
+        result = self._run(client.send_message("테스트", on_text=on_text))
+
+        assert chunks == ["Hello ", "world"]
+        assert result.success is True
+        assert result.text == "Hello world"
+        cmd = mock_exec.call_args.args
+        assert "stream-json" in cmd
+        assert cmd[-1] == "테스트"
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_result_error(self, mock_exec):
+        """result 이벤트가 오류면 실패를 반환한다"""
+        mock_exec.return_value = make_stream_process([
+            {"type": "result", "is_error": True, "result": "max turns"},
+        ])
+
+        async def on_text(text):
+            pass
+
+        client = ClaudeCodeClient()
+        result = self._run(client.send_message("테스트", on_text=on_text))
+        assert result.success is False
+        assert "max turns" in result.error
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_no_stream_flags_without_on_text(self, mock_exec):
+        """on_text가 없으면 stream-json 대신 JSON 결과 모드로 실행한다"""
+        process = make_process(b"response")
+        mock_exec.return_value = process
+
+        client = ClaudeCodeClient()
+        self._run(client.send_message("테스트"))
+        assert "stream-json" not in mock_exec.call_args.args
+
+
+class TestProcessLimits:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def test_read_capped(self):
+        overflows = []
+
+        async def main():
+            return await read_capped(
+                FakeStream(b"x" * 200_000), 100_000, lambda: overflows.append(1)
+            )
+
+        data, truncated = self._run(main())
+        assert len(data) == 100_000
+        assert truncated is True
+        assert overflows == [1]
+
+    def test_read_capped_within_limit(self):
+        data, truncated = self._run(read_capped(FakeStream(b"hello"), 10))
+        assert (data, truncated) == (b"hello", False)
+
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_runs_in_own_session(self, mock_exec, _no_real_prlimit):
+        """CLI는 자기 프로세스 그룹에서 실행되고 spawn 직후 자원 제한이 적용된다"""
+        mock_exec.return_value = make_process(b"response")
+
+        self._run(ClaudeCodeClient(cpu_limit=60, memory_limit_mb=512).send_message("테스트"))
+
+        kwargs = mock_exec.call_args.kwargs
+        assert kwargs["start_new_session"] is True
+        # 스레드와 함께 쓰면 교착될 수 있는 preexec_fn은 쓰지 않는다
+        assert "preexec_fn" not in kwargs
+        _no_real_prlimit.assert_called_once_with(4321, 60, 512)
+
+    def test_apply_limits_noop_without_limits(self):
+        assert apply_limits(os.getpid(), 0, 0) is False
+
+    @patch("claude_code_client.os.killpg")
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_text_output_truncated(self, mock_exec, mock_killpg):
+        """출력이 상한을 넘으면 CLI를 종료하고 잘린 응답에 표시를 붙인다"""
+        mock_exec.return_value = make_process(b"a" * 5000, returncode=-9)
+
+        result = self._run(ClaudeCodeClient(max_output_bytes=1000).send_message("테스트"))
+
+        assert result.success is True
+        assert result.text == "a" * 1000 + TRUNCATED_MARKER
+        mock_killpg.assert_called_once_with(4321, signal.SIGKILL)
+
+    @patch("claude_code_client.os.killpg")
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_json_output_truncated_is_error(self, mock_exec, mock_killpg):
+        output = json.dumps({"type": "result", "result": "a" * 5000}).encode()
+        mock_exec.return_value = make_process(output, returncode=-9)
+
+        result = self._run(ClaudeCodeClient(max_output_bytes=1000).send_message("테스트"))
+
+        assert result.success is False
+        assert "최대 크기" in result.error
+
+    @patch("claude_code_client.os.killpg")
+    @patch("claude_code_client.asyncio.create_subprocess_exec")
+    def test_stream_truncated(self, mock_exec, mock_killpg):
+        """스트리밍 텍스트가 상한을 넘으면 더 전달하지 않고 CLI를 종료한다"""
+        mock_exec.return_value = make_stream_process(
+            [MESSAGE_START] + [delta("가나다라마") for _ in range(10)], returncode=-9
+        )
+        chunks = []
+
+        async def on_text(text):
+            chunks.append(text)
+
+        client = ClaudeCodeClient(max_output_bytes=36)  # 한글 12자
+        result = self._run(client.send_message("테스트", on_text=on_text))
+
+        assert "".join(chunks) == "가나다라마" * 2 + "가나"
+        assert result.success is True
+        assert result.text == "가나다라마" * 2 + "가나" + TRUNCATED_MARKER
+        mock_killpg.assert_called_once_with(4321, signal.SIGKILL)
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc 미지원 플랫폼")
+    def test_kill_process_tree_kills_grandchildren(self):
+        """CLI가 띄운 자식 프로세스까지 함께 종료된다"""
+        async def main():
+            process = await asyncio.create_subprocess_exec(
+                "sh", "-c", "sleep 30 & echo $!; wait",
+                stdout=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+            grandchild = int(await process.stdout.readline())
+            kill_process_tree(process)
+            await process.wait()
+            return grandchild
+
+        grandchild = self._run(main())
+        for _ in range(50):
+            try:
+                with open(f"/proc/{grandchild}/stat") as f:
+                    state = f.read().rsplit(")", 1)[1].split()[0]
+            except FileNotFoundError:
+                break
+            if state == "Z":  # 종료됐지만 아직 회수되지 않음
+                break
+            time.sleep(0.02)
+        else:
+            pytest.fail("자식 프로세스가 종료되지 않았습니다")
+
+    @pytest.mark.skipif(not PRLIMIT_SUPPORTED, reason="prlimit 미지원 플랫폼")
+    def test_apply_limits_to_running_process(self):
+        import resource
+        import subprocess
+
+        process = subprocess.Popen(["sleep", "30"])
+        try:
+            assert apply_limits(process.pid, 123, 4096) is True
+            cpu = resource.prlimit(process.pid, resource.RLIMIT_CPU)
+            memory = resource.prlimit(process.pid, resource.RLIMIT_AS)
+        finally:
+            process.kill()
+            process.wait()
+        assert cpu == (123, 123)
+        assert memory == (4096 * 1024 * 1024,) * 2
+
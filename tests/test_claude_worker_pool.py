@@ -0,0 +1,341 @@
+"""claude_worker_pool 단위 테스트
+
+stream-json 프로토콜을 흉내 내는 가짜 CLI 프로세스로 워커 풀을 검증한다.
+"""
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+from claude_code_client import TRUNCATED_MARKER, ClaudeCodeClient
+from claude_worker_pool import (
+    WORKER_FLAGS,
+    ClaudeWorker,
+    ClaudeWorkerPool,
+    build_worker_command,
+)
+
+FAKE_CLI = r"""
+import json, os, sys, time
+turn = 0
+for line in sys.stdin:
+    text = json.loads(line)["message"]["content"][0]["text"]
+    turn += 1
+    if "crash" in text:
+        print("fatal", file=sys.stderr, flush=True)
+        sys.exit(1)
+    if "hang" in text:
+        time.sleep(30)
+    if "flood" in text:
+        delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "x" * 100}}
+        for _ in range(1000):
+            print(json.dumps({"type": "stream_event", "event": delta}), flush=True)
+    if "big" in text:
+        text = "y" * 5000
+    print(json.dumps({"type": "system", "subtype": "init"}), flush=True)
+    print(json.dumps({"type": "result", "is_error": "fail" in text,
+                      "result": f"{os.getpid()}:{turn}:{text}",
+                      "session_id": "sess-1"}), flush=True)
+"""
+
+FAKE_COMMAND = [sys.executable, "-c", FAKE_CLI]
+
+
+def parse(text):
+    pid, turn, body = text.split(":", 2)
+    return int(pid), int(turn), body
+
+
+class TestBuildWorkerCommand:
+    def test_stream_json_flags(self):
+        cmd = build_worker_command("sonnet")
+        for flag in WORKER_FLAGS:
+            assert flag in cmd
+        assert cmd[:2] == ["claude", "-p"]
+
+
+class TestClaudeWorker:
+    def test_request_keeps_process(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            r1 = await worker.request("하나", None, timeout=5)
+            r2 = await worker.request("둘", None, timeout=5)
+            await worker.close()
+            return worker, r1, r2
+
+        worker, r1, r2 = asyncio.run(main())
+        assert r1.success and r2.success
+        pid1, turn1, _ = parse(r1.text)
+        pid2, turn2, body = parse(r2.text)
+        assert pid1 == pid2
+        assert (turn1, turn2) == (1, 2)
+        assert body == "둘"
+        assert worker.session_id == "sess-1"
+
+    def test_context_only_on_first_request(self):
+        context = [{"role": "user", "content": "이전 질문"}]
+
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            r1 = await worker.request("하나", context, timeout=5)
+            r2 = await worker.request("둘", context, timeout=5)
+            await worker.close()
+            return r1, r2
+
+        r1, r2 = asyncio.run(main())
+        assert "이전 질문" in r1.text
+        assert "이전 질문" not in r2.text
+
+    def test_error_result(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            r = await worker.request("fail", None, timeout=5)
+            await worker.close()
+            return r
+
+        r = asyncio.run(main())
+        assert r.success is False
+        assert "Claude Code 오류" in r.error
+
+    def test_crash(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            r = await worker.request("crash", None, timeout=5)
+            await worker.close()
+            return worker, r
+
+        worker, r = asyncio.run(main())
+        assert r.success is False
+        assert "비정상 종료" in r.error
+        assert not worker.alive
+
+    def test_timeout_kills_worker(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            r = await worker.request("hang", None, timeout=0.5)
+            await worker.close()
+            return worker, r
+
+        worker, r = asyncio.run(main())
+        assert "시간 초과" in r.error
+        assert not worker.alive
+
+    def test_cancel_kills_worker(self):
+        """턴 중간에 취소되면 워커를 종료한다"""
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND)
+            await worker.start()
+            task = asyncio.create_task(worker.request("hang", None, timeout=5))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return worker
+
+        worker = asyncio.run(main())
+        assert not worker.alive
+
+    def test_runaway_output_kills_worker(self):
+        """스트리밍 텍스트가 상한을 넘으면 워커를 종료하고 잘린 응답을 반환한다"""
+        chunks = []
+
+        async def on_text(text):
+            chunks.append(text)
+
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND, max_output_bytes=250)
+            await worker.start()
+            r = await worker.request("flood", None, timeout=5, on_text=on_text)
+            await worker.close()
+            return worker, r
+
+        worker, r = asyncio.run(main())
+        assert "".join(chunks) == "x" * 250
+        assert r.success is True
+        assert r.text == "x" * 250 + TRUNCATED_MARKER
+        assert not worker.alive
+
+    def test_memory_limit_applied(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND, memory_limit_mb=2048)
+            with patch("claude_worker_pool.apply_limits") as mock_limits:
+                await worker.start()
+            await worker.close()
+            return worker, mock_limits
+
+        worker, mock_limits = asyncio.run(main())
+        mock_limits.assert_called_once_with(worker.process.pid, 0, 2048)
+
+    def test_large_result_truncated(self):
+        async def main():
+            worker = ClaudeWorker(FAKE_COMMAND, max_output_bytes=1000)
+            await worker.start()
+            r = await worker.request("big", None, timeout=5)
+            alive = worker.alive
+            await worker.close()
+            return alive, r
+
+        alive, r = asyncio.run(main())
+        assert r.text.endswith(TRUNCATED_MARKER)
+        assert len(r.text) == 1000 + len(TRUNCATED_MARKER)
+        assert alive  # 턴은 정상적으로 끝났으므로 워커는 유지
+
+
+class TestClaudeWorkerPool:
+    def test_session_reuses_worker(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0)
+            r1 = await pool.send("alice", "a", None, timeout=5)
+            r2 = await pool.send("alice", "b", None, timeout=5)
+            r3 = await pool.send("bob", "c", None, timeout=5)
+            stats = pool.stats()
+            await pool.close()
+            return r1, r2, r3, stats
+
+        r1, r2, r3, stats = asyncio.run(main())
+        assert parse(r1.text)[0] == parse(r2.text)[0]
+        assert parse(r1.text)[0] != parse(r3.text)[0]
+        assert stats["assigned"] == 2
+
+    def test_warm_spare_leased(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=1)
+            await pool.start()
+            spare_pid = pool._spares[0].process.pid
+            r = await pool.send("alice", "a", None, timeout=5)
+            await pool._fill_spares()
+            stats = pool.stats()
+            await pool.close()
+            return spare_pid, r, stats
+
+        spare_pid, r, stats = asyncio.run(main())
+        assert parse(r.text)[0] == spare_pid
+        assert stats["spares"] == 1
+
+    def test_recycles_after_max_requests(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0, max_requests=2)
+            pids = []
+            for text in ["a", "b", "c"]:
+                r = await pool.send("alice", text, None, timeout=5)
+                pids.append(parse(r.text)[0])
+            stats = pool.stats()
+            await pool.close()
+            return pids, stats
+
+        pids, stats = asyncio.run(main())
+        assert pids[0] == pids[1] != pids[2]
+        assert stats["recycled"] == 1
+
+    def test_returns_none_when_full(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, max_workers=1, warm_spares=0)
+            slow = asyncio.create_task(pool.send("alice", "hang", None, timeout=0.5))
+            await asyncio.sleep(0.2)
+            r = await pool.send("bob", "b", None, timeout=5)
+            await slow
+            await pool.close()
+            return r
+
+        assert asyncio.run(main()) is None
+
+    def test_evicts_idle_worker_when_full(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, max_workers=1, warm_spares=0)
+            await pool.send("alice", "a", None, timeout=5)
+            r = await pool.send("bob", "b", None, timeout=5)
+            stats = pool.stats()
+            await pool.close()
+            return r, stats
+
+        r, stats = asyncio.run(main())
+        assert r.success
+        assert stats["evicted"] == 1
+        assert stats["assigned"] == 1
+
+    def test_health_check_evicts_idle(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0, idle_timeout=0)
+            await pool.send("alice", "a", None, timeout=5)
+            await pool.check_health()
+            stats = pool.stats()
+            await pool.close()
+            return stats
+
+        stats = asyncio.run(main())
+        assert stats["assigned"] == 0
+
+    def test_release_closes_idle_worker(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0)
+            await pool.send("alice", "a", None, timeout=5)
+            worker = pool._assigned["alice"]
+            pool.release("alice")
+            await asyncio.gather(*pool._background)
+            stats = pool.stats()
+            await pool.close()
+            return worker, stats
+
+        worker, stats = asyncio.run(main())
+        assert not worker.alive
+        assert stats["assigned"] == 0
+
+    def test_release_busy_worker_after_request(self):
+        """요청 처리 중에 해제하면 응답을 돌려준 뒤 워커를 종료한다"""
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0)
+            await pool.send("alice", "a", None, timeout=5)
+            worker = pool._assigned["alice"]
+            task = asyncio.create_task(pool.send("alice", "b", None, timeout=5))
+            await asyncio.sleep(0)
+            pool.release("alice")
+            await asyncio.sleep(0)
+            alive_during = not worker.process.stdin.is_closing()
+            r = await task
+            await asyncio.gather(*pool._background)
+            await pool.close()
+            return worker, alive_during, r
+
+        worker, alive_during, r = asyncio.run(main())
+        assert alive_during
+        assert r.success and parse(r.text)[1] == 2
+        assert not worker.alive
+
+    def test_concurrent_leases_respect_max_workers(self):
+        """예비 워커가 시작하는 동안 들어온 요청도 max_workers를 넘겨 띄우지 않는다"""
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, max_workers=2, warm_spares=1)
+            fill = asyncio.create_task(pool._fill_spares())
+            await asyncio.sleep(0)
+            results = await asyncio.gather(
+                pool.send("alice", "a", None, timeout=5),
+                pool.send("bob", "b", None, timeout=5),
+                pool.send("carol", "c", None, timeout=5),
+            )
+            await fill
+            count = pool.worker_count
+            await pool.close()
+            return results, count
+
+        results, count = asyncio.run(main())
+        assert count <= 2
+        assert sum(r is None for r in results) >= 1
+
+    def test_client_uses_pool(self):
+        async def main():
+            pool = ClaudeWorkerPool(FAKE_COMMAND, warm_spares=0)
+            client = ClaudeCodeClient(pool=pool)
+            r = await client.send_message("안녕", session_key="alice")
+            await pool.close()
+            return r
+
+        r = asyncio.run(main())
+        assert r.success
+        assert parse(r.text)[2] == "안녕"
@@ -0,0 +1,103 @@
+"""console_provisioner 단위 테스트"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from console_provisioner import ConsoleProvisioner
+
+
+def make_member(name, member_id, is_bot=False):
+    member = MagicMock()
+    member.name = name
+    member.id = member_id
+    member.bot = is_bot
+    return member
+
+
+class TestConsoleProvisioner:
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            ConsoleProvisioner(concurrency=0)
+
+    def test_concurrency_capped(self):
+        """동시 생성 수가 concurrency를 넘지 않는다"""
+        active = 0
+        peak = 0
+
+        async def create(member):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return MagicMock()
+
+        mgr = MagicMock()
+        mgr.create_user_console = AsyncMock(side_effect=create)
+        members = [make_member(f"m{i}", i) for i in range(10)]
+        members.append(make_member("bot", 99, is_bot=True))
+
+        result = asyncio.run(ConsoleProvisioner(concurrency=3).provision(mgr, members))
+
+        assert result.ready == 10
+        assert mgr.create_user_console.call_count == 10
+        assert peak == 3
+
+    def test_callback_called(self):
+        channel = MagicMock()
+        mgr = MagicMock()
+        mgr.create_user_console = AsyncMock(return_value=channel)
+        on_ready = AsyncMock()
+        member = make_member("alice", 1)
+
+        asyncio.run(ConsoleProvisioner(concurrency=2).provision(mgr, [member], on_ready))
+
+        on_ready.assert_called_once_with(member, channel)
+
+    def test_failed_member_retried(self):
+        """실패한 멤버는 지연 후 재시도된다"""
+        mgr = MagicMock()
+        mgr.create_user_console = AsyncMock(side_effect=[Exception("rate limited"), MagicMock()])
+        member = make_member("alice", 1)
+
+        async def main():
+            provisioner = ConsoleProvisioner(concurrency=2, retry_delays=(0.01,))
+            result = await provisioner.provision(mgr, [member])
+            assert provisioner.pending_retries == [1]
+            await asyncio.sleep(0.05)
+            return result, provisioner.pending_retries
+
+        result, pending = asyncio.run(main())
+        assert result.failed == ["alice"]
+        assert mgr.create_user_console.call_count == 2
+        assert pending == []
+
+    def test_retry_gives_up(self):
+        mgr = MagicMock()
+        mgr.create_user_console = AsyncMock(side_effect=Exception("오류"))
+        member = make_member("alice", 1)
+
+        async def main():
+            provisioner = ConsoleProvisioner(concurrency=1, retry_delays=(0.001, 0.001))
+            await provisioner.provision_member(mgr, member)
+            await asyncio.sleep(0.05)
+            return provisioner.pending_retries
+
+        assert asyncio.run(main()) == []
+        # 최초 1회 + 재시도 2회
+        assert mgr.create_user_console.call_count == 3
+
+    def test_close_cancels_retries(self):
+        mgr = MagicMock()
+        mgr.create_user_console = AsyncMock(side_effect=Exception("오류"))
+
+        async def main():
+            provisioner = ConsoleProvisioner(concurrency=1, retry_delays=(10,))
+            await provisioner.provision_member(mgr, make_member("alice", 1))
+            await provisioner.close()
+            return provisioner.pending_retries
+
+        assert asyncio.run(main()) == []
+        assert mgr.create_user_console.call_count == 1
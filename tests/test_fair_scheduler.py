@@ -0,0 +1,198 @@
+"""fair_scheduler 단위 테스트"""
+
+import asyncio
+
+import pytest
+
+from fair_scheduler import FairScheduler, QueueFullError
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFairScheduler:
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            FairScheduler(max_concurrency=0)
+
+    def test_immediate_grant(self):
+        async def main():
+            scheduler = FairScheduler(max_concurrency=2)
+            notified = []
+
+            async def on_queued(pos):
+                notified.append(pos)
+
+            async with scheduler.slot("a", on_queued):
+                assert scheduler.active == 1
+            return scheduler, notified
+
+        scheduler, notified = asyncio.run(main())
+        assert scheduler.active == 0
+        assert notified == []
+
+    def test_round_robin_across_users(self):
+        """한 유저가 몰아 보내도 다른 유저 요청이 사이사이 실행된다"""
+        order = []
+
+        async def main():
+            scheduler = FairScheduler(max_concurrency=1, per_user_limit=1, max_queue_per_user=10)
+            gate = asyncio.Event()
+
+            async def job(user, tag):
+                async with scheduler.slot(user):
+                    order.append(tag)
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job("a", "a0"))]
+            await _settle()
+            tasks += [asyncio.create_task(job("a", f"a{i}")) for i in range(1, 4)]
+            await _settle()
+            tasks += [asyncio.create_task(job("b", f"b{i}")) for i in range(2)]
+            await _settle()
+            gate.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        assert order == ["a0", "a1", "b0", "a2", "b1", "a3"]
+
+    def test_per_user_limit(self):
+        async def main():
+            scheduler = FairScheduler(max_concurrency=3, per_user_limit=1)
+            gate = asyncio.Event()
+
+            async def job(user):
+                async with scheduler.slot(user):
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job("a")) for _ in range(2)]
+            tasks.append(asyncio.create_task(job("b")))
+            await _settle()
+            stats = scheduler.stats()
+            gate.set()
+            await asyncio.gather(*tasks)
+            return stats
+
+        stats = asyncio.run(main())
+        assert stats["active"] == 2
+        assert stats["queues"] == {"a": 1}
+
+    def test_weights(self):
+        order = []
+
+        async def main():
+            scheduler = FairScheduler(
+                max_concurrency=1, max_queue_per_user=10, weights={"a": 2}
+            )
+            gate = asyncio.Event()
+
+            async def job(user, tag):
+                async with scheduler.slot(user):
+                    order.append(tag)
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job("x", "x0"))]
+            await _settle()
+            tasks += [asyncio.create_task(job("a", f"a{i}")) for i in range(3)]
+            tasks += [asyncio.create_task(job("b", f"b{i}")) for i in range(2)]
+            await _settle()
+            gate.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        # a는 weight 2라 한 차례에 2개씩 (per_user_limit 1이므로 순차)
+        assert order == ["x0", "a0", "a1", "b0", "a2", "b1"]
+
+    def test_raising_limit_dispatches_waiters(self):
+        async def main():
+            scheduler = FairScheduler(max_concurrency=1)
+            gate = asyncio.Event()
+
+            async def job(user):
+                async with scheduler.slot(user):
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job(u)) for u in ("a", "b", "c")]
+            await _settle()
+            before = scheduler.active
+            scheduler.set_max_concurrency(3)
+            after = scheduler.active
+            scheduler.set_max_concurrency(1)
+            gate.set()
+            await asyncio.gather(*tasks)
+            return before, after, scheduler.active
+
+        assert asyncio.run(main()) == (1, 3, 0)
+
+    def test_queue_full_rejected(self):
+        async def main():
+            scheduler = FairScheduler(max_concurrency=1, max_queue_per_user=1)
+            gate = asyncio.Event()
+
+            async def job():
+                async with scheduler.slot("a"):
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job()) for _ in range(2)]
+            await _settle()
+            with pytest.raises(QueueFullError):
+                await scheduler.acquire("a")
+            gate.set()
+            await asyncio.gather(*tasks)
+            return scheduler.stats()
+
+        stats = asyncio.run(main())
+        assert stats["rejected"] == 1
+        assert stats["served"] == 2
+
+    def test_queue_position_notified(self):
+        positions = []
+
+        async def main():
+            scheduler = FairScheduler(max_concurrency=1, max_queue_per_user=10)
+            gate = asyncio.Event()
+
+            async def on_queued(pos):
+                positions.append(pos)
+
+            async def job(user):
+                async with scheduler.slot(user, on_queued):
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(job("a"))]
+            await _settle()
+            for user in ["a", "a", "b", "a"]:
+                tasks.append(asyncio.create_task(job(user)))
+                await _settle()
+            gate.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        # a#1 → 1, a#2 → 2, b#1 → a 1개 앞 → 2, a#3 → b 1개 + 3 → 4
+        assert positions == [1, 2, 2, 4]
+
+    def test_cancelled_waiter_removed(self):
+        async def main():
+            scheduler = FairScheduler(max_concurrency=1)
+            gate = asyncio.Event()
+
+            async def job(user):
+                async with scheduler.slot(user):
+                    await gate.wait()
+
+            first = asyncio.create_task(job("a"))
+            await _settle()
+            waiting = asyncio.create_task(job("b"))
+            await _settle()
+            waiting.cancel()
+            await _settle()
+            queued = scheduler.queued
+            gate.set()
+            await first
+            return scheduler, queued
+
+        scheduler, queued = asyncio.run(main())
+        assert queued == 0
+        assert scheduler.active == 0
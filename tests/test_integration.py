@@ -9,8 +9,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 os.environ.setdefault("DISCORD_TOKEN", "test-token")
 os.environ.setdefault("DISCORD_GUILD_ID", "123456789")
+os.environ.setdefault("CONSOLE_DEBOUNCE", "0")
 
+from channel_manager import BOT_CONSOLE_PREFIX
 from claude_code_client import ClaudeResponse
+from server import console_registry
 from session_manager import SessionManager
 
 
@@ -51,6 +54,9 @@ def make_mock_message(content, author, channel):
     msg.content = content
     msg.author = author
     msg.channel = channel
+    if msg.channel.name.startswith(BOT_CONSOLE_PREFIX):
+        # 봇이 만든 콘솔처럼 레지스트리에 등록한다
+        console_registry.register(msg.channel.id, author.id)
     return msg
 
 
@@ -78,6 +84,7 @@ class TestFullFlow:
             # on_ready: 채널 생성
             new_ch = make_mock_channel("bot-console-alice", has_messages=False)
             mgr_instance = MockChannelMgr.return_value
+            mgr_instance.tag_consoles = AsyncMock()
             mgr_instance.create_user_console = AsyncMock(return_value=new_ch)
 
             from server import on_ready
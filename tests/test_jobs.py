@@ -0,0 +1,62 @@
+"""jobs 단위 테스트"""
+
+import asyncio
+
+from jobs import JobRegistry
+
+
+class TestJobRegistry:
+    def test_submit_and_complete(self):
+        registry = JobRegistry()
+
+        async def run(job):
+            job.update_progress(1, 2)
+            await asyncio.sleep(0)
+            job.update_progress(2, 2)
+            return "완료"
+
+        async def main():
+            job = registry.submit("test", run)
+            assert job.status == "running"
+            await registry.wait(job.job_id)
+            return job
+
+        job = asyncio.run(main())
+        assert job.status == "completed"
+        assert job.result == "완료"
+        assert job.to_dict()["progress"] == {"done": 2, "total": 2}
+        assert job.finished_at is not None
+
+    def test_failed_job(self):
+        registry = JobRegistry()
+
+        async def run(job):
+            raise RuntimeError("실패")
+
+        async def main():
+            job = registry.submit("test", run)
+            await registry.wait(job.job_id)
+            return job
+
+        job = asyncio.run(main())
+        assert job.status == "failed"
+        assert job.error == "실패"
+
+    def test_get_unknown(self):
+        assert JobRegistry().get("없음") is None
+
+    def test_prunes_finished_jobs(self):
+        registry = JobRegistry(max_finished=2)
+
+        async def run(job):
+            return "ok"
+
+        async def main():
+            jobs = [registry.submit("test", run) for _ in range(4)]
+            for job in jobs:
+                await registry.wait(job.job_id)
+            return jobs
+
+        jobs = asyncio.run(main())
+        assert registry.get(jobs[0].job_id) is None
+        assert registry.get(jobs[-1].job_id) is not None
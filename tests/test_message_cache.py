@@ -0,0 +1,214 @@
+"""message_cache 단위 테스트"""
+
+import asyncio
+import datetime
+from unittest.mock import MagicMock
+
+from message_cache import MessageCache
+
+
+def make_message(message_id, content, channel_id=1, author="alice"):
+    msg = MagicMock()
+    msg.id = message_id
+    msg.content = content
+    msg.channel.id = channel_id
+    msg.author.id = 100
+    msg.author.display_name = author
+    msg.created_at = datetime.datetime(2026, 2, 28, 14, 0) + datetime.timedelta(minutes=message_id)
+    return msg
+
+
+def make_channel(history, channel_id=1):
+    """history: 최신순 메시지 목록. 호출 횟수를 기록한다."""
+    ch = MagicMock()
+    ch.id = channel_id
+    ch.history_calls = 0
+
+    async def mock_history(limit=100, before=None, after=None, oldest_first=None):
+        ch.history_calls += 1
+        msgs = [
+            m for m in history
+            if (before is None or m.id < before.id) and (after is None or m.id > after.id)
+        ]
+        for msg in msgs[:limit]:
+            yield msg
+
+    ch.history = mock_history
+    return ch
+
+
+class TestMessageCache:
+    def test_backfill_then_serve_from_memory(self):
+        history = [make_message(i, f"m{i}") for i in range(10, 0, -1)]
+        ch = make_channel(history)
+        cache = MessageCache(capacity=20)
+
+        async def main():
+            first = await cache.recent(ch, 5)
+            second = await cache.recent(ch, 5)
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert [m.content for m in first] == ["m10", "m9", "m8", "m7", "m6"]
+        assert second == first
+        assert ch.history_calls == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_gateway_messages_served_without_rest(self):
+        cache = MessageCache(capacity=20)
+        for i in range(1, 6):
+            cache.add(make_message(i, f"m{i}"))
+        ch = make_channel([])
+
+        result = asyncio.run(cache.recent(ch, 3))
+
+        assert [m.content for m in result] == ["m5", "m4", "m3"]
+        assert ch.history_calls == 0
+
+    def test_deeper_history_falls_back_to_rest(self):
+        """캐시보다 많은 메시지를 요청하면 REST로 가져온다"""
+        cache = MessageCache(capacity=20)
+        cache.add(make_message(11, "new"))
+        history = [make_message(i, f"m{i}") for i in range(11, 0, -1)]
+        ch = make_channel(history)
+
+        result = asyncio.run(cache.recent(ch, 10))
+
+        assert len(result) == 10
+        assert ch.history_calls == 1
+
+    def test_short_channel_marked_complete(self):
+        """채널 메시지가 요청 수보다 적으면 이후 요청도 캐시로 응답한다"""
+        ch = make_channel([make_message(2, "b"), make_message(1, "a")])
+        cache = MessageCache(capacity=20)
+
+        async def main():
+            await cache.recent(ch, 10)
+            return await cache.recent(ch, 50)
+
+        assert [m.content for m in asyncio.run(main())] == ["b", "a"]
+        assert ch.history_calls == 1
+
+    def test_edit_and_delete(self):
+        cache = MessageCache()
+        cache.add(make_message(1, "원본"))
+        cache.add(make_message(2, "삭제될 메시지"))
+
+        cache.update(make_message(1, "수정됨"))
+        cache.remove(1, [2])
+
+        assert [m.content for m in cache.get(1, 1)] == ["수정됨"]
+        assert cache.get(1, 2) is None
+
+    def test_ttl_expired_refetches(self):
+        ch = make_channel([make_message(1, "a")])
+        cache = MessageCache(ttl=0)
+
+        async def main():
+            await cache.recent(ch, 1)
+            await cache.recent(ch, 1)
+
+        asyncio.run(main())
+        assert ch.history_calls == 2
+
+    def test_backfill_keeps_newer_gateway_messages(self):
+        """REST 응답 이후에 도착한 메시지는 다시 채워도 남는다"""
+        cache = MessageCache()
+        cache.add(make_message(5, "live"))
+        cache._fill(1, [], complete=False)
+        assert [m.content for m in cache._channels[1].messages] == ["live"]
+
+    def test_channel_limit_evicts_lru(self):
+        cache = MessageCache(max_channels=2)
+        for channel_id in (1, 2, 3):
+            cache.add(make_message(channel_id, "x", channel_id=channel_id))
+        assert cache.stats()["channels"] == 2
+        assert cache.get(1, 1) is None
+
+    def test_capacity_overflow_clears_complete(self):
+        ch = make_channel([make_message(1, "a")])
+        cache = MessageCache(capacity=2)
+
+        async def main():
+            await cache.recent(ch, 5)
+            cache.add(make_message(2, "b"))
+            cache.add(make_message(3, "c"))
+            return cache.get(1, 5)
+
+        assert asyncio.run(main()) is None
+
+
+class TestIterHistory:
+    def _collect(self, gen, n=None):
+        async def main():
+            out = []
+            async for msg in gen:
+                out.append(msg.content)
+                if n is not None and len(out) >= n:
+                    break
+            await gen.aclose()
+            return out
+
+        return asyncio.run(main())
+
+    def test_cache_then_rest(self):
+        """캐시 구간 이후의 오래된 메시지는 캐시의 마지막 ID부터 REST로 가져온다"""
+        history = [make_message(i, f"m{i}") for i in range(6, 0, -1)]
+        ch = make_channel(history)
+        cache = MessageCache()
+        for msg in reversed(history[:2]):
+            cache.add(msg)
+
+        result = self._collect(cache.iter_history(ch))
+
+        assert result == ["m6", "m5", "m4", "m3", "m2", "m1"]
+        assert ch.history_calls == 1
+
+    def test_stops_without_extra_requests(self):
+        history = [make_message(i, f"m{i}") for i in range(6, 0, -1)]
+        ch = make_channel(history)
+        cache = MessageCache()
+        cache.add(history[1])
+        cache.add(history[0])
+
+        assert self._collect(cache.iter_history(ch), n=2) == ["m6", "m5"]
+        assert ch.history_calls == 0
+
+    def test_before_and_after_bounds(self):
+        history = [make_message(i, f"m{i}") for i in range(10, 0, -1)]
+        ch = make_channel(history)
+        cache = MessageCache()
+        for msg in reversed(history):
+            cache.add(msg)
+
+        result = self._collect(cache.iter_history(ch, before=8, after=4))
+
+        assert result == ["m7", "m6", "m5"]
+        assert ch.history_calls == 0
+
+    def test_prefetch_capped_at_capacity(self):
+        """prefetch가 커도 캐시 용량만큼만 미리 가져온다"""
+        history = [make_message(i, f"m{i}") for i in range(10, 0, -1)]
+        ch = make_channel(history)
+        limits = []
+        original = ch.history
+
+        def history_spy(limit=100, **kwargs):
+            limits.append(limit)
+            return original(limit=limit, **kwargs)
+
+        ch.history = history_spy
+        cache = MessageCache(capacity=3)
+
+        assert self._collect(cache.iter_history(ch, prefetch=100_001), n=2) == ["m10", "m9"]
+        assert limits == [3]
+
+    def test_prefetch_fills_cache(self):
+        history = [make_message(i, f"m{i}") for i in range(3, 0, -1)]
+        ch = make_channel(history)
+        cache = MessageCache()
+
+        self._collect(cache.iter_history(ch, prefetch=5))
+        self._collect(cache.iter_history(ch, prefetch=5))
+
+        assert ch.history_calls == 1
@@ -0,0 +1,88 @@
+"""message_debouncer 단위 테스트"""
+
+import asyncio
+import time
+
+from message_debouncer import MessageDebouncer
+
+
+class TestMessageDebouncer:
+    def test_zero_window_passes_through(self):
+        debouncer = MessageDebouncer(window=0)
+        assert asyncio.run(debouncer.collect("u1", "a")) == ["a"]
+        assert debouncer.pending == 0
+
+    def test_burst_merged(self):
+        """window 안에 온 메시지는 첫 호출이 한 번에 반환한다"""
+        debouncer = MessageDebouncer(window=0.05, max_wait=1)
+
+        async def main():
+            first = asyncio.create_task(debouncer.collect("u1", "a"))
+            await asyncio.sleep(0.01)
+            second = await debouncer.collect("u1", "b")
+            third = await debouncer.collect("u1", "c")
+            return await first, second, third
+
+        first, second, third = asyncio.run(main())
+        assert first == ["a", "b", "c"]
+        assert second is None and third is None
+        assert debouncer.stats()["batches"] == 1
+        assert debouncer.stats()["merged"] == 2
+
+    def test_users_independent(self):
+        debouncer = MessageDebouncer(window=0.02)
+
+        async def main():
+            return await asyncio.gather(
+                debouncer.collect("u1", "a"), debouncer.collect("u2", "b")
+            )
+
+        assert asyncio.run(main()) == [["a"], ["b"]]
+
+    def test_message_resets_window(self):
+        """새 메시지가 오면 그 시점부터 window를 다시 기다린다"""
+        debouncer = MessageDebouncer(window=0.05, max_wait=1)
+
+        async def main():
+            start = time.monotonic()
+            first = asyncio.create_task(debouncer.collect("u1", "a"))
+            await asyncio.sleep(0.04)
+            await debouncer.collect("u1", "b")
+            await first
+            return time.monotonic() - start
+
+        assert asyncio.run(main()) >= 0.085
+
+    def test_typing_extends_wait(self):
+        debouncer = MessageDebouncer(window=0.02, typing_window=0.1, max_wait=1)
+
+        async def main():
+            first = asyncio.create_task(debouncer.collect("u1", "a"))
+            await asyncio.sleep(0.01)
+            debouncer.typing("u1")
+            await asyncio.sleep(0.05)
+            # window만 기다렸다면 이미 끝났을 시점에 다음 메시지가 도착
+            merged = await debouncer.collect("u1", "b")
+            return await first, merged
+
+        batch, merged = asyncio.run(main())
+        assert batch == ["a", "b"]
+        assert merged is None
+
+    def test_typing_without_batch_ignored(self):
+        debouncer = MessageDebouncer(window=0.02)
+        debouncer.typing("u1")
+        assert debouncer.pending == 0
+
+    def test_max_wait_caps_extension(self):
+        debouncer = MessageDebouncer(window=0.02, typing_window=10, max_wait=0.05)
+
+        async def main():
+            start = time.monotonic()
+            first = asyncio.create_task(debouncer.collect("u1", "a"))
+            await asyncio.sleep(0)
+            debouncer.typing("u1")
+            await first
+            return time.monotonic() - start
+
+        assert asyncio.run(main()) < 0.5
@@ -0,0 +1,169 @@
+"""message_utils 단위 테스트"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from message_utils import MessageSplitter, StreamingReply, iter_split, split_message
+
+
+def make_mock_channel():
+    ch = MagicMock()
+    sent = []
+
+    async def mock_send(content):
+        msg = MagicMock()
+        msg.content = content
+
+        async def mock_edit(content):
+            msg.content = content
+
+        msg.edit = AsyncMock(side_effect=mock_edit)
+        sent.append(msg)
+        return msg
+
+    ch.send = AsyncMock(side_effect=mock_send)
+    ch._sent = sent
+    return ch
+
+
+class TestStreamingReply:
+    def test_first_chunk_sent_immediately(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=10)
+            await reply.feed("안녕")
+            return reply
+
+        reply = asyncio.run(main())
+        assert reply.started
+        assert [m.content for m in ch._sent] == ["안녕"]
+
+    def test_throttled_edits(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=10)
+            await reply.feed("안녕")
+            await reply.feed("하세요")
+            await reply.feed("!")
+            # 간격 안의 조각은 즉시 반영되지 않는다
+            assert ch._sent[0].edit.call_count == 0
+            await reply.finish()
+
+        asyncio.run(main())
+        assert len(ch._sent) == 1
+        assert ch._sent[0].edit.call_count == 1
+        assert ch._sent[0].content == "안녕하세요!"
+
+    def test_cancel_stops_pending_flush(self):
+        """취소하면 예약된 편집이 나중에 반영되지 않고 이후 조각도 무시한다"""
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=0.02)
+            await reply.feed("부분")
+            await reply.feed(" 응답")
+            await reply.cancel()
+            await reply.feed("!")
+            await asyncio.sleep(0.05)
+            await reply.finish("최종")
+
+        asyncio.run(main())
+        assert [m.content for m in ch._sent] == ["부분"]
+        assert ch._sent[0].edit.call_count == 0
+
+    def test_delayed_flush(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=0.05)
+            await reply.feed("a")
+            await reply.feed("b")
+            await asyncio.sleep(0.1)
+
+        asyncio.run(main())
+        assert ch._sent[0].content == "ab"
+
+    def test_overflow_sends_new_message(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=0, limit=100)
+            await reply.feed("A" * 80 + "\n")
+            await reply.feed("B" * 80)
+            await reply.finish()
+
+        asyncio.run(main())
+        assert [m.content for m in ch._sent] == ["A" * 80, "B" * 80]
+
+    def test_finish_without_stream_sends_final_text(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch)
+            await reply.finish("A" * 4500)
+
+        asyncio.run(main())
+        assert len(ch._sent) == 3
+
+    def test_finish_keeps_streamed_text(self):
+        ch = make_mock_channel()
+
+        async def main():
+            reply = StreamingReply(ch, interval=0)
+            await reply.feed("스트리밍")
+            await reply.finish("최종")
+
+        asyncio.run(main())
+        assert [m.content for m in ch._sent] == ["스트리밍"]
+
+    def test_finish_empty(self):
+        ch = make_mock_channel()
+        asyncio.run(StreamingReply(ch).finish())
+        ch.send.assert_not_called()
+
+
+class TestSplitMessageFences:
+    def test_language_tag_reopened(self):
+        text = "설명\n```python\n" + "print('x')\n" * 30 + "```\n끝"
+        chunks = split_message(text, limit=100)
+        assert all(len(c) <= 100 for c in chunks)
+        for chunk in chunks[1:-1]:
+            assert chunk.startswith("```python\n")
+            assert chunk.endswith("\n```")
+
+    def test_tilde_and_long_fence(self):
+        """물결 펜스와 4개 이상 백틱 펜스는 같은 문자/길이로 닫는다"""
+        text = "~~~~sh\n" + "echo hi\n" * 40 + "~~~~"
+        chunks = split_message(text, limit=80)
+        assert chunks[0].endswith("\n~~~~")
+        assert chunks[1].startswith("~~~~sh\n")
+
+    def test_inner_shorter_fence_does_not_close(self):
+        """```` 펜스 안의 ``` 줄은 본문으로 취급한다"""
+        text = "````md\n```\n" + "line\n" * 30 + "```\n````"
+        chunks = split_message(text, limit=60)
+        assert all(c.startswith("````md") for c in chunks)
+        assert all(c.endswith("````") for c in chunks)
+
+    def test_inline_backticks_not_fence(self):
+        text = "```inline``` 코드\n" + "A" * 50 + "\n" + "B" * 50
+        assert split_message(text, limit=80) == ["```inline``` 코드\n" + "A" * 50, "B" * 50]
+
+    def test_long_line_respects_limit(self):
+        text = "```\n" + "x" * 500 + "\n```"
+        chunks = split_message(text, limit=100)
+        assert all(len(c) <= 100 for c in chunks)
+        assert "".join(c[4:-4] for c in chunks) == "x" * 500
+
+    def test_iterator_matches_one_shot(self):
+        text = ("문단 " * 30 + "\n```js\n" + "let a = 1;\n" * 20 + "```\n") * 20
+        pieces = (text[i:i + 7] for i in range(0, len(text), 7))
+        assert list(iter_split(pieces, limit=200)) == split_message(text, limit=200)
+
+    def test_feed_yields_before_close(self):
+        splitter = MessageSplitter(limit=50)
+        early = splitter.feed(("가나다 " * 10 + "\n") * 10)
+        assert early
+        assert all(len(c) <= 50 for c in early + splitter.close())
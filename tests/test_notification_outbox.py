@@ -0,0 +1,384 @@
+"""notification_outbox 단위 테스트"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from notification_outbox import KIND_MESSAGE, NotificationOutbox
+from outbox_store import SQLiteOutboxStore
+
+
+def make_channel(channel_id=1, name="🤖-claude-알림"):
+    ch = MagicMock()
+    ch.id = channel_id
+    ch.name = name
+    ch.send = AsyncMock(return_value=MagicMock(id=999))
+    return ch
+
+
+def make_embed(text="알림"):
+    return discord.Embed(title="✅ 작업 완료", description=text)
+
+
+def http_error(status):
+    response = MagicMock(status=status, reason="error")
+    return discord.HTTPException(response, "error")
+
+
+class TestNotificationOutbox:
+    def test_enqueue_returns_immediately(self):
+        """enqueue는 전송을 기다리지 않고 queued 상태로 반환한다"""
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=10)
+            notification = await outbox.enqueue(ch, make_embed())
+            status = notification.status
+            ch.send.assert_not_called()
+            return status, outbox
+
+        status, _ = asyncio.run(main())
+        assert status == "queued"
+
+    def test_window_coalesces(self):
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0.01, min_interval=0)
+            notes = [await outbox.enqueue(ch, make_embed(str(i))) for i in range(3)]
+            await outbox.drain()
+            return notes, outbox
+
+        notes, outbox = asyncio.run(main())
+        ch.send.assert_called_once()
+        assert len(ch.send.call_args.kwargs["embeds"]) == 3
+        assert all(n.status == "sent" and n.message_id == 999 for n in notes)
+        assert outbox.stats()["messages"] == 1
+
+    def test_max_ten_embeds_per_message(self):
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0)
+            for i in range(13):
+                await outbox.enqueue(ch, make_embed(str(i)))
+            await outbox.drain()
+
+        asyncio.run(main())
+        sizes = [len(c.kwargs["embeds"]) for c in ch.send.call_args_list]
+        assert sizes == [10, 3]
+
+    def test_embed_char_limit_splits(self):
+        """Embed 전체 글자 수가 6000자를 넘으면 다음 메시지로 나눈다"""
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0)
+            for _ in range(3):
+                await outbox.enqueue(ch, make_embed("가" * 2500))
+            await outbox.drain()
+
+        asyncio.run(main())
+        assert [len(c.kwargs["embeds"]) for c in ch.send.call_args_list] == [2, 1]
+
+    def test_min_interval_between_sends(self):
+        ch = make_channel()
+        sent_at = []
+        ch.send = AsyncMock(side_effect=lambda **kw: sent_at.append(time.monotonic()))
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0.05)
+            for i in range(11):
+                await outbox.enqueue(ch, make_embed(str(i)))
+            await outbox.drain()
+
+        asyncio.run(main())
+        assert len(sent_at) == 2
+        assert sent_at[1] - sent_at[0] >= 0.045
+
+    def test_channels_independent(self):
+        a, b = make_channel(1), make_channel(2)
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0)
+            await outbox.enqueue(a, make_embed())
+            await outbox.enqueue(b, make_embed())
+            await outbox.drain()
+
+        asyncio.run(main())
+        a.send.assert_called_once()
+        b.send.assert_called_once()
+
+    def test_failure_recorded(self):
+        """최대 시도 횟수를 넘기면 failed로 기록한다"""
+        ch = make_channel()
+        ch.send = AsyncMock(side_effect=Exception("rate limited"))
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0, retry_base=0, max_attempts=3)
+            notification = await outbox.enqueue(ch, make_embed())
+            await outbox.drain()
+            return notification, outbox
+
+        notification, outbox = asyncio.run(main())
+        assert notification.status == "failed"
+        assert "rate limited" in notification.error
+        assert notification.attempts == 3
+        assert ch.send.call_count == 3
+        assert asyncio.run(outbox.get(notification.notification_id)) is notification
+        assert outbox.stats()["failed"] == 1
+
+    def test_retry_until_success(self):
+        """일시적 오류는 백오프 후 다시 보낸다"""
+        ch = make_channel()
+        ch.send = AsyncMock(side_effect=[http_error(503), http_error(429), MagicMock(id=7)])
+        sleeps = []
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0, retry_base=0.01, retry_max=0.5)
+            original = asyncio.sleep
+
+            async def fake_sleep(delay):
+                sleeps.append(delay)
+                await original(0)
+
+            asyncio.sleep = fake_sleep
+            try:
+                notification = await outbox.enqueue(ch, make_embed())
+                await outbox.drain()
+            finally:
+                asyncio.sleep = original
+            return notification, outbox
+
+        notification, outbox = asyncio.run(main())
+        assert notification.status == "sent"
+        assert notification.message_id == 7
+        assert notification.attempts == 3
+        assert sleeps == [0.01, 0.02]
+        assert outbox.stats()["retries"] == 2
+
+    def test_permanent_error_not_retried(self):
+        """권한 없음(403) 같은 오류는 재시도하지 않는다"""
+        ch = make_channel()
+        ch.send = AsyncMock(side_effect=http_error(403))
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0, retry_base=0)
+            notification = await outbox.enqueue(ch, make_embed())
+            await outbox.drain()
+            return notification
+
+        notification = asyncio.run(main())
+        assert notification.status == "failed"
+        ch.send.assert_called_once()
+
+    def test_plain_message_sent_alone(self):
+        """일반 메시지는 Embed 알림과 묶지 않고 내용 그대로 보낸다"""
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0.01, min_interval=0)
+            await outbox.enqueue(ch, make_embed())
+            message = await outbox.enqueue(ch, content="hello")
+            await outbox.drain()
+            return message
+
+        message = asyncio.run(main())
+        assert message.kind == KIND_MESSAGE
+        assert ch.send.call_count == 2
+        assert ch.send.call_args_list[1].args == ("hello",)
+
+    def test_nonce_is_first_notification_id(self):
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0)
+            notification = await outbox.enqueue(ch, content="hello")
+            await outbox.drain()
+            return notification
+
+        notification = asyncio.run(main())
+        assert ch.send.call_args.kwargs["nonce"] == notification.notification_id
+
+    def test_failed_batch_retried_as_is(self):
+        """재시도할 때 새로 들어온 알림을 실패한 묶음에 섞지 않고 같은 nonce로 보낸다"""
+        ch = make_channel()
+        ch.send = AsyncMock(side_effect=[http_error(503), MagicMock(id=7), MagicMock(id=8)])
+
+        async def main():
+            outbox = NotificationOutbox(window=0.01, min_interval=0, retry_base=0.05)
+            first = [await outbox.enqueue(ch, make_embed(f"알림 {i}")) for i in range(2)]
+            await asyncio.sleep(0.03)  # 첫 전송 실패 후 백오프 중
+            late = await outbox.enqueue(ch, make_embed("늦은 알림"))
+            await outbox.drain()
+            return first, late
+
+        first, late = asyncio.run(main())
+        calls = ch.send.call_args_list
+        assert len(calls) == 3
+        assert [e.description for e in calls[1].kwargs["embeds"]] == ["알림 0", "알림 1"]
+        assert calls[1].kwargs["nonce"] == calls[0].kwargs["nonce"]
+        assert calls[2].kwargs["nonce"] != calls[0].kwargs["nonce"]
+        assert [n.message_id for n in first] == [7, 7]
+        assert late.message_id == 8
+
+    def test_idempotency_key_dedup(self):
+        ch = make_channel()
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0)
+            first = await outbox.enqueue(ch, make_embed(), idempotency_key="build-42")
+            second = await outbox.enqueue(ch, make_embed(), idempotency_key="build-42")
+            await outbox.drain()
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first is second
+        ch.send.assert_called_once()
+        assert len(ch.send.call_args.kwargs["embeds"]) == 1
+
+
+class TestDurableOutbox:
+    def test_written_before_send(self, tmp_path):
+        ch = make_channel(channel_id=5)
+        store = SQLiteOutboxStore(str(tmp_path / "outbox.db"))
+
+        async def main():
+            outbox = NotificationOutbox(window=10, store=store)
+            notification = await outbox.enqueue(ch, make_embed("배포 완료"))
+            pending = store.pending()
+            await outbox.close(timeout=0)
+            return notification, pending
+
+        notification, pending = asyncio.run(main())
+        ch.send.assert_not_called()
+        assert len(pending) == 1
+        channel_id, stored, embed, content = pending[0]
+        assert channel_id == 5
+        assert stored.notification_id == notification.notification_id
+        assert embed.description == "배포 완료"
+        assert content is None
+
+    def test_store_writes_off_event_loop(self, tmp_path):
+        """저장소 기록은 이벤트 루프 스레드가 아닌 곳에서 실행한다"""
+        store = SQLiteOutboxStore(str(tmp_path / "outbox.db"))
+        threads = []
+        for name in ("add", "mark_sent"):
+            original = getattr(store, name)
+
+            def record(*args, _original=original, _name=name):
+                threads.append((_name, threading.get_ident()))
+                return _original(*args)
+
+            setattr(store, name, record)
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0, store=store)
+            await outbox.enqueue(make_channel(), make_embed())
+            await outbox.drain()
+            outbox.store.close()
+
+        asyncio.run(main())
+        assert [name for name, _ in threads] == ["add", "mark_sent"]
+        assert all(ident != threading.get_ident() for _, ident in threads)
+
+    def test_concurrent_same_key(self, tmp_path):
+        """기록 중에 같은 키로 들어온 요청은 같은 항목을 받는다"""
+        ch = make_channel()
+        store = SQLiteOutboxStore(str(tmp_path / "outbox.db"))
+
+        async def main():
+            outbox = NotificationOutbox(window=0, min_interval=0, store=store)
+            results = await asyncio.gather(*(
+                outbox.enqueue(ch, content="hello", idempotency_key="k1") for _ in range(3)
+            ))
+            await outbox.drain()
+            outbox.store.close()
+            return results
+
+        results = asyncio.run(main())
+        assert len({n.notification_id for n in results}) == 1
+        ch.send.assert_called_once()
+
+    def test_restore_after_restart(self, tmp_path):
+        """재시작 전에 보내지 못한 항목을 복원해 전송한다"""
+        path = str(tmp_path / "outbox.db")
+        down = make_channel(channel_id=5)
+        down.send = AsyncMock(side_effect=http_error(503))
+
+        async def before_restart():
+            outbox = NotificationOutbox(
+                window=0, min_interval=0, retry_base=10, store=SQLiteOutboxStore(path)
+            )
+            notification = await outbox.enqueue(down, content="hello", idempotency_key="k1")
+            await outbox.close(timeout=0.05)
+            return notification.notification_id
+
+        notification_id = asyncio.run(before_restart())
+        up = make_channel(channel_id=5)
+
+        async def after_restart():
+            outbox = NotificationOutbox(window=0, min_interval=0, store=SQLiteOutboxStore(path))
+            restored = await outbox.restore(lambda cid: up if cid == 5 else None)
+            duplicate = await outbox.enqueue(up, content="hello", idempotency_key="k1")
+            await outbox.drain()
+            notification = await outbox.get(notification_id)
+            outbox.store.close()
+            return restored, duplicate, notification
+
+        restored, duplicate, notification = asyncio.run(after_restart())
+        assert restored == 1
+        assert duplicate.notification_id == notification_id
+        up.send.assert_called_once_with("hello", nonce=notification_id)
+        assert notification.status == "sent"
+        assert notification.attempts == 2
+
+    def test_restore_once_per_process(self, tmp_path):
+        """재연결로 on_ready가 다시 와도 이미 복원한 항목을 다시 넣지 않는다"""
+        path = str(tmp_path / "outbox.db")
+        down = make_channel(channel_id=5)
+        down.send = AsyncMock(side_effect=http_error(503))
+
+        async def before_restart():
+            outbox = NotificationOutbox(window=10, store=SQLiteOutboxStore(path))
+            await outbox.enqueue(down, content="hello")
+            await outbox.close(timeout=0)
+
+        asyncio.run(before_restart())
+        up = make_channel(channel_id=5)
+
+        async def after_restart():
+            # 최근 항목만 추적해 복원한 항목이 추적 목록에서 밀려나도
+            outbox = NotificationOutbox(
+                window=0.05, min_interval=0, max_tracked=1, store=SQLiteOutboxStore(path)
+            )
+            first = await outbox.restore(lambda cid: up)
+            await outbox.enqueue(up, content="other")
+            second = await outbox.restore(lambda cid: up)
+            await outbox.drain()
+            outbox.store.close()
+            return first, second
+
+        assert asyncio.run(after_restart()) == (1, 0)
+        assert [c.args[0] for c in up.send.call_args_list] == ["hello", "other"]
+
+    def test_restore_missing_channel_fails(self, tmp_path):
+        store = SQLiteOutboxStore(str(tmp_path / "outbox.db"))
+
+        async def main():
+            outbox = NotificationOutbox(window=10, store=store)
+            notification = await outbox.enqueue(make_channel(), content="hello")
+            await outbox.close(timeout=0)
+
+            outbox = NotificationOutbox(store=SQLiteOutboxStore(store.path))
+            restored = await outbox.restore(lambda cid: None)
+            result = await outbox.get(notification.notification_id)
+            outbox.store.close()
+            return restored, result
+
+        restored, result = asyncio.run(main())
+        assert restored == 0
+        assert result.status == "failed"
@@ -6,8 +6,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 os.environ.setdefault("DISCORD_TOKEN", "test-token")
 os.environ.setdefault("DISCORD_GUILD_ID", "123456789")
+os.environ.setdefault("CONSOLE_DEBOUNCE", "0")
 
+from channel_manager import BOT_CONSOLE_PREFIX
 from claude_code_client import ClaudeResponse
+from server import console_registry
 
 
 def make_mock_channel(name="bot-console-alice"):
@@ -40,6 +43,9 @@ def make_mock_message(content, author_bot=False, channel=None):
     msg.author.bot = author_bot
     msg.author.id = 111222333
     msg.channel = channel or make_mock_channel()
+    if msg.channel.name.startswith(BOT_CONSOLE_PREFIX):
+        # 봇이 만든 콘솔처럼 레지스트리에 등록한다
+        console_registry.register(msg.channel.id, msg.author.id)
     return msg
 
 
@@ -52,8 +58,8 @@ class TestOnMessage:
     def test_responds_in_bot_console(self, mock_sm, mock_claude):
         """bot-console 채널에서 AI 응답을 전송한다"""
         session = MagicMock()
-        session.get_recent_messages.return_value = []
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         mock_claude.send_message = AsyncMock(
             return_value=ClaudeResponse(text="안녕하세요!", success=True)
@@ -80,7 +86,7 @@ class TestOnMessage:
         self._run(on_message(msg))
 
         mock_claude.send_message.assert_not_called()
-        mock_sm.get_or_create_session.assert_not_called()
+        mock_sm.load_or_create_session.assert_not_called()
 
     @patch("server.claude_client")
     @patch("server.session_manager")
@@ -93,15 +99,15 @@ class TestOnMessage:
         self._run(on_message(msg))
 
         mock_claude.send_message.assert_not_called()
-        mock_sm.get_or_create_session.assert_not_called()
+        mock_sm.load_or_create_session.assert_not_called()
 
     @patch("server.claude_client")
     @patch("server.session_manager")
     def test_error_response(self, mock_sm, mock_claude):
         """CLI 에러 시 경고 메시지를 전송한다"""
         session = MagicMock()
-        session.get_recent_messages.return_value = []
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         mock_claude.send_message = AsyncMock(
             return_value=ClaudeResponse(text="", success=False, error="타임아웃")
@@ -125,8 +131,8 @@ class TestOnMessage:
             {"role": "user", "content": "이전 질문"},
             {"role": "assistant", "content": "이전 답변"},
         ]
-        session.get_recent_messages.return_value = context
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = context
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         mock_claude.send_message = AsyncMock(
             return_value=ClaudeResponse(text="응답", success=True)
@@ -142,13 +148,33 @@ class TestOnMessage:
         assert call_args.args[0] == "새 질문"
         assert call_args.kwargs["context_messages"] == context
 
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_resumes_cli_session(self, mock_sm, mock_claude):
+        """이전 응답의 CLI 대화 ID로 다음 요청을 이어가고 새 ID를 저장한다"""
+        session = MagicMock()
+        session.build_context.return_value = []
+        session.cli_session_id = "prev"
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+
+        mock_claude.send_message = AsyncMock(
+            return_value=ClaudeResponse(text="응답", success=True, session_id="next")
+        )
+
+        from server import on_message
+
+        self._run(on_message(make_mock_message("질문")))
+
+        assert mock_claude.send_message.call_args.kwargs["resume_id"] == "prev"
+        assert session.cli_session_id == "next"
+
     @patch("server.claude_client")
     @patch("server.session_manager")
     def test_no_assistant_message_on_error(self, mock_sm, mock_claude):
         """에러 시 assistant 메시지를 저장하지 않는다"""
         session = MagicMock()
-        session.get_recent_messages.return_value = []
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         mock_claude.send_message = AsyncMock(
             return_value=ClaudeResponse(text="", success=False, error="오류")
@@ -167,8 +193,8 @@ class TestOnMessage:
     def test_long_response_split(self, mock_sm, mock_claude):
         """긴 응답이 split_message로 분할되어 전송된다"""
         session = MagicMock()
-        session.get_recent_messages.return_value = []
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         long_text = "A" * 4500
         mock_claude.send_message = AsyncMock(
@@ -184,13 +210,36 @@ class TestOnMessage:
         # 4500자 → 2000 + 2000 + 500 = 3 messages
         assert len(ch._sent) == 3
 
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_streams_partial_text(self, mock_sm, mock_claude):
+        """스트리밍된 조각이 최종 응답 전에 채널에 게시된다"""
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+
+        async def fake_send(content, **kwargs):
+            await kwargs["on_text"]("부분 응답")
+            return ClaudeResponse(text="최종 응답", success=True)
+
+        mock_claude.send_message = AsyncMock(side_effect=fake_send)
+
+        ch = make_mock_channel()
+        msg = make_mock_message("테스트", channel=ch)
+        from server import on_message
+
+        self._run(on_message(msg))
+
+        assert [m.content for m in ch._sent] == ["부분 응답"]
+        session.add_message.assert_any_call("assistant", "최종 응답")
+
     @patch("server.claude_client")
     @patch("server.session_manager")
     def test_typing_indicator_shown(self, mock_sm, mock_claude):
         """응답 생성 중 typing indicator가 표시된다"""
         session = MagicMock()
-        session.get_recent_messages.return_value = []
-        mock_sm.get_or_create_session.return_value = session
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
 
         mock_claude.send_message = AsyncMock(
             return_value=ClaudeResponse(text="응답", success=True)
@@ -204,6 +253,41 @@ class TestOnMessage:
 
         ch.typing.assert_called_once()
 
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_untagged_console_responds_after_rebuild(self, mock_sm, mock_claude):
+        """토픽 태그가 없는 이전 콘솔도 rebuild 후 바로 응답한다"""
+        from channel_manager import BOT_CONSOLE_CATEGORY, ChannelManager
+        from server import on_message
+
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+        mock_claude.send_message = AsyncMock(
+            return_value=ClaudeResponse(text="응답", success=True)
+        )
+
+        ch = make_mock_channel("bot-console-carol")
+        ch.topic = "carol님의 AI 대화 채널"
+        category = MagicMock()
+        category.name = BOT_CONSOLE_CATEGORY
+        category.channels = [ch]
+        carol = MagicMock(bot=False, id=444555666)
+        carol.name = "carol"
+        guild = MagicMock(categories=[category], members=[carol])
+
+        console_registry.clear()
+        ChannelManager(guild, registry=console_registry).rebuild()
+
+        msg = MagicMock()
+        msg.content = "안녕"
+        msg.author = carol
+        msg.channel = ch
+        self._run(on_message(msg))
+
+        mock_claude.send_message.assert_called_once()
+        assert [m.content for m in ch._sent] == ["응답"]
+
 
 class TestSplitMessage:
     def test_short_message(self):
@@ -270,3 +354,182 @@ class TestSplitMessage:
         # 각 청크가 limit을 초과하지 않음
         for chunk in result:
             assert len(chunk) <= 2000 + 4  # 코드블록 닫힘 태그 허용
+
+
+class TestOnMessageScheduling:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_queue_full_rejects(self, mock_sm, mock_claude):
+        """유저 대기열이 가득 차면 거절 메시지를 보내고 CLI를 실행하지 않는다"""
+        from fair_scheduler import QueueFullError
+        from server import on_message
+
+        ch = make_mock_channel()
+        msg = make_mock_message("테스트", channel=ch)
+        mock_claude.send_message = AsyncMock()
+
+        with patch("server.scheduler") as mock_scheduler:
+            mock_scheduler.acquire = AsyncMock(side_effect=QueueFullError("가득 참"))
+            self._run(on_message(msg))
+            mock_scheduler.release.assert_not_called()
+
+        mock_claude.send_message.assert_not_called()
+        mock_sm.load_or_create_session.assert_not_called()
+        assert "가득 참" in ch._sent[0].content
+
+    @patch("server.CLAUDE_SUPERSEDE", "queue")
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_queued_user_notified(self, mock_sm, mock_claude):
+        """queue 모드에서 대기하게 되면 대기 순번을 알린다"""
+        from fair_scheduler import FairScheduler
+        from server import on_message
+
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+
+        async def main():
+            gate = asyncio.Event()
+
+            async def slow_send(content, **kwargs):
+                await gate.wait()
+                return ClaudeResponse(text=f"응답:{content}", success=True)
+
+            mock_claude.send_message = AsyncMock(side_effect=slow_send)
+            ch = make_mock_channel()
+            with patch("server.scheduler", FairScheduler(max_concurrency=1)):
+                first = asyncio.create_task(on_message(make_mock_message("1", channel=ch)))
+                await asyncio.sleep(0)
+                second = asyncio.create_task(on_message(make_mock_message("2", channel=ch)))
+                await asyncio.sleep(0.01)
+                queued_notice = [m.content for m in ch._sent]
+                gate.set()
+                await asyncio.gather(first, second)
+            return queued_notice, ch
+
+        queued_notice, ch = self._run(main())
+        assert len(queued_notice) == 1
+        assert "대기열 1번째" in queued_notice[0]
+        assert mock_claude.send_message.call_count == 2
+
+    @patch("server.CLAUDE_SUPERSEDE", "cancel")
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_newer_message_cancels_previous(self, mock_sm, mock_claude):
+        """새 메시지가 오면 이전 요청을 취소하고 안내한 뒤 새 메시지에 응답한다"""
+        from fair_scheduler import FairScheduler
+        from server import on_message
+
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+        scheduler = FairScheduler(max_concurrency=1)
+        started = []
+
+        async def main():
+            async def send(content, **kwargs):
+                started.append(content)
+                if content == "1":
+                    await asyncio.Event().wait()  # 취소될 때까지 실행 중
+                return ClaudeResponse(text=f"응답:{content}", success=True)
+
+            mock_claude.send_message = AsyncMock(side_effect=send)
+            ch = make_mock_channel()
+            with patch("server.scheduler", scheduler):
+                first = asyncio.create_task(on_message(make_mock_message("1", channel=ch)))
+                await asyncio.sleep(0.01)
+                second = asyncio.create_task(on_message(make_mock_message("2", channel=ch)))
+                await second
+                await asyncio.gather(first, return_exceptions=True)
+            return first, ch
+
+        first, ch = self._run(main())
+        sent = [m.content for m in ch._sent]
+        assert first.cancelled()
+        assert started == ["1", "2"]
+        assert "취소" in sent[0]
+        assert sent[-1] == "응답:2"
+        assert not any("대기열" in c for c in sent)
+        assert scheduler.active == 0
+
+    @patch("server.CLAUDE_SUPERSEDE", "cancel")
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_different_users_not_cancelled(self, mock_sm, mock_claude):
+        from server import on_message
+
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+        mock_claude.send_message = AsyncMock(
+            return_value=ClaudeResponse(text="응답", success=True)
+        )
+
+        async def main():
+            a = make_mock_message("a")
+            b = make_mock_message("b")
+            b.author.id = 444555666
+            console_registry.register(a.channel.id, a.author.id)
+            console_registry.register(b.channel.id, b.author.id)
+            await asyncio.gather(on_message(a), on_message(b))
+            return a.channel, b.channel
+
+        ch_a, ch_b = self._run(main())
+        assert [m.content for m in ch_a._sent] == ["응답"]
+        assert [m.content for m in ch_b._sent] == ["응답"]
+
+
+class TestOnMessageDebounce:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("server.claude_client")
+    @patch("server.session_manager")
+    def test_burst_answered_once(self, mock_sm, mock_claude):
+        """연달아 보낸 메시지는 한 프롬프트로 합쳐 한 번만 응답한다"""
+        from message_debouncer import MessageDebouncer
+        from server import on_message
+
+        session = MagicMock()
+        session.build_context.return_value = []
+        mock_sm.load_or_create_session = AsyncMock(return_value=session)
+        mock_claude.send_message = AsyncMock(
+            return_value=ClaudeResponse(text="응답", success=True)
+        )
+
+        async def main():
+            ch = make_mock_channel()
+            with patch("server.message_debouncer", MessageDebouncer(window=0.05)):
+                tasks = []
+                for content in ("로그인", "페이지", "만들어줘"):
+                    tasks.append(asyncio.create_task(
+                        on_message(make_mock_message(content, channel=ch))
+                    ))
+                    await asyncio.sleep(0.01)
+                await asyncio.gather(*tasks)
+            return ch
+
+        ch = self._run(main())
+        mock_claude.send_message.assert_called_once()
+        assert mock_claude.send_message.call_args.args[0] == "로그인\n페이지\n만들어줘"
+        session.add_message.assert_any_call("user", "로그인\n페이지\n만들어줘")
+        assert [m.content for m in ch._sent] == ["응답"]
+
+    def test_typing_extends_console_batch(self):
+        from message_debouncer import MessageDebouncer
+        from server import on_typing
+
+        ch = make_mock_channel()
+        user = MagicMock(bot=False, id=111222333)
+        console_registry.register(ch.id, user.id)
+        debouncer = MagicMock(spec=MessageDebouncer)
+
+        with patch("server.message_debouncer", debouncer):
+            self._run(on_typing(ch, user, None))
+            self._run(on_typing(make_mock_channel("general"), user, None))
+
+        debouncer.typing.assert_called_once_with("111222333")
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 # server.py 임포트 전에 환경변수 설정
 os.environ.setdefault("DISCORD_TOKEN", "test-token")
 os.environ.setdefault("DISCORD_GUILD_ID", "123456789")
+os.environ.setdefault("CONSOLE_DEBOUNCE", "0")
 
 import discord
 
@@ -46,6 +47,7 @@ class TestOnReady:
 
         new_ch = make_mock_channel(has_messages=False)
         mgr_instance = MockChannelMgr.return_value
+        mgr_instance.tag_consoles = AsyncMock()
         mgr_instance.create_user_console = AsyncMock(return_value=new_ch)
 
         from server import on_ready
@@ -68,6 +70,7 @@ class TestOnReady:
 
         new_ch = make_mock_channel(has_messages=False)
         mgr_instance = MockChannelMgr.return_value
+        mgr_instance.tag_consoles = AsyncMock()
         mgr_instance.create_user_console = AsyncMock(return_value=new_ch)
 
         from server import on_ready
@@ -88,6 +91,7 @@ class TestOnReady:
 
         existing_ch = make_mock_channel(has_messages=True)
         mgr_instance = MockChannelMgr.return_value
+        mgr_instance.tag_consoles = AsyncMock()
         mgr_instance.create_user_console = AsyncMock(return_value=existing_ch)
 
         from server import on_ready
@@ -111,23 +115,176 @@ class TestOnReady:
     @patch("server.ChannelManager")
     @patch("server.bot")
     def test_continues_on_member_error(self, mock_bot, MockChannelMgr):
-        """한 멤버에서 에러가 발생해도 나머지 멤버는 계속 처리한다"""
+        """한 멤버에서 에러가 발생해도 나머지 멤버는 계속 처리하고 실패한 멤버는 재시도 큐에 넣는다"""
         guild = MagicMock()
-        guild.members = [
-            make_mock_member("alice"),
-            make_mock_member("bob"),
-        ]
+        alice = make_mock_member("alice")
+        alice.id = 1
+        bob = make_mock_member("bob")
+        bob.id = 2
+        guild.members = [alice, bob]
         mock_bot.get_guild.return_value = guild
 
         new_ch = make_mock_channel(has_messages=False)
         mgr_instance = MockChannelMgr.return_value
+        mgr_instance.tag_consoles = AsyncMock()
         mgr_instance.create_user_console = AsyncMock(
             side_effect=[Exception("테스트 에러"), new_ch]
         )
 
-        from server import on_ready
+        from server import console_provisioner, on_ready
 
-        self._run(on_ready())
+        async def main():
+            await on_ready()
+            pending = console_provisioner.pending_retries
+            await console_provisioner.close()
+            return pending
+
+        pending = self._run(main())
 
         assert mgr_instance.create_user_console.call_count == 2
         new_ch.send.assert_called_once()
+        assert pending == [1]
+
+
+class TestOnMemberJoin:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("server.ChannelManager")
+    def test_creates_console_for_new_member(self, MockChannelMgr):
+        """새 멤버가 들어오면 콘솔을 만들고 웰컴 메시지를 보낸다"""
+        member = make_mock_member("carol")
+        member.guild.id = 123456789
+        new_ch = make_mock_channel(has_messages=False)
+        mgr_instance = MockChannelMgr.return_value
+        mgr_instance.tag_consoles = AsyncMock()
+        mgr_instance.create_user_console = AsyncMock(return_value=new_ch)
+
+        from server import on_member_join
+
+        self._run(on_member_join(member))
+
+        mgr_instance.create_user_console.assert_called_once_with(member)
+        new_ch.send.assert_called_once()
+
+    @patch("server.ChannelManager")
+    def test_ignores_bot_member(self, MockChannelMgr):
+        member = make_mock_member("bot", is_bot=True)
+        member.guild.id = 123456789
+
+        from server import on_member_join
+
+        self._run(on_member_join(member))
+
+        MockChannelMgr.return_value.create_user_console.assert_not_called()
+
+
+class TestLazyConsoleMode:
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    @patch("server.CONSOLE_MODE", "lazy")
+    @patch("server.tree")
+    @patch("server.ChannelManager")
+    @patch("server.bot")
+    def test_on_ready_skips_provisioning(self, mock_bot, MockChannelMgr, mock_tree):
+        """lazy 모드에서는 준비 시 콘솔을 만들지 않고 명령만 등록한다"""
+        import server
+
+        guild = MagicMock()
+        guild.members = [make_mock_member("alice")]
+        mock_bot.get_guild.return_value = guild
+        mock_tree.sync = AsyncMock()
+        MockChannelMgr.return_value.tag_consoles = AsyncMock()
+
+        async def main():
+            await server.on_ready()
+            task = server._console_archive_task
+            task.cancel()
+            server._console_archive_task = None
+
+        self._run(main())
+
+        mock_tree.sync.assert_called_once_with(guild=guild)
+        MockChannelMgr.return_value.create_user_console.assert_not_called()
+
+    @patch("server.CONSOLE_MODE", "lazy")
+    @patch("server.ChannelManager")
+    def test_member_join_skipped(self, MockChannelMgr):
+        member = make_mock_member("carol")
+        member.guild.id = 123456789
+
+        from server import on_member_join
+
+        self._run(on_member_join(member))
+
+        MockChannelMgr.return_value.create_user_console.assert_not_called()
+
+    @patch("server.CONSOLE_MODE", "lazy")
+    @patch("server.ChannelManager")
+    @patch("server.bot")
+    def test_dm_opens_console(self, mock_bot, MockChannelMgr):
+        """DM을 보내면 콘솔을 만들고 채널을 안내한다"""
+        member = make_mock_member("alice")
+        guild = MagicMock()
+        guild.get_member.return_value = member
+        member.guild = guild
+        mock_bot.get_guild.return_value = guild
+        console = make_mock_channel(has_messages=False)
+        console.mention = "<#1>"
+        MockChannelMgr.return_value.create_user_console = AsyncMock(return_value=console)
+
+        message = MagicMock()
+        message.author.bot = False
+        message.channel = MagicMock(spec=discord.DMChannel)
+        message.channel.send = AsyncMock()
+
+        from server import on_message
+
+        self._run(on_message(message))
+
+        MockChannelMgr.return_value.create_user_console.assert_called_once_with(member)
+        console.send.assert_called_once()
+        assert "<#1>" in message.channel.send.call_args.args[0]
+
+    @patch("server.ChannelManager")
+    def test_dm_ignored_in_eager_mode(self, MockChannelMgr):
+        message = MagicMock()
+        message.author.bot = False
+        message.channel = MagicMock(spec=discord.DMChannel)
+        message.channel.send = AsyncMock()
+
+        from server import on_message
+
+        self._run(on_message(message))
+
+        message.channel.send.assert_not_called()
+        MockChannelMgr.return_value.create_user_console.assert_not_called()
+
+    @patch("server.SESSION_DB_PATH", None)
+    @patch("server.CONSOLE_ARCHIVE_DELETE", True)
+    def test_delete_refused_without_session_store(self):
+        """세션 저장소가 없으면 삭제 설정이 있어도 유휴 콘솔을 보관한다"""
+        from server import delete_idle_consoles
+
+        assert delete_idle_consoles() is False
+
+    @patch("server.SESSION_DB_PATH", "sessions.db")
+    @patch("server.CONSOLE_ARCHIVE_DELETE", True)
+    def test_delete_allowed_with_session_store(self):
+        from server import delete_idle_consoles
+
+        assert delete_idle_consoles() is True
+
+
+class TestWorkerRelease:
+    def test_session_end_and_console_cleanup_release_worker(self):
+        """세션이 끝나거나 콘솔 등록이 지워지면 상주 워커 할당을 해제한다"""
+        import server
+
+        pool = MagicMock()
+        with patch.object(server.claude_client, "pool", pool):
+            server.session_manager.on_session_end("111")
+            server.get_channel_manager(MagicMock()).on_forget(222)
+
+        assert [c.args for c in pool.release.call_args_list] == [("111",), ("222",)]
@@ -0,0 +1,88 @@
+"""outbox_store 단위 테스트"""
+
+import sqlite3
+import time
+from datetime import datetime
+
+import discord
+
+from notification_outbox import KIND_EMBED, KIND_MESSAGE, Notification
+from outbox_store import SQLiteOutboxStore
+
+
+def make_store(tmp_path):
+    return SQLiteOutboxStore(str(tmp_path / "outbox.db"))
+
+
+def make_notification(notification_id, kind=KIND_MESSAGE, key=None):
+    return Notification(
+        notification_id=notification_id, channel_name="💬-자유톡", kind=kind, idempotency_key=key,
+    )
+
+
+class TestSQLiteOutboxStore:
+    def test_wal_mode(self, tmp_path):
+        store = make_store(tmp_path)
+        store.close()
+        conn = sqlite3.connect(store.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_pending_round_trip(self, tmp_path):
+        store = make_store(tmp_path)
+        embed = discord.Embed(title="✅ 작업 완료", description="배포", color=0x2ECC71)
+        store.add(make_notification("a", kind=KIND_EMBED), 1, embed, None)
+        store.add(make_notification("b"), 2, None, "hello")
+        pending = store.pending()
+        store.close()
+
+        assert [(cid, n.notification_id) for cid, n, _, _ in pending] == [(1, "a"), (2, "b")]
+        assert pending[0][2].title == "✅ 작업 완료"
+        assert pending[0][2].color.value == 0x2ECC71
+        assert pending[1][3] == "hello"
+
+    def test_sent_and_failed_not_pending(self, tmp_path):
+        store = make_store(tmp_path)
+        sent, failed, waiting = (make_notification(i) for i in ("a", "b", "c"))
+        for n in (sent, failed, waiting):
+            store.add(n, 1, None, "x")
+        sent.attempts, sent.message_id, sent.sent_at = 1, 99, datetime.now()
+        store.mark_sent([sent])
+        failed.attempts, failed.error = 1, "403"
+        store.mark_failed([failed])
+        waiting.attempts, waiting.error = 2, "503"
+        store.mark_attempt([waiting])
+
+        pending = store.pending()
+        stored_sent = store.get("a")
+        store.close()
+
+        assert [n.notification_id for _, n, _, _ in pending] == ["c"]
+        assert pending[0][1].attempts == 2
+        assert stored_sent.status == "sent"
+        assert stored_sent.message_id == 99
+
+    def test_get_by_key(self, tmp_path):
+        store = make_store(tmp_path)
+        store.add(make_notification("a", key="build-42"), 1, None, "x")
+        found = store.get_by_key("build-42")
+        missing = store.get_by_key("없음")
+        store.close()
+        assert found.notification_id == "a"
+        assert missing is None
+
+    def test_prune_keeps_queued(self, tmp_path):
+        store = make_store(tmp_path)
+        old_sent = make_notification("a")
+        old_queued = make_notification("b")
+        old_sent.created_at = old_queued.created_at = datetime.fromtimestamp(time.time() - 100)
+        store.add(old_sent, 1, None, "x")
+        store.add(old_queued, 1, None, "y")
+        old_sent.sent_at = datetime.now()
+        store.mark_sent([old_sent])
+
+        removed = store.prune(retention=10)
+        remaining = [n.notification_id for _, n, _, _ in store.pending()]
+        store.close()
+        assert removed == 1
+        assert remaining == ["b"]
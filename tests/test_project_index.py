@@ -0,0 +1,192 @@
+"""project_index 단위 테스트"""
+
+import json
+from unittest.mock import MagicMock
+
+import discord
+
+from project_index import ProjectIndex, parse_category_name
+
+
+_next_id = iter(range(1000, 100000))
+
+
+def make_channel(name, category=None):
+    ch = MagicMock()
+    ch.name = name
+    ch.id = next(_next_id)
+    ch.category_id = category.id if category is not None else None
+    return ch
+
+
+def make_category(name, ch_names=()):
+    cat = MagicMock(spec=discord.CategoryChannel)
+    cat.name = name
+    cat.id = next(_next_id)
+    cat.channels = [make_channel(n, cat) for n in ch_names]
+    return cat
+
+
+def make_guild(*categories):
+    guild = MagicMock()
+    guild.categories = list(categories)
+    return guild
+
+
+class TestParseCategoryName:
+    def test_project_category(self):
+        assert parse_category_name("my-app / 기획") == ("my-app", "기획")
+
+    def test_team_name_with_separator(self):
+        assert parse_category_name("a / b / c") == ("a", "b / c")
+
+    def test_non_project_category(self):
+        assert parse_category_name("일반카테고리") is None
+
+
+class TestBuild:
+    def test_indexes_only_project_categories(self):
+        guild = make_guild(
+            make_category("my-app / 기획", ["📋-기획-일반"]),
+            make_category("my-app / 공통", ["🤖-claude-알림"]),
+            make_category("🤖 Bot Consoles", ["bot-console-alice"]),
+        )
+        index = ProjectIndex(guild)
+        assert index.list_projects() == {"my-app": ["기획", "공통"]}
+        assert index.find_channel("my-app", "bot-console") is None
+
+    def test_find_channel(self):
+        guild = make_guild(make_category("my-app / 공통", ["💬-자유톡", "🤖-claude-알림"]))
+        index = ProjectIndex(guild)
+        assert index.find_channel("my-app", "claude-알림").name == "🤖-claude-알림"
+        assert index.find_channel("other", "claude-알림") is None
+
+    def test_lookup_cached(self):
+        cat = make_category("my-app / 공통", ["🤖-claude-알림"])
+        index = ProjectIndex(make_guild(cat))
+        first = index.find_channel("my-app", "claude")
+        # 캐시 적중 시 채널 목록을 다시 스캔하지 않는다
+        index._channels[cat.id].clear()
+        assert index.find_channel("my-app", "claude") is first
+
+
+class TestIncrementalUpdate:
+    def test_category_create_and_channel_create(self):
+        index = ProjectIndex(make_guild())
+        cat = make_category("my-app / QA")
+        index.on_channel_create(cat)
+        ch = make_channel("🐛-QA-이슈", cat)
+        index.on_channel_create(ch)
+        assert index.get_teams("my-app") == {"QA": cat}
+        assert index.find_channel("my-app", "이슈") is ch
+
+    def test_channel_outside_project_ignored(self):
+        index = ProjectIndex(make_guild())
+        index.on_channel_create(make_channel("general"))
+        assert index.list_projects() == {}
+
+    def test_channel_delete_invalidates_lookup(self):
+        cat = make_category("my-app / 공통", ["🤖-claude-알림"])
+        index = ProjectIndex(make_guild(cat))
+        ch = index.find_channel("my-app", "claude")
+        index.on_channel_delete(ch)
+        assert index.find_channel("my-app", "claude") is None
+
+    def test_category_delete_removes_project(self):
+        cat = make_category("my-app / 공통", ["🤖-claude-알림"])
+        index = ProjectIndex(make_guild(cat))
+        index.on_channel_delete(cat)
+        assert not index.has_project("my-app")
+        assert index.find_channel("my-app", "claude") is None
+
+    def test_category_rename_keeps_channels(self):
+        cat = make_category("my-app / 공통", ["🤖-claude-알림"])
+        index = ProjectIndex(make_guild(cat))
+        renamed = MagicMock(spec=discord.CategoryChannel)
+        renamed.name = "new-app / 공통"
+        renamed.id = cat.id
+        index.on_channel_update(cat, renamed)
+        assert not index.has_project("my-app")
+        assert index.find_channel("new-app", "claude") is not None
+
+    def test_channel_moved_between_categories(self):
+        src = make_category("my-app / 기획", ["📝-회의록"])
+        dst = make_category("my-app / 공통")
+        index = ProjectIndex(make_guild(src, dst))
+        before = src.channels[0]
+        after = make_channel("📝-회의록", dst)
+        after.id = before.id
+        index.on_channel_update(before, after)
+        assert index.get_channels(src) == []
+        assert index.get_channels(dst) == [after]
+
+
+class TestDuplicateNames:
+    """같은 이름의 카테고리는 ID가 가장 작은(먼저 만든) 카테고리를 사용한다"""
+
+    def test_oldest_wins_regardless_of_order(self):
+        old = make_category("my-app / 공통", ["💬-자유톡"])
+        new = make_category("my-app / 공통", ["💬-자유톡"])
+        for categories in ([old, new], [new, old]):
+            index = ProjectIndex(make_guild(*categories))
+            assert index.get_category("my-app", "공통") is old
+            assert index.find_channel("my-app", "자유톡") is old.channels[0]
+
+    def test_event_order_does_not_matter(self):
+        old = make_category("my-app / 공통", ["💬-자유톡"])
+        new = make_category("my-app / 공통", ["💬-자유톡"])
+        index = ProjectIndex(make_guild(new))
+        index.on_channel_create(old)
+        assert index.get_category("my-app", "공통") is old
+
+    def test_falls_back_when_winner_deleted(self):
+        old = make_category("my-app / 공통", ["💬-자유톡"])
+        new = make_category("my-app / 공통", ["💬-자유톡"])
+        index = ProjectIndex(make_guild(old, new))
+        index.on_channel_delete(old)
+        assert index.get_category("my-app", "공통") is new
+        assert index.find_channel("my-app", "자유톡") is new.channels[0]
+        index.on_channel_delete(new)
+        assert not index.has_project("my-app")
+
+
+class TestSnapshot:
+    def test_snapshot_reused_until_change(self):
+        """변경이 없으면 같은 JSON 문자열을 재사용한다"""
+        index = ProjectIndex(make_guild(make_category("my-app / 기획", ["📋-기획-일반"])))
+        first = index.snapshot()
+        assert index.snapshot() is first
+        assert json.loads(first) == {"my-app": ["기획"]}
+
+    def test_version_bumps_on_events(self):
+        cat = make_category("my-app / 기획")
+        index = ProjectIndex(make_guild(cat))
+        first = index.snapshot()
+        version = index.version
+
+        index.on_channel_create(make_category("my-app / 백엔드"))
+
+        assert index.version > version
+        assert json.loads(index.snapshot()) == {"my-app": ["기획", "백엔드"]}
+        assert index.snapshot() is not first
+
+    def test_detailed_tree(self):
+        cat = make_category("my-app / 기획", ["📋-기획-일반", "📝-회의록"])
+        index = ProjectIndex(make_guild(cat))
+
+        data = json.loads(index.snapshot(detailed=True))
+
+        team = data["my-app"]["기획"]
+        assert team["category_id"] == str(cat.id)
+        assert team["channel_count"] == 2
+        assert [c["name"] for c in team["channels"]] == ["📋-기획-일반", "📝-회의록"]
+
+    def test_detailed_invalidated_by_channel_delete(self):
+        cat = make_category("my-app / 기획", ["📋-기획-일반"])
+        index = ProjectIndex(make_guild(cat))
+        index.snapshot(detailed=True)
+
+        index.on_channel_delete(cat.channels[0])
+
+        data = json.loads(index.snapshot(detailed=True))
+        assert data["my-app"]["기획"]["channel_count"] == 0
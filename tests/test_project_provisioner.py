@@ -0,0 +1,186 @@
+"""project_provisioner 단위 테스트"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from project_index import ProjectIndex
+from project_provisioner import ProjectProvisioner, ProvisionResult, ProvisionStep
+
+
+class _Tracker:
+    """동시 실행 중인 REST 호출 수를 추적한다."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call(self, value):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return value
+
+
+def make_guild(tracker):
+    guild = MagicMock()
+    guild.categories = []
+
+    async def create_category(name):
+        cat = MagicMock()
+        cat.name = name
+        cat.channels = []
+
+        async def create_text_channel(ch_name, **kwargs):
+            ch = MagicMock()
+            ch.name = ch_name
+            ch.position = kwargs.get("position")
+            cat.channels.append(ch)
+            return await tracker.call(ch)
+
+        cat.create_text_channel = AsyncMock(side_effect=create_text_channel)
+        guild.categories.append(cat)
+        return await tracker.call(cat)
+
+    guild.create_category = create_category
+    return guild
+
+
+TEAMS = {
+    "기획": ["📋-기획-일반", "📝-회의록", "🎯-마일스톤"],
+    "공통": ["🤖-claude-알림", "📢-공지사항", "💬-자유톡"],
+}
+
+
+class TestProjectProvisioner:
+    def test_creates_all_categories_and_channels(self):
+        tracker = _Tracker()
+        guild = make_guild(tracker)
+        result = asyncio.run(ProjectProvisioner().provision(guild, "my-app", TEAMS))
+
+        assert result.category_names == ["my-app / 기획", "my-app / 공통"]
+        assert result.channel_count == 6
+        assert len(result.steps) == 8
+
+    def test_respects_concurrency_limit(self):
+        tracker = _Tracker()
+        guild = make_guild(tracker)
+        asyncio.run(ProjectProvisioner(concurrency=2).provision(guild, "my-app", TEAMS))
+        assert tracker.peak == 2
+
+    def test_runs_requests_concurrently(self):
+        tracker = _Tracker()
+        guild = make_guild(tracker)
+        asyncio.run(ProjectProvisioner(concurrency=10).provision(guild, "my-app", TEAMS))
+        assert tracker.peak > 2
+
+    def test_channel_positions_follow_template(self):
+        tracker = _Tracker()
+        guild = make_guild(tracker)
+        asyncio.run(ProjectProvisioner().provision(guild, "my-app", TEAMS))
+        cat = guild.categories[0]
+        ordered = sorted(cat.channels, key=lambda ch: ch.position)
+        assert [ch.name for ch in ordered] == TEAMS["기획"]
+
+    def test_updates_index(self):
+        tracker = _Tracker()
+        guild = make_guild(tracker)
+        index = ProjectIndex(guild)
+        asyncio.run(ProjectProvisioner().provision(guild, "my-app", TEAMS, index))
+        assert index.list_projects() == {"my-app": ["기획", "공통"]}
+        assert index.find_channel("my-app", "claude-알림") is not None
+
+    def test_invalid_concurrency(self):
+        try:
+            ProjectProvisioner(concurrency=0)
+            assert False
+        except ValueError:
+            pass
+
+
+class TestProvisionResult:
+    def test_timing_summary(self):
+        result = ProvisionResult(
+            steps=[
+                ProvisionStep("category:a / b", 0.2),
+                ProvisionStep("channel:x", 0.1),
+                ProvisionStep("channel:y", 0.3),
+            ],
+            elapsed=0.5,
+        )
+        summary = result.timing_summary()
+        assert "소요 시간 0.50초" in summary
+        assert "카테고리 평균 0.20초" in summary
+        assert "채널 평균 0.20초" in summary
+
+    def test_timing_summary_without_steps(self):
+        assert ProvisionResult().timing_summary() == "소요 시간 0.00초"
+
+
+def make_teardown_category(name, ch_names, fail=()):
+    cat = MagicMock()
+    cat.name = name
+    cat.delete = AsyncMock()
+    channels = []
+    for ch_name in ch_names:
+        ch = MagicMock()
+        ch.name = ch_name
+        if ch_name in fail:
+            ch.delete = AsyncMock(side_effect=RuntimeError("boom"))
+        else:
+            ch.delete = AsyncMock()
+        channels.append(ch)
+    cat.channels = channels
+    return cat
+
+
+class TestTeardown:
+    def test_deletes_channels_then_categories(self):
+        cats = [
+            make_teardown_category("my-app / 기획", ["a", "b"]),
+            make_teardown_category("my-app / 공통", ["c"]),
+        ]
+        result = asyncio.run(ProjectProvisioner().teardown("my-app", cats))
+        assert result.deleted_channels == 3
+        assert result.deleted_categories == 2
+        assert result.failures == []
+        for cat in cats:
+            cat.delete.assert_called_once()
+
+    def test_keeps_category_when_channel_fails(self):
+        cat = make_teardown_category("my-app / 기획", ["a", "b"], fail=("b",))
+        result = asyncio.run(ProjectProvisioner().teardown("my-app", [cat]))
+        assert result.deleted_channels == 1
+        assert result.deleted_categories == 0
+        cat.delete.assert_not_called()
+        assert any("b: boom" in f for f in result.failures)
+
+    def test_not_found_counts_as_deleted(self):
+        import discord
+
+        cat = make_teardown_category("my-app / 기획", ["a"])
+        response = MagicMock(status=404, reason="Not Found")
+        cat.channels[0].delete = AsyncMock(side_effect=discord.NotFound(response, "gone"))
+        result = asyncio.run(ProjectProvisioner().teardown("my-app", [cat]))
+        assert result.deleted_channels == 1
+        assert result.deleted_categories == 1
+
+    def test_reports_progress(self):
+        cat = make_teardown_category("my-app / 기획", ["a", "b"])
+        progress = []
+        asyncio.run(ProjectProvisioner().teardown(
+            "my-app", [cat], on_progress=lambda done, total: progress.append((done, total))
+        ))
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    def test_respects_concurrency_limit(self):
+        tracker = _Tracker()
+        cat = make_teardown_category("my-app / 기획", [f"ch{i}" for i in range(6)])
+
+        async def delete():
+            await tracker.call(None)
+
+        for ch in cat.channels:
+            ch.delete = AsyncMock(side_effect=delete)
+        asyncio.run(ProjectProvisioner(concurrency=3).teardown("my-app", [cat]))
+        assert tracker.peak == 3
@@ -1,9 +1,11 @@
 """session_manager 단위 테스트"""
 
+import asyncio
 import time
 from datetime import datetime, timedelta
 
-from session_manager import ConversationSession, SessionManager
+from config import MAX_SESSION_MESSAGES
+from session_manager import ConversationSession, Message, SessionManager
 
 
 class TestConversationSession:
@@ -36,6 +38,13 @@ class TestConversationSession:
         session.clear()
         assert len(session.messages) == 0
 
+    def test_clear_forgets_cli_session(self):
+        """히스토리를 지우면 CLI 대화도 이어가지 않는다"""
+        session = ConversationSession(user_id="user1")
+        session.cli_session_id = "abc"
+        session.clear()
+        assert session.cli_session_id is None
+
     def test_last_activity_updated(self):
         session = ConversationSession(user_id="user1")
         before = session.last_activity
@@ -117,6 +126,20 @@ class TestSessionManager:
         assert deleted == 1
         assert manager.active_count == 1
 
+    def test_session_end_callback(self):
+        """만료, LRU 제거, 삭제로 세션이 끝나면 유저 ID로 콜백을 호출한다"""
+        ended = []
+        manager = SessionManager(max_sessions=2)
+        manager.on_session_end = ended.append
+        manager.get_or_create_session("old").last_activity = datetime.now() - timedelta(hours=25)
+        manager.cleanup_old_sessions(hours=24)
+        manager.get_or_create_session("a")
+        manager.get_or_create_session("b")
+        manager.get_or_create_session("c")
+        manager.delete_session("c")
+        manager.delete_session("없는유저")
+        assert ended == ["old", "a", "c"]
+
     def test_cleanup_no_old_sessions(self):
         manager = SessionManager()
         manager.get_or_create_session("user1")
@@ -157,3 +180,166 @@ class TestSessionManager:
         manager = SessionManager()
         sessions = manager.list_sessions()
         assert sessions == {}
+
+
+class TestBoundedMemory:
+    def test_messages_capped(self):
+        session = ConversationSession(user_id="user1")
+        for i in range(MAX_SESSION_MESSAGES + 20):
+            session.add_message("user", f"메시지 {i}")
+        assert len(session.messages) == MAX_SESSION_MESSAGES
+        assert session.messages[-1]["content"] == f"메시지 {MAX_SESSION_MESSAGES + 19}"
+        assert session.get_recent_messages(limit=10)[0]["content"] == (
+            f"메시지 {MAX_SESSION_MESSAGES + 10}"
+        )
+
+    def test_lru_eviction(self):
+        manager = SessionManager(max_sessions=2)
+        manager.get_or_create_session("a")
+        manager.get_or_create_session("b")
+        manager.get_or_create_session("a")  # a 최근 사용
+        manager.get_or_create_session("c")
+        assert manager.get_session("b") is None
+        assert manager.get_session("a") is not None
+        assert manager.memory_stats()["evicted"] == 1
+
+    def test_memory_stats(self):
+        manager = SessionManager()
+        manager.get_or_create_session("a").add_message("user", "안녕")
+        manager.get_or_create_session("b")
+        stats = manager.memory_stats()
+        assert stats["sessions"] == 2
+        assert stats["messages"] == 1
+        assert stats["approx_bytes"] > 0
+
+    def test_periodic_cleanup(self):
+        manager = SessionManager()
+        old = manager.get_or_create_session("old")
+        old.last_activity = datetime.now() - timedelta(hours=25)
+
+        async def main():
+            manager.start_cleanup(interval=0.01, hours=24)
+            await asyncio.sleep(0.05)
+            await manager.stop_cleanup()
+
+        asyncio.run(main())
+        assert manager.get_session("old") is None
+        assert manager.memory_stats()["expired"] == 1
+
+
+class TestMessage:
+    def test_dict_compatible(self):
+        m = Message("assistant", "응답")
+        assert m["role"] == "assistant"
+        assert m["content"] == "응답"
+        assert m == {"role": "assistant", "content": "응답"}
+        assert m.to_dict() == {"role": "assistant", "content": "응답"}
+        assert m.timestamp > 0
+
+    def test_no_instance_dict(self):
+        assert not hasattr(Message("user", "x"), "__dict__")
+
+    def test_unknown_key(self):
+        import pytest
+
+        with pytest.raises(KeyError):
+            Message("user", "x")["timestamp"]
+
+    def test_custom_role_interned(self):
+        a = Message("tool", "x")
+        b = Message("tool", "y")
+        assert a.role == "tool"
+        assert a._role == b._role
+
+
+class TestRecentWindow:
+    def test_view_without_copy(self):
+        session = ConversationSession(user_id="user1")
+        for i in range(20):
+            session.add_message("user", str(i))
+        view = session.iter_recent(5)
+        assert len(view) == 5
+        assert [m.content for m in view] == ["15", "16", "17", "18", "19"]
+        assert view[0] is session.messages[15]
+        assert view[-1].content == "19"
+        assert [m.content for m in view[1:3]] == ["16", "17"]
+
+    def test_view_all(self):
+        session = ConversationSession(user_id="user1")
+        session.add_message("user", "a")
+        assert len(session.iter_recent(0)) == 1
+        assert len(session.iter_recent(10)) == 1
+
+    def test_to_dict_returns_plain_dicts(self):
+        session = ConversationSession(user_id="user1")
+        session.add_message("user", "안녕")
+        d = session.to_dict(message_limit=5)
+        assert type(d["recent_messages"][0]) is dict
+
+
+class TestBuildContext:
+    def test_fits_budget(self):
+        session = ConversationSession(user_id="user1")
+        for i in range(10):
+            session.add_message("user", "x" * 100)  # 메시지당 108자
+        context = session.build_context(budget=350)
+        assert len(context) == 3
+        assert sum(m.size for m in context) <= 350
+
+    def test_short_messages_beyond_ten(self):
+        """짧은 메시지는 10개를 넘어도 예산 안에서 포함된다"""
+        session = ConversationSession(user_id="user1")
+        for i in range(30):
+            session.add_message("user", "네")
+        assert len(session.build_context(budget=10_000, max_messages=25)) == 25
+
+    def test_long_reply_truncated(self):
+        session = ConversationSession(user_id="user1")
+        session.add_message("user", "질문")
+        session.add_message("assistant", "긴 답변" * 1000)
+        context = session.build_context(budget=500)
+        assert len(context) == 1
+        assert context[0].size <= 500
+        assert context[0].content.endswith("…(생략)")
+        # 원본은 그대로 유지
+        assert len(session.messages[-1].content) == 4000
+
+    def test_size_matches_format_context(self):
+        from claude_code_client import format_context
+
+        session = ConversationSession(user_id="user1")
+        session.add_message("user", "안녕")
+        session.add_message("assistant", "반갑습니다")
+        context = session.build_context()
+        body = format_context(context).split("\n", 1)[1]
+        assert len(body) + 1 == sum(m.size for m in context)
+
+    def test_rolling_summary(self):
+        session = ConversationSession(user_id="user1")
+        for i in range(10):
+            session.add_message("user", f"질문 {i}\n세부 내용")
+        context = session.build_context(budget=1000 + 40, summarize=True, summary_chars=1000)
+        assert context[0].role == "system"
+        assert "- user: 질문 0" in context[0].content
+        assert "세부 내용" not in context[0].content
+        assert [m.content for m in context[1:]] == ["질문 8\n세부 내용", "질문 9\n세부 내용"]
+
+        # 새로 밀려난 메시지만 요약에 추가된다
+        session.add_message("assistant", "답변")
+        session.build_context(budget=1000 + 40, summarize=True, summary_chars=1000)
+        assert session.summary[-1] == "- user: 질문 8"
+        assert len(session.summary) == 9
+
+    def test_summary_bounded(self):
+        session = ConversationSession(user_id="user1")
+        for i in range(40):
+            session.add_message("user", f"메시지 {i}")
+        session.build_context(budget=100 + 20, summarize=True, summary_chars=100)
+        assert sum(len(line) + 1 for line in session.summary) <= 100
+        assert session.summary[-1].endswith("메시지 38")
+
+    def test_no_summary_when_everything_fits(self):
+        session = ConversationSession(user_id="user1")
+        session.add_message("user", "안녕")
+        context = session.build_context(summarize=True)
+        assert [m.role for m in context] == ["user"]
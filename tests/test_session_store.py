@@ -0,0 +1,166 @@
+"""session_store 단위 테스트"""
+
+import asyncio
+import sqlite3
+import time
+
+from session_manager import SessionManager
+from session_store import SQLiteSessionStore
+
+
+def make_store(tmp_path):
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+class TestSQLiteSessionStore:
+    def test_wal_mode(self, tmp_path):
+        store = make_store(tmp_path)
+        store.close()
+        conn = sqlite3.connect(store.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_append_and_load(self, tmp_path):
+        store = make_store(tmp_path)
+        store.append("u1", "user", "안녕")
+        store.append("u1", "assistant", "반가워요")
+        store.append("u2", "user", "다른 유저")
+        loaded = store.load("u1", limit=10)
+        store.close()
+        assert loaded.messages == [
+            {"role": "user", "content": "안녕"},
+            {"role": "assistant", "content": "반가워요"},
+        ]
+
+    def test_load_limit_returns_latest(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(20):
+            store.append("u1", "user", f"메시지 {i}")
+        loaded = store.load("u1", limit=5)
+        store.close()
+        assert [m["content"] for m in loaded.messages] == [f"메시지 {i}" for i in range(15, 20)]
+
+    def test_load_missing(self, tmp_path):
+        store = make_store(tmp_path)
+        assert store.load("없음", limit=10) is None
+        store.close()
+
+    def test_clear_and_delete(self, tmp_path):
+        store = make_store(tmp_path)
+        store.append("u1", "user", "a")
+        store.append("u2", "user", "b")
+        store.clear("u1")
+        store.delete("u2")
+        assert store.load("u1", limit=10).messages == []
+        assert store.load("u2", limit=10) is None
+        store.close()
+
+    def test_compact(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(10):
+            store.append("u1", "user", str(i))
+        store.append("u2", "user", "x")
+        store.compact(3)
+        store.flush()
+        count = store._reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        loaded = store.load("u1", limit=10)
+        store.close()
+        assert count == 4
+        assert [m["content"] for m in loaded.messages] == ["7", "8", "9"]
+
+    def test_load_waits_only_for_own_writes(self, tmp_path):
+        """다른 유저의 변경이 남아 있어도 기다리지 않는다"""
+        store = make_store(tmp_path)
+        store.append("u1", "user", "안녕")
+        store.flush()
+        with store._pending_lock:
+            store._pending["u2"] = 1  # 기록되지 않은 u2 변경
+        loaded = store.load("u1", limit=10)
+        with store._pending_lock:
+            store._pending.pop("u2")
+        store.close()
+        assert [m["content"] for m in loaded.messages] == ["안녕"]
+
+    def test_writes_batched(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(100):
+            store.append("u1", "user", str(i))
+        store.flush()
+        stats = store.stats()
+        store.close()
+        assert stats["written"] == 100
+        assert stats["batches"] <= 100
+
+
+class TestSessionManagerPersistence:
+    def test_restores_after_restart(self, tmp_path):
+        store = make_store(tmp_path)
+        manager = SessionManager(store=store)
+        session = manager.get_or_create_session("u1")
+        session.add_message("user", "기억해줘")
+        session.add_message("assistant", "알겠습니다")
+        store.close()
+
+        # 재시작
+        store = make_store(tmp_path)
+        manager = SessionManager(store=store)
+        assert manager.active_count == 0  # 시작 시 전체 로드 없음
+        restored = manager.get_or_create_session("u1")
+        store.close()
+        assert restored.get_recent_messages() == [
+            {"role": "user", "content": "기억해줘"},
+            {"role": "assistant", "content": "알겠습니다"},
+        ]
+
+    def test_reload_after_eviction(self, tmp_path):
+        store = make_store(tmp_path)
+        manager = SessionManager(max_sessions=1, store=store)
+        manager.get_or_create_session("u1").add_message("user", "첫 번째")
+        manager.get_or_create_session("u2")  # u1 메모리에서 제거
+        assert manager.get_session("u1") is None
+        restored = manager.get_or_create_session("u1")
+        store.close()
+        assert restored.messages[0]["content"] == "첫 번째"
+
+    def test_delete_session_removes_from_store(self, tmp_path):
+        store = make_store(tmp_path)
+        manager = SessionManager(store=store)
+        manager.get_or_create_session("u1").add_message("user", "삭제")
+        manager.delete_session("u1")
+        assert store.load("u1", limit=10) is None
+        store.close()
+
+    def test_async_load_off_event_loop(self, tmp_path):
+        """저장소 읽기가 느려도 이벤트 루프는 계속 돈다"""
+        store = make_store(tmp_path)
+        SessionManager(store=store).get_or_create_session("u1").add_message("user", "복원")
+        manager = SessionManager(store=store)
+        real_load = store.load
+
+        def slow_load(user_id, limit):
+            time.sleep(0.2)
+            return real_load(user_id, limit)
+
+        store.load = slow_load
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            first, second = await asyncio.gather(
+                manager.load_or_create_session("u1"), manager.load_or_create_session("u1")
+            )
+            task.cancel()
+            return first, second, ticks
+
+        first, second, ticks = asyncio.run(main())
+        store.close()
+        assert ticks >= 5
+        assert first is second
+        assert first.messages[0]["content"] == "복원"
@@ -8,13 +8,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import os
 os.environ.setdefault("DISCORD_TOKEN", "test-token")
 os.environ.setdefault("DISCORD_GUILD_ID", "123456789")
+os.environ.setdefault("CONSOLE_DEBOUNCE", "0")
 
 import discord
+import pytest
+from notification_outbox import NotificationOutbox
 from server import (
     handle_create_project,
     handle_add_team,
     handle_add_channel,
     handle_delete_project,
+    handle_get_job_status,
     handle_list_projects,
     handle_send_notification,
     handle_send_message,
@@ -67,8 +71,12 @@ def _make_category(name, ch_names):
     return cat
 
 
+_message_ids = iter(range(1, 1_000_000))
+
+
 def make_mock_message(author_name, content, time_str="2026-02-28 14:30"):
     msg = MagicMock()
+    msg.id = next(_message_ids)
     msg.author.display_name = author_name
     msg.content = content
     msg.created_at = datetime.datetime.strptime(time_str, "%Y-%m-%d %H:%M")
@@ -217,6 +225,36 @@ class TestDeleteProject:
             except ValueError as e:
                 assert "찾을 수 없습니다" in str(e)
 
+    def test_background_returns_job_id(self):
+        guild = make_mock_guild({"my-app / 공통": ["🤖-claude-알림", "💬-자유톡"]})
+
+        async def run():
+            result = await handle_delete_project(
+                {"project_name": "my-app", "background": True}
+            )
+            job_id = result[0].text.split("job_id: ")[1].split(" ")[0]
+            from jobs import job_registry
+            await job_registry.wait(job_id)
+            status = await handle_get_job_status({"job_id": job_id})
+            return result, json.loads(status[0].text)
+
+        with patch("server.get_guild", return_value=guild):
+            result, status = asyncio.run(run())
+        assert "삭제 작업 시작" in result[0].text
+        assert status["status"] == "completed"
+        assert status["progress"] == {"done": 3, "total": 3}
+        assert "채널 2개" in status["result"]
+        guild.categories[0].delete.assert_called_once()
+
+
+class TestGetJobStatus:
+    def test_unknown_job(self):
+        try:
+            asyncio.run(handle_get_job_status({"job_id": "없는작업"}))
+            assert False
+        except ValueError as e:
+            assert "찾을 수 없습니다" in str(e)
+
 
 # ---------------------------------------------------------------------------
 # list_projects
@@ -238,6 +276,13 @@ class TestListProjects:
         assert "other" in data
         assert "일반카테고리" not in data
 
+    def test_detailed(self):
+        guild = make_mock_guild({"my-app / 기획": ["📋-기획-일반", "📝-회의록"]})
+        with patch("server.get_guild", return_value=guild):
+            result = asyncio.run(handle_list_projects({"detailed": True}))
+        data = json.loads(result[0].text)
+        assert data["my-app"]["기획"]["channel_count"] == 2
+
     def test_empty(self):
         guild = make_mock_guild()
         with patch("server.get_guild", return_value=guild):
@@ -258,26 +303,60 @@ class TestSendNotification:
         guild.categories[0].channels = [alert_ch]
         return guild, alert_ch
 
+    def _notify(self, guild, *arguments_list):
+        """알림을 보내고 outbox가 모두 전송할 때까지 기다린다."""
+        outbox = NotificationOutbox(window=0, min_interval=0)
+
+        async def main():
+            results = [await handle_send_notification(args) for args in arguments_list]
+            await outbox.drain()
+            return results
+
+        with patch("server.get_guild", return_value=guild), \
+                patch("server.notification_outbox", outbox):
+            return asyncio.run(main()), outbox
+
     def test_plan(self):
         guild, alert_ch = self._make_guild_with_alert()
-        with patch("server.get_guild", return_value=guild):
-            result = asyncio.run(handle_send_notification({
-                "project_name": "my-app", "message": "계획 수립", "event_type": "plan",
-            }))
-        assert "플랜 작성" in result[0].text
-        embed = alert_ch.send.call_args.kwargs.get("embed") or alert_ch.send.call_args.args[0]
+        results, _ = self._notify(guild, {
+            "project_name": "my-app", "message": "계획 수립", "event_type": "plan",
+        })
+        assert "플랜 작성" in results[0][0].text
+        embed = alert_ch.send.call_args.kwargs["embeds"][0]
         assert isinstance(embed, discord.Embed)
         assert embed.color.value == 0x3498DB
 
     def test_error(self):
         guild, alert_ch = self._make_guild_with_alert()
-        with patch("server.get_guild", return_value=guild):
-            result = asyncio.run(handle_send_notification({
-                "project_name": "my-app", "message": "빌드 실패", "event_type": "error",
-            }))
-        embed = alert_ch.send.call_args.kwargs.get("embed") or alert_ch.send.call_args.args[0]
+        self._notify(guild, {
+            "project_name": "my-app", "message": "빌드 실패", "event_type": "error",
+        })
+        embed = alert_ch.send.call_args.kwargs["embeds"][0]
         assert embed.color.value == 0xE74C3C
 
+    def test_burst_coalesced(self):
+        """연달아 보낸 알림은 한 메시지로 묶여 전송된다"""
+        guild, alert_ch = self._make_guild_with_alert()
+        events = ["build", "test", "deploy"]
+        results, outbox = self._notify(guild, *(
+            {"project_name": "my-app", "message": e, "event_type": e} for e in events
+        ))
+        alert_ch.send.assert_called_once()
+        assert len(alert_ch.send.call_args.kwargs["embeds"]) == 3
+        notification_id = results[0][0].text.rsplit(" ", 1)[-1]
+        assert asyncio.run(outbox.get(notification_id)).status == "sent"
+
+    def test_idempotency_key(self):
+        """같은 idempotency_key로 다시 호출하면 한 번만 전송한다"""
+        guild, alert_ch = self._make_guild_with_alert()
+        args = {
+            "project_name": "my-app", "message": "배포", "event_type": "deploy",
+            "idempotency_key": "deploy-42",
+        }
+        results, _ = self._notify(guild, args, args)
+        assert results[0][0].text == results[1][0].text
+        assert len(alert_ch.send.call_args.kwargs["embeds"]) == 1
+
     def test_channel_not_found(self):
         guild = make_mock_guild({"my-app / 기획": ["📋-기획-일반"]})
         with patch("server.get_guild", return_value=guild):
@@ -289,6 +368,14 @@ class TestSendNotification:
             except ValueError as e:
                 assert "claude-알림" in str(e)
 
+    def test_too_long_rejected(self):
+        guild = make_mock_guild()
+        with patch("server.get_guild", return_value=guild):
+            with pytest.raises(ValueError, match="너무 깁니다"):
+                asyncio.run(handle_send_notification({
+                    "project_name": "my-app", "message": "가" * 4097, "event_type": "plan",
+                }))
+
     def test_invalid_event_type(self):
         guild = make_mock_guild()
         with patch("server.get_guild", return_value=guild):
@@ -313,12 +400,38 @@ class TestSendMessage:
         guild = make_mock_guild({"my-app / 공통": []})
         guild.categories[0].channels = [ch]
 
-        with patch("server.get_guild", return_value=guild):
-            result = asyncio.run(handle_send_message({
+        outbox = NotificationOutbox(window=0, min_interval=0)
+
+        async def main():
+            result = await handle_send_message({
                 "project_name": "my-app", "channel_keyword": "자유톡", "content": "hello",
-            }))
-        assert "전송 완료" in result[0].text
-        ch.send.assert_called_once_with("hello")
+            })
+            await outbox.drain()
+            return result
+
+        with patch("server.get_guild", return_value=guild), \
+                patch("server.notification_outbox", outbox):
+            result = asyncio.run(main())
+        assert "전송 예약" in result[0].text
+        assert "notification_id:" in result[0].text
+        ch.send.assert_called_once()
+        assert ch.send.call_args.args == ("hello",)
+
+    def test_too_long_rejected(self):
+        """Discord가 거절할 길이는 대기열에 넣지 않고 바로 오류를 낸다"""
+        ch = MagicMock()
+        ch.name = "💬-자유톡"
+        guild = make_mock_guild({"my-app / 공통": []})
+        guild.categories[0].channels = [ch]
+        outbox = NotificationOutbox(window=0, min_interval=0)
+
+        with patch("server.get_guild", return_value=guild), \
+                patch("server.notification_outbox", outbox):
+            with pytest.raises(ValueError, match="너무 깁니다"):
+                asyncio.run(handle_send_message({
+                    "project_name": "my-app", "channel_keyword": "자유톡", "content": "가" * 2001,
+                }))
+        assert outbox.pending == 0
 
     def test_channel_not_found(self):
         guild = make_mock_guild({"my-app / 공통": ["💬-자유톡"]})
@@ -361,6 +474,125 @@ class TestReadMessages:
         assert "Alice" in text
         assert "Bob" in text
 
+    def test_repeated_read_uses_cache(self):
+        """같은 채널을 다시 읽으면 REST 히스토리를 호출하지 않는다"""
+        msg1 = make_mock_message("Alice", "첫 번째", "2026-02-28 14:00")
+        calls = []
+
+        ch = MagicMock()
+        ch.name = "💬-자유톡"
+
+        async def mock_history(limit=10):
+            calls.append(limit)
+            yield msg1
+
+        ch.history = mock_history
+
+        guild = make_mock_guild({"my-app / 공통": []})
+        guild.categories[0].channels = [ch]
+
+        async def main():
+            args = {"project_name": "my-app", "channel_keyword": "자유톡", "limit": 5}
+            await handle_read_messages(args)
+            return await handle_read_messages(args)
+
+        with patch("server.get_guild", return_value=guild):
+            result = asyncio.run(main())
+        assert "Alice" in result[0].text
+        assert len(calls) == 1
+
+    def _read(self, messages, **arguments):
+        """messages(최신순)를 가진 채널에서 read_messages를 호출한다."""
+        ch = MagicMock()
+        ch.name = "💬-자유톡"
+        ch.history_kwargs = []
+
+        async def mock_history(limit=10, before=None, after=None, oldest_first=None):
+            ch.history_kwargs.append({"limit": limit, "before": before, "after": after})
+            msgs = [
+                m for m in messages
+                if (before is None or m.id < before.id) and (after is None or m.id > after.id)
+            ]
+            for m in msgs[:limit]:
+                yield m
+
+        ch.history = mock_history
+        guild = make_mock_guild({"my-app / 공통": []})
+        guild.categories[0].channels = [ch]
+        arguments = {"project_name": "my-app", "channel_keyword": "자유톡", **arguments}
+        with patch("server.get_guild", return_value=guild):
+            result = asyncio.run(handle_read_messages(arguments))
+        return result[0].text, ch
+
+    def _messages(self, count):
+        msgs = [make_mock_message("Alice", f"메시지 {i}") for i in range(count)]
+        return list(reversed(msgs))
+
+    def test_cursor_paging(self):
+        """limit을 넘는 메시지가 있으면 before 커서를 알려주고, 커서로 이어서 읽는다"""
+        messages = self._messages(5)
+        text, _ = self._read(messages, limit=2)
+        assert "메시지 4" in text and "메시지 3" in text
+        assert f"before={messages[1].id}" in text
+
+        text, _ = self._read(messages, limit=2, before=str(messages[1].id))
+        assert "메시지 2" in text and "메시지 1" in text
+        assert "메시지 3" not in text
+
+    def test_huge_limit_clamped(self):
+        """limit이 아주 커도 REST로 전부 가져오지 않는다"""
+        text, ch = self._read(self._messages(5), limit=100000, max_bytes=100)
+        assert "메시지 4" in text
+        from server import message_cache
+        assert all(
+            call["limit"] is None or call["limit"] <= message_cache.capacity
+            for call in ch.history_kwargs
+        )
+
+    def test_last_page_has_no_cursor(self):
+        text, _ = self._read(self._messages(2), limit=5)
+        assert "before=" not in text
+
+    def test_author_and_contains_filters(self):
+        messages = [
+            make_mock_message("Bob", "배포 완료"),
+            make_mock_message("Alice", "배포 시작"),
+            make_mock_message("Alice", "점심"),
+        ]
+        messages.reverse()
+        text, _ = self._read(messages, author="alice", contains="배포")
+        assert text.startswith("[2026-02-28 14:30] Alice: 배포 시작")
+        assert "점심" not in text and "Bob" not in text
+
+    def test_max_bytes_cap(self):
+        messages = [make_mock_message("Alice", "가" * 100) for _ in range(5)]
+        text, _ = self._read(list(reversed(messages)), limit=5, max_bytes=400)
+        assert len(text.encode()) < 500
+        assert "before=" in text
+
+    def test_oversized_message_truncated_with_cursor(self):
+        """max_bytes보다 긴 메시지도 잘라서 돌려주고 다음 페이지 커서를 준다"""
+        messages = [make_mock_message("Alice", "가" * 300) for _ in range(2)]
+        text, _ = self._read(list(reversed(messages)), limit=5, max_bytes=500)
+        assert "Alice: 가" in text and "…" in text
+        assert "before=" in text
+        assert "메시지가 없습니다" not in text
+
+    def test_time_range_becomes_cursor(self):
+        """since/until은 메시지 ID 경계로 바꿔 history에 전달한다"""
+        _, ch = self._read([], since="2026-02-28T14:00:00", until="2026-02-28T15:00:00")
+        kwargs = ch.history_kwargs[-1]
+        assert kwargs["after"].id == discord.utils.time_snowflake(
+            datetime.datetime(2026, 2, 28, 14, tzinfo=datetime.timezone.utc), high=True
+        )
+        assert kwargs["before"].id == discord.utils.time_snowflake(
+            datetime.datetime(2026, 2, 28, 15, tzinfo=datetime.timezone.utc)
+        )
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            self._read([], before="abc")
+
     def test_empty(self):
         ch = MagicMock()
         ch.name = "💬-자유톡"